@@ -0,0 +1,99 @@
+"""
+Analysis Queue - Bounded Capture -> Vision Model Hand-off
+=========================================================
+
+Replaces the thread-per-screenshot pattern of screenshot rotation:
+- A fixed number of worker threads (ANALYSIS_WORKERS) call the handler
+- At most ANALYSIS_QUEUE_SIZE frames wait; when a new frame arrives and the
+  queue is full, the OLDEST waiting frame is dropped - the model always
+  works on the freshest screen and a slow model can never pile up threads
+- dropped_frames counts what was discarded
+
+Frames in flight (and the memory they hold) are bounded by workers + queue
+size.
+"""
+
+import collections
+import threading
+from config import ANALYSIS_WORKERS, ANALYSIS_QUEUE_SIZE
+
+
+class AnalysisQueue:
+    """Bounded drop-oldest queue served by a fixed pool of worker threads"""
+
+    def __init__(self, handler, workers=ANALYSIS_WORKERS, capacity=ANALYSIS_QUEUE_SIZE, name="Analysis"):
+        """Start the workers; handler(*item) is called for every frame that is not dropped"""
+        self.handler = handler
+        self.capacity = max(1, capacity)
+        self.pending = collections.deque()
+        self.condition = threading.Condition()
+        self.running = True
+        self.busy_workers = 0
+        self.submitted_frames = 0
+        self.processed_frames = 0
+        self.dropped_frames = 0
+
+        self.threads = [threading.Thread(target=self.worker_loop, name=f"{name}Worker-{i + 1}", daemon=True)
+                        for i in range(max(1, workers))]
+        for thread in self.threads:
+            thread.start()
+
+    @property
+    def in_flight_limit(self):
+        """Most frames that can be queued or processing at once"""
+        return len(self.threads) + self.capacity
+
+    def submit(self, *item):
+        """Queue a frame; returns the dropped (oldest) item if the queue was full"""
+        with self.condition:
+            if not self.running:
+                return item
+            dropped = None
+            if len(self.pending) >= self.capacity:
+                dropped = self.pending.popleft()
+                self.dropped_frames += 1
+            self.pending.append(item)
+            self.submitted_frames += 1
+            self.condition.notify()
+        return dropped
+
+    def worker_loop(self):
+        """Take the oldest waiting frame and run the handler on it"""
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                item = self.pending.popleft()
+                self.busy_workers += 1
+
+            try:
+                self.handler(*item)
+            except Exception as e:
+                print(f"Analysis worker error: {e}")
+            finally:
+                with self.condition:
+                    self.busy_workers -= 1
+                    self.processed_frames += 1
+
+    def clear(self):
+        """Drop every waiting frame (frames already processing finish normally)"""
+        with self.condition:
+            self.dropped_frames += len(self.pending)
+            self.pending.clear()
+
+    def stop(self, timeout=5.0):
+        """Discard waiting frames and stop the workers"""
+        with self.condition:
+            self.running = False
+            self.pending.clear()
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def stats(self):
+        """Counters for the status display"""
+        with self.condition:
+            return {"queued": len(self.pending), "busy": self.busy_workers, "submitted": self.submitted_frames,
+                    "processed": self.processed_frames, "dropped": self.dropped_frames}
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Vision Archive Benchmark
+Compression ratio and read latency of the archive codecs on vision_memory.json
+
+Usage:  python benchmark_archive.py [path/to/vision_memory.json] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import shutil
+import tempfile
+import time
+from memory_journal import (
+    ARCHIVE_EXTENSIONS, ZSTD_AVAILABLE, read_jsonl_file, write_jsonl_file
+)
+from vision_store import VisionMemoryStore
+from config import VISION_SEGMENTS_DIR
+
+
+def load_entries(path):
+    """Vision entries from the JSON snapshot (plus its journal, if newer)"""
+    store_dir = tempfile.mkdtemp(prefix="vision_load_")
+    try:
+        # Open a throwaway copy so the real journal is never migrated or touched
+        shutil.copy(path, os.path.join(store_dir, "vision_memory.json"))
+        journal_path = os.path.splitext(path)[0] + ".jsonl"
+        if os.path.exists(journal_path):
+            shutil.copy(journal_path, os.path.join(store_dir, "vision_memory.jsonl"))
+        return VisionMemoryStore(os.path.join(store_dir, "vision_memory.json")).read_entries()
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+
+def time_reads(path, repeat):
+    """Best-of-N full read time in milliseconds"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        read_jsonl_file(path)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def time_store_reads(segment_path, count):
+    """(cold, warm) ms for VisionMemoryStore.read_recent over one archived segment"""
+    store_dir = os.path.dirname(os.path.dirname(segment_path))
+    store = VisionMemoryStore(os.path.join(store_dir, "vision_memory.json"))
+    store.archive_cache.clear()  # Opening the store already warmed it
+
+    started = time.perf_counter()
+    store.read_recent(count)
+    cold = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    store.read_recent(count)
+    warm = (time.perf_counter() - started) * 1000
+    return cold, warm
+
+
+def main():
+    """Write the entries once per codec and report size / timings"""
+    parser = argparse.ArgumentParser(description="Vision archive compression benchmark")
+    parser.add_argument("source", nargs="?",
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "vision_memory.json"))
+    parser.add_argument("--repeat", type=int, default=20, help="read passes per codec (best is reported)")
+    args = parser.parse_args()
+    source, repeat = args.source, args.repeat
+
+    if not os.path.exists(source):
+        print(f"❌ File not found: {source}")
+        return 1
+
+    entries = load_entries(source)
+    if not entries:
+        print(f"❌ No vision entries in {source}")
+        return 1
+
+    print(f"🔬 Vision archive benchmark - {len(entries)} entries from {os.path.basename(source)}")
+    print("=" * 84)
+    print(f"{'codec':<8} {'size (KB)':>10} {'ratio':>8} {'write (ms)':>11} {'read (ms)':>10} "
+          f"{'recent50 cold':>14} {'warm':>8}")
+    print("-" * 84)
+
+    work_dir = tempfile.mkdtemp(prefix="vision_archive_bench_")
+    try:
+        codecs = [None] + [codec for codec in ARCHIVE_EXTENSIONS if codec != "zstd" or ZSTD_AVAILABLE]
+        plain_size = None
+        for codec in codecs:
+            # Laid out as an archived segment so the store reads it like the app does
+            codec_dir = os.path.join(work_dir, codec or "plain")
+            segments_dir = os.path.join(codec_dir, VISION_SEGMENTS_DIR)
+            os.makedirs(segments_dir)
+            name = "vision_memory.20000101-000000-000000.jsonl" + (ARCHIVE_EXTENSIONS[codec] if codec else "")
+            path = os.path.join(segments_dir, name)
+
+            started = time.perf_counter()
+            write_jsonl_file(path, entries)
+            write_ms = (time.perf_counter() - started) * 1000
+
+            size = os.path.getsize(path)
+            plain_size = plain_size or size
+            read_ms = time_reads(path, repeat)
+            cold_ms, warm_ms = time_store_reads(path, 50)
+
+            print(f"{codec or 'plain':<8} {size / 1024:>10.1f} {plain_size / size:>7.2f}x "
+                  f"{write_ms:>11.2f} {read_ms:>10.2f} {cold_ms:>14.2f} {warm_ms:>8.2f}")
+
+        if not ZSTD_AVAILABLE:
+            print("⚠️ zstd skipped - pip install zstandard to include it")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("=" * 84)
+    print(f"📋 read = best of {repeat} full decompress + JSON parse passes")
+    print("📋 recent50 = VisionMemoryStore.read_recent(50) - first call decompresses, then cached")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
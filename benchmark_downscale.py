@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Frame Downscale Benchmark
+Time and quality of each frame_scaler strategy when shrinking captured
+frames to the vision model input sizes (and the 1080p box)
+
+Quality is PSNR against the LANCZOS result (higher = closer; above ~35 dB
+the difference is hard to see). Pick the cheapest strategy that is
+acceptable and set FRAME_RESIZE_STRATEGY in config.py.
+
+Usage:  python benchmark_downscale.py [images...] [--repeat N] [--model NAME]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from PIL import Image, ImageChops, ImageStat
+from frame_scaler import FrameScaler, RESIZE_STRATEGIES, NUMPY_AVAILABLE, fit_size, model_input_side
+from benchmark_encoder import synthetic_desktop
+from config import FRAME_RESIZE_STRATEGY
+
+
+def psnr(image, reference):
+    """Peak signal-to-noise ratio in dB (inf = identical)"""
+    difference = ImageChops.difference(image.convert("RGB"), reference.convert("RGB"))
+    mse = sum(value ** 2 for value in ImageStat.Stat(difference).rms) / 3
+    return float("inf") if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def best_time(scaler, image, size, strategy, repeat):
+    """(best seconds, result image) - a fresh copy per pass so draft/lazy state never carries over"""
+    best, result = None, None
+    for _ in range(repeat):
+        source = image.copy()
+        started = time.perf_counter()
+        result = scaler.resize(source, size, strategy)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    """Benchmark every strategy on each image and target size"""
+    parser = argparse.ArgumentParser(description="Frame downscale benchmark")
+    parser.add_argument("images", nargs="*", help="screenshots to scale (default: synthetic 4K desktop)")
+    parser.add_argument("--repeat", type=int, default=5, help="passes per measurement (best is reported)")
+    parser.add_argument("--model", action="append", default=[],
+                        help="model name(s) whose input size is a target (default: llava, moondream)")
+    args = parser.parse_args()
+
+    images = []
+    for path in args.images:
+        try:
+            images.append((os.path.basename(path), Image.open(path).convert("RGB")))
+        except OSError as e:
+            print(f"⚠️ Could not open {path}: {e}")
+    if not args.images:
+        images.append(("synthetic 4K desktop", synthetic_desktop()))
+
+    scaler = FrameScaler()
+    strategies = [strategy for strategy in RESIZE_STRATEGIES if strategy != "numpy" or NUMPY_AVAILABLE]
+    models = args.model or ["llava", "moondream"]
+
+    print(f"🔬 Frame downscale benchmark - best of {args.repeat} (configured: {FRAME_RESIZE_STRATEGY})")
+    print("=" * 64)
+    for name, image in images:
+        targets = [("1080p box", fit_size(image.size, 1920, 1080))]
+        targets += [(model, fit_size(image.size, model_input_side(model), model_input_side(model)))
+                    for model in models]
+        for label, size in targets:
+            print(f"🖼️ {name}: {image.width}x{image.height} → {size[0]}x{size[1]} ({label})")
+            print(f"{'strategy':<10} {'ms':>9} {'vs lanczos':>11} {'PSNR dB':>9}")
+            print("-" * 64)
+            results = {strategy: best_time(scaler, image, size, strategy, args.repeat) for strategy in strategies}
+            reference_time, reference = results["lanczos"]
+            for strategy in strategies:
+                elapsed, result = results[strategy]
+                quality = psnr(result, reference)
+                quality_text = "ref" if strategy == "lanczos" else f"{quality:.1f}"
+                print(f"{strategy:<10} {elapsed * 1000:>9.1f} {elapsed / reference_time:>10.2f}x {quality_text:>9}")
+            print()
+
+    print("=" * 64)
+    print("📋 draft only differs from reduce for JPEG files opened from disk (decoder-side scaling)")
+    if not NUMPY_AVAILABLE:
+        print("⚠️ numpy strategy skipped - pip install numpy to include it")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
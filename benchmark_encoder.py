@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Vision Encoder Benchmark
+Encode time, payload size and end-to-end request latency of the image
+encoder options on real screenshots (or a synthetic 4K desktop)
+
+End-to-end latency is measured against a local Ollama stand-in that does
+what the server does before the model runs: parse the JSON body, decode
+base64 and decode the image. Point --url at a real Ollama (with --model)
+to include model time.
+
+Usage:  python benchmark_encoder.py [images...] [--repeat N] [--url URL --model NAME]
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from PIL import Image, ImageDraw
+from image_encoder import ImageEncoder, get_encoder
+from config import VISION_ENCODER_POLICIES
+
+# Encoder options compared (the configured mode policies are added on top)
+CANDIDATES = [
+    ImageEncoder("PNG", compress_level=6),  # Pillow default - the old payload
+    ImageEncoder("PNG", compress_level=1),
+    ImageEncoder("PNG", compress_level=9),
+    ImageEncoder("PNG", compress_level=1, grayscale=True),
+    ImageEncoder("JPEG", quality=70),
+    ImageEncoder("JPEG", quality=85),
+    ImageEncoder("JPEG", quality=95),
+    ImageEncoder("WEBP", quality=80),
+]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal /api/generate: decode the images, answer immediately"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        request = json.loads(body)
+        for image_data in request.get("images", []):
+            Image.open(BytesIO(base64.b64decode(image_data))).load()
+        reply = json.dumps({"response": "stand-in", "done": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in():
+    """Run the stand-in server on a free local port; returns (server, url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def synthetic_desktop(width=3840, height=2160):
+    """Busy 4K desktop: title bars, text panes, a gradient 'photo' area"""
+    image = Image.new("RGB", (width, height), (32, 34, 40))
+    draw = ImageDraw.Draw(image)
+    for left in range(0, width, width // 3):
+        draw.rectangle((left + 20, 20, left + width // 3 - 20, 60), fill=(70, 90, 140))
+        draw.rectangle((left + 20, 60, left + width // 3 - 20, height - 400), fill=(245, 245, 245))
+        for row in range(80, height - 420, 22):
+            draw.text((left + 40, row), f"line {row} - the quick brown fox jumps over the lazy dog {left}",
+                      fill=(20, 20, 20))
+    for x in range(width):
+        shade = int(255 * x / width)
+        draw.line((x, height - 380, x, height - 20), fill=(shade, 120, 255 - shade))
+    return image
+
+
+def post_image(url, model, payload):
+    """One /api/generate request with the image; returns seconds"""
+    body = json.dumps({"model": model, "prompt": "Describe this screenshot.",
+                       "images": [payload], "stream": False}).encode("utf-8")
+    request = urllib.request.Request(f"{url}/api/generate", data=body,
+                                     headers={"Content-Type": "application/json"})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=300) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def measure(encoder, image, url, model, repeat):
+    """(best encode s, payload bytes, best end-to-end s incl. encode + base64)"""
+    best_encode = best_total = None
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encoded = encoder.encode(image)
+        encode_time = time.perf_counter() - started
+        payload = base64.b64encode(encoded).decode("utf-8")
+        total = time.perf_counter() - started + post_image(url, model, payload)
+        size = len(payload)
+        best_encode = encode_time if best_encode is None else min(best_encode, encode_time)
+        best_total = total if best_total is None else min(best_total, total)
+    return best_encode, size, best_total
+
+
+def main():
+    """Benchmark every encoder option on each image"""
+    parser = argparse.ArgumentParser(description="Vision payload encoder benchmark")
+    parser.add_argument("images", nargs="*", help="screenshots to encode (default: synthetic 4K desktop)")
+    parser.add_argument("--repeat", type=int, default=3, help="passes per measurement (best is reported)")
+    parser.add_argument("--url", help="real Ollama URL (default: local stand-in server)")
+    parser.add_argument("--model", default="llava", help="model name sent in the request")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server, url = start_stand_in()
+
+    images = []
+    for path in args.images:
+        try:
+            images.append((os.path.basename(path), Image.open(path).convert("RGB")))
+        except OSError as e:
+            print(f"⚠️ Could not open {path}: {e}")
+    if not args.images:
+        images.append(("synthetic 4K desktop", synthetic_desktop()))
+
+    encoders = list(CANDIDATES)
+    labels = {encoder.describe(): encoder for encoder in encoders}
+    for mode in VISION_ENCODER_POLICIES:
+        policy = get_encoder(mode)
+        if policy.describe() not in labels:
+            encoders.append(policy)
+            labels[policy.describe()] = policy
+
+    print(f"🔬 Vision encoder benchmark - best of {args.repeat}, "
+          f"{'Ollama at ' + url if args.url else 'local Ollama stand-in'}")
+    print("=" * 78)
+    for name, image in images:
+        print(f"🖼️ {name} - {image.width}x{image.height}")
+        print(f"{'encoder':<22} {'encode ms':>10} {'payload KB':>11} {'vs PNG-6':>9} {'end-to-end ms':>14}")
+        print("-" * 78)
+        baseline = None
+        for encoder in encoders:
+            encode_time, size, total = measure(encoder, image, url, args.model, args.repeat)
+            baseline = baseline or size
+            modes = [mode for mode in VISION_ENCODER_POLICIES if get_encoder(mode).describe() == encoder.describe()]
+            label = encoder.describe() + (" *" if modes else "")
+            print(f"{label:<22} {encode_time * 1000:>10.1f} {size / 1024:>11.1f} "
+                  f"{size / baseline:>8.2f}x {total * 1000:>14.1f}")
+        print()
+
+    print("=" * 78)
+    print("📋 payload = base64 text in the request; end-to-end = encode + base64 + request")
+    print("📋 * = used by a configured vision mode: " +
+          ", ".join(f"{mode} → {get_encoder(mode).describe()}" for mode in VISION_ENCODER_POLICIES))
+    if server:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Memory Records Benchmark
+tracemalloc comparison of in-RAM system/chat memory over a simulated 8-hour session:
+unbounded lists of dicts (old) vs bounded MemoryRecordBuffer (new)
+
+Usage:  python benchmark_memory_records.py [--hours 8] [--interval 5]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from memory_records import MemoryRecordBuffer, SystemMemoryRecord, ChatMemoryRecord
+from config import MAX_SYSTEM_MEMORY_ENTRIES, MAX_CHAT_MEMORY_ENTRIES
+
+
+SENDERS = ["System", "Debug", "Error", "Vision", "Speech", "You", "AI"]
+CHAT_ACTIONS = ["input", "send", "copy", "clear"]
+
+
+def simulated_session(hours, interval):
+    """Yield ("system"|"chat", entry dict) in the order a rotation session logs them"""
+    rng = random.Random(42)
+    now = datetime(2026, 1, 1, 9, 0, 0)
+    cycles = int(hours * 3600 / interval)
+
+    for cycle in range(cycles):
+        now += timedelta(seconds=interval)
+        # Each rotation cycle logs a handful of status/debug lines
+        for step in range(rng.randint(6, 12)):
+            sender = rng.choice(SENDERS)
+            content = (f"📸 Cycle {cycle} step {step}: screenshot screen_{cycle % 3 + 1:03d}.png "
+                       f"processed in {rng.random() * 3:.2f}s" + " details" * rng.randint(0, 20))
+            yield "system", {
+                "timestamp": (now + timedelta(milliseconds=step)).isoformat(),
+                "type": sender.lower(),
+                "sender": sender,
+                "content": content,
+                "length": len(content)
+            }
+        # Roughly one dictated / typed message per minute
+        if cycle % max(1, int(60 / interval)) == 0:
+            text = f"message {cycle} " + "words " * rng.randint(3, 60)
+            yield "chat", {
+                "timestamp": now.isoformat(),
+                "action": rng.choice(CHAT_ACTIONS),
+                "text": text.strip(),
+                "length": len(text.strip())
+            }
+
+
+def run_lists(session):
+    """Old behaviour: every entry dict kept forever"""
+    system_memory, chat_memory = [], []
+    for kind, entry in session:
+        (system_memory if kind == "system" else chat_memory).append(entry)
+    return system_memory, chat_memory
+
+
+def run_buffers(session):
+    """New behaviour: bounded ring buffers of __slots__ records"""
+    system_memory = MemoryRecordBuffer(SystemMemoryRecord, MAX_SYSTEM_MEMORY_ENTRIES)
+    chat_memory = MemoryRecordBuffer(ChatMemoryRecord, MAX_CHAT_MEMORY_ENTRIES)
+    for kind, entry in session:
+        (system_memory if kind == "system" else chat_memory).append(entry)
+    return system_memory, chat_memory
+
+
+def measure(runner, hours, interval):
+    """(current bytes, peak bytes, seconds, entries retained) for one strategy"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    system_memory, chat_memory = runner(simulated_session(hours, interval))
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, elapsed, len(system_memory) + len(chat_memory)
+
+
+def main():
+    """Run both strategies on the same simulated session and compare"""
+    parser = argparse.ArgumentParser(description="In-RAM memory record benchmark")
+    parser.add_argument("--hours", type=float, default=8, help="simulated session length")
+    parser.add_argument("--interval", type=float, default=5, help="screenshot rotation interval (s)")
+    args = parser.parse_args()
+
+    total = sum(1 for _ in simulated_session(args.hours, args.interval))
+    print(f"🔬 Memory records benchmark - {args.hours:g}h session, {args.interval:g}s rotation, "
+          f"{total} log entries")
+    print("=" * 87)
+    print(f"{'strategy':<26} {'retained':>9} {'current (MB)':>13} {'peak (MB)':>10} {'B/entry':>8} {'time (s)':>9}")
+    print("-" * 87)
+
+    results = {}
+    for name, runner in (("list of dicts (old)", run_lists), ("ring buffer + slots (new)", run_buffers)):
+        current, peak, elapsed, retained = measure(runner, args.hours, args.interval)
+        results[name] = current
+        print(f"{name:<26} {retained:>9} {current / 1e6:>13.2f} {peak / 1e6:>10.2f} "
+              f"{current / max(retained, 1):>8.0f} {elapsed:>9.2f}")
+
+    old, new = results.values()
+    print("=" * 87)
+    print(f"📉 Resident memory after the session: {old / max(new, 1):.1f}x smaller")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
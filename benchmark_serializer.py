@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Memory Serializer Benchmark
+Encode/decode throughput and output size of json / orjson / msgpack on the
+repo's own memory files (journal lines and whole snapshot documents)
+
+Usage:  python benchmark_serializer.py [memory files...] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from memory_serializer import SERIALIZERS, ORJSON_AVAILABLE, MSGPACK_AVAILABLE
+from memory_journal import read_jsonl_file
+from config import SYSTEM_MEMORY_FILE, CHAT_MEMORY_FILE, VISION_MEMORY_FILE
+
+
+def load_entries(path):
+    """Entries of a memory snapshot plus its journal, if one exists"""
+    entries = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        entries = data.get('entries', data.get('segments', [])) if isinstance(data, dict) else data
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read {path}: {e}")
+    journal_path = os.path.splitext(path)[0] + ".jsonl"
+    if os.path.exists(journal_path):
+        entries = entries + read_jsonl_file(journal_path)
+    return entries
+
+
+def best_time(function, repeat):
+    """Best-of-N wall time in seconds"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure(codec, entries, repeat):
+    """(line encode s, line decode s, line bytes, document encode s, document decode s, document bytes)"""
+    lines = [codec.dumps(entry) for entry in entries]
+    line_bytes = sum(len(line) + 1 for line in lines)
+    line_encode = best_time(lambda: [codec.dumps(entry) for entry in entries], repeat)
+    line_decode = best_time(lambda: [codec.loads(line) for line in lines], repeat)
+
+    document = {"total_entries": len(entries), "entries": entries}
+    encoded = codec.dumps_pretty(document)
+    document_encode = best_time(lambda: codec.dumps_pretty(document), repeat)
+    document_decode = best_time(lambda: codec.loads(encoded), repeat)
+    return line_encode, line_decode, line_bytes, document_encode, document_decode, len(encoded)
+
+
+def main():
+    """Benchmark every installed codec on each memory file"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Memory serializer benchmark")
+    parser.add_argument("files", nargs="*",
+                        default=[os.path.join(base_dir, name) for name in
+                                 (SYSTEM_MEMORY_FILE, CHAT_MEMORY_FILE, VISION_MEMORY_FILE, "safety_net.json")])
+    parser.add_argument("--repeat", type=int, default=5, help="passes per measurement (best is reported)")
+    args = parser.parse_args()
+
+    codecs = list(SERIALIZERS.values())
+    print(f"🔬 Memory serializer benchmark - best of {args.repeat}")
+    print("=" * 84)
+
+    for path in args.files:
+        if not os.path.exists(path):
+            continue
+        entries = load_entries(path)
+        if not entries:
+            print(f"📄 {os.path.basename(path)}: no entries - skipped")
+            continue
+
+        print(f"📄 {os.path.basename(path)} - {len(entries)} entries")
+        print(f"{'codec':<10} {'line enc':>10} {'line dec':>10} {'journal KB':>11} "
+              f"{'doc enc':>10} {'doc dec':>10} {'doc KB':>9}")
+        print(f"{'':<10} {'(MB/s)':>10} {'(MB/s)':>10} {'':>11} {'(ms)':>10} {'(ms)':>10}")
+        print("-" * 84)
+        for codec in codecs:
+            line_encode, line_decode, line_bytes, doc_encode, doc_decode, doc_bytes = measure(
+                codec, entries, args.repeat)
+            print(f"{codec.name:<10} {line_bytes / 1e6 / max(line_encode, 1e-9):>10.1f} "
+                  f"{line_bytes / 1e6 / max(line_decode, 1e-9):>10.1f} {line_bytes / 1024:>11.1f} "
+                  f"{doc_encode * 1000:>10.2f} {doc_decode * 1000:>10.2f} {doc_bytes / 1024:>9.1f}")
+        print()
+
+    print("=" * 84)
+    if not ORJSON_AVAILABLE:
+        print("⚠️ orjson skipped - pip install orjson to include it")
+    if not MSGPACK_AVAILABLE:
+        print("⚠️ msgpack skipped - pip install msgpack to include it")
+    print("📋 line = one journal line per entry (memory appends); doc = snapshot file")
+    print("📋 json doc = the old json.dump(indent=2, ensure_ascii=False) path")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Capture Engine - One Screen Capture Path for Every Caller
+=========================================================
+
+All screenshot sites (rotation, Vision Image sends, VisionSystem,
+screenshot_gui.py) grab frames through one CaptureEngine:
+- "mss"    - one persistent mss session shared by every capturing thread
+             (grabs are serialized by a lock) instead of opening mss.mss()
+             on every tick
+- "pil"    - PIL ImageGrab (Windows/macOS, or X11 on Linux)
+- "replay" - frames read from an image file or a directory of images,
+             cycled in name order; capture can be benchmarked and tested
+             headless (CAPTURE_REPLAY_SOURCE or --source)
+- "auto"   - mss if installed, else PIL
+
+Monitor topology uses mss numbering (0 = all screens combined, 1 = primary,
+2 = secondary, ...) for every backend. It is read once and cached;
+refresh_monitors() re-reads it (e.g. when screens are re-detected).
+
+Measure grab latency:  python capture_engine.py --backend replay --source screenshots/
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from PIL import Image
+from config import CAPTURE_BACKEND, CAPTURE_REPLAY_SOURCE
+
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    mss = None
+    MSS_AVAILABLE = False
+
+try:
+    from PIL import ImageGrab
+    IMAGEGRAB_AVAILABLE = True
+except ImportError:
+    ImageGrab = None
+    IMAGEGRAB_AVAILABLE = False
+
+REPLAY_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+
+
+def monitor_rect(left, top, width, height):
+    """Monitor dict in mss format"""
+    return {"left": left, "top": top, "width": width, "height": height}
+
+
+class MssBackend:
+    """mss capture through one persistent, lock-guarded session"""
+
+    name = "mss"
+
+    def __init__(self):
+        """The session is opened lazily on first use"""
+        self.sct = None
+        self.lock = threading.Lock()
+
+    def session(self):
+        """The shared mss handle (caller holds the lock)"""
+        if self.sct is None:
+            self.sct = mss.mss()
+        return self.sct
+
+    def read_monitors(self):
+        """Current monitor list (index 0 = virtual desktop)"""
+        with self.lock:
+            return [dict(monitor) for monitor in self.session().monitors]
+
+    def grab(self, monitor):
+        """RGB image of a monitor rectangle"""
+        with self.lock:
+            shot = self.session().grab(monitor)
+        return Image.frombytes("RGB", shot.size, shot.bgra, "raw", "BGRX")
+
+    def close(self):
+        """Close the session (a later grab opens a new one)"""
+        with self.lock:
+            if self.sct is not None:
+                try:
+                    self.sct.close()
+                except Exception:
+                    pass
+                self.sct = None
+
+
+class PilBackend:
+    """PIL ImageGrab capture (no per-monitor API - cropped out of the full desktop)"""
+
+    name = "pil"
+
+    def read_monitors(self):
+        """Virtual desktop plus the primary screen"""
+        desktop = ImageGrab.grab(all_screens=True)
+        primary = ImageGrab.grab()
+        return [monitor_rect(0, 0, *desktop.size), monitor_rect(0, 0, *primary.size)]
+
+    def grab(self, monitor):
+        """RGB image of a monitor rectangle"""
+        bbox = (monitor["left"], monitor["top"],
+                monitor["left"] + monitor["width"], monitor["top"] + monitor["height"])
+        return ImageGrab.grab(bbox=bbox, all_screens=True).convert("RGB")
+
+    def close(self):
+        """Nothing to release"""
+
+
+class ReplayBackend:
+    """Frames from an image file or directory, cycled in name order"""
+
+    name = "replay"
+
+    def __init__(self, source):
+        """source: an image file or a directory of images"""
+        if os.path.isdir(source):
+            self.paths = sorted(os.path.join(source, name) for name in os.listdir(source)
+                                if name.lower().endswith(REPLAY_EXTENSIONS))
+        else:
+            self.paths = [source]
+        if not self.paths:
+            raise ValueError(f"No images to replay in {source}")
+        self.position = 0
+        self.lock = threading.Lock()
+        self.cache = {}  # path -> decoded image (replay measures capture, not disk reads)
+
+    def load(self, path):
+        """Decoded RGB image (cached)"""
+        if path not in self.cache:
+            self.cache[path] = Image.open(path).convert("RGB")
+        return self.cache[path]
+
+    def read_monitors(self):
+        """One 'monitor' the size of the first frame"""
+        width, height = self.load(self.paths[0]).size
+        return [monitor_rect(0, 0, width, height), monitor_rect(0, 0, width, height)]
+
+    def grab(self, monitor):
+        """Next frame (copied, so callers may modify it)"""
+        with self.lock:
+            path = self.paths[self.position % len(self.paths)]
+            self.position += 1
+        return self.load(path).copy()
+
+    def close(self):
+        """Drop the decoded frames"""
+        self.cache = {}
+
+
+class CaptureEngine:
+    """Screen capture through one backend, with cached monitor topology"""
+
+    def __init__(self, backend=CAPTURE_BACKEND, replay_source=CAPTURE_REPLAY_SOURCE):
+        """backend: "auto", "mss", "pil" or "replay" (needs replay_source)"""
+        self.backend = self.create_backend(backend, replay_source)
+        self.monitors_cache = None
+        self.lock = threading.Lock()
+        self.grab_count = 0
+        self.grab_seconds = 0.0
+        print(f"📸 Capture engine: {self.backend.name} backend")
+
+    @staticmethod
+    def create_backend(name, replay_source):
+        """Backend instance for a name, falling back to what is installed"""
+        if name == "replay" or (name == "auto" and replay_source):
+            if replay_source:
+                return ReplayBackend(replay_source)
+            print("⚠️ Replay capture needs CAPTURE_REPLAY_SOURCE - falling back to live capture")
+        if name in ("auto", "mss", "replay") and MSS_AVAILABLE:
+            return MssBackend()
+        if IMAGEGRAB_AVAILABLE:
+            if name == "mss":
+                print("⚠️ mss not installed - capturing with PIL ImageGrab")
+            return PilBackend()
+        raise RuntimeError("No screen capture backend available (install mss or Pillow ImageGrab)")
+
+    @property
+    def monitors(self):
+        """Cached monitor list in mss numbering (0 = all screens)"""
+        with self.lock:
+            if self.monitors_cache is None:
+                self.monitors_cache = self.backend.read_monitors()
+            return self.monitors_cache
+
+    def refresh_monitors(self):
+        """Re-read the monitor topology (screens added/removed/rearranged)"""
+        with self.lock:
+            self.monitors_cache = None
+        return self.monitors
+
+    def monitor(self, index=1):
+        """(index actually used, monitor dict) - missing monitors fall back to the primary"""
+        monitors = self.monitors
+        if index is None or not 0 <= index < len(monitors):
+            index = 1 if len(monitors) > 1 else 0
+        return index, monitors[index]
+
+    def grab(self, index=1):
+        """Capture a monitor; returns (RGB image, index actually used)"""
+        index, monitor = self.monitor(index)
+        started = time.perf_counter()
+        image = self.backend.grab(monitor)
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.grab_count += 1
+            self.grab_seconds += elapsed
+        return image, index
+
+    def stats(self):
+        """Grab count and average latency"""
+        with self.lock:
+            average = self.grab_seconds / self.grab_count * 1000 if self.grab_count else 0.0
+            return {"backend": self.backend.name, "grabs": self.grab_count, "average_ms": round(average, 2)}
+
+    def close(self):
+        """Release backend resources"""
+        self.backend.close()
+
+
+shared_engine = None
+shared_engine_lock = threading.Lock()
+
+
+def get_capture_engine():
+    """Process-wide engine shared by all capture sites (created on first use)"""
+    global shared_engine
+    with shared_engine_lock:
+        if shared_engine is None:
+            shared_engine = CaptureEngine()
+        return shared_engine
+
+
+def close_capture_engine():
+    """Release the shared engine's backend on exit (no-op if it was never created)"""
+    with shared_engine_lock:
+        if shared_engine is not None:
+            shared_engine.close()
+
+
+def main():
+    """Grab N frames and report latency"""
+    parser = argparse.ArgumentParser(description="Capture engine latency check")
+    parser.add_argument("--backend", default=CAPTURE_BACKEND, choices=["auto", "mss", "pil", "replay"])
+    parser.add_argument("--source", default=CAPTURE_REPLAY_SOURCE, help="image file/directory for replay")
+    parser.add_argument("--monitor", type=int, default=1, help="mss monitor number (0 = all screens)")
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+
+    try:
+        engine = CaptureEngine(args.backend, args.source)
+        print(f"🖥️ Monitors: {engine.monitors}")
+        timings = []
+        for _ in range(args.frames):
+            started = time.perf_counter()
+            image, index = engine.grab(args.monitor)
+            timings.append((time.perf_counter() - started) * 1000)
+    except (RuntimeError, ValueError, OSError) as e:
+        print(f"❌ Capture failed: {e}")
+        return 1
+
+    timings.sort()
+    print(f"📊 {args.frames} grabs of monitor {index} ({image.width}x{image.height}): "
+          f"median {timings[len(timings) // 2]:.1f} ms, best {timings[0]:.1f} ms, worst {timings[-1]:.1f} ms")
+    engine.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,17 @@ SYSTEM_MEMORY_FILE = "system_memory.json"
 CHAT_MEMORY_FILE = "chat_memory.json"
 VISION_MEMORY_FILE = "vision_memory.json"
 
+# Memory file encoding: "auto" (orjson if installed, else json), "json" or "orjson" - files stay JSON text
+MEMORY_SERIALIZER = "auto"
+# App-private state files (rollups): "auto" prefers msgpack if installed, else the JSON codec above
+MEMORY_BINARY_SERIALIZER = "auto"
+
+# Optional indexed storage engine: "json" (files only) or "sqlite" (files + indexed database)
+MEMORY_STORAGE_ENGINE = "json"
+SQLITE_MEMORY_FILE = "memory.db"
+MEMORY_ROLLUPS_FILE = "memory_rollups.dat"  # Per-minute / per-hour activity aggregates (app-private)
+FILE_WATCH_POLL_INTERVAL = 1.0  # seconds - stat polling when inotify is unavailable (Windows/macOS)
+
 # ===== SPEECH SYSTEM SETTINGS =====
 SPEECH_AVAILABLE = True  # Will be updated based on imports
 
@@ -45,11 +56,97 @@ MAX_TEXT_LENGTH = 1000  # Character limit for crash protection
 # ===== VISION SYSTEM SETTINGS =====
 MAX_SCREENSHOTS = 3  # Rotation limit
 DEFAULT_ROTATION_INTERVAL = 5  # seconds
+ROTATION_MIN_INTERVAL = 2  # "Auto" interval bounds (seconds, adjustable in the UI)
+ROTATION_MAX_INTERVAL = 30
+ROTATION_ADAPTIVE_WINDOW = 10  # captures / analyses the adaptive averages cover
+ROTATION_IDLE_BACKOFF = 1.5  # interval growth per unchanged capture
 SCREENSHOT_TIMEOUT = 30  # seconds for AI processing
+CAPTURE_BACKEND = "auto"  # "auto" (mss, else PIL), "mss", "pil" or "replay"
+CAPTURE_REPLAY_SOURCE = None  # image file/directory replayed instead of the screen (headless testing)
+FRAME_RESIZE_STRATEGY = "reduce"  # "reduce", "draft", "numpy", "box", "bilinear" or "lanczos" (see frame_scaler.py)
+# Largest useful image side per vision model (name prefix, tag ignored); larger frames are downscaled
+VISION_MODEL_INPUT_SIZES = {
+    "llava": 1344,
+    "bakllava": 1344,
+    "llama3.2-vision": 1120,
+    "minicpm-v": 1344,
+    "moondream": 756,
+    "gemma3": 896,
+    "qwen2.5vl": 1792,
+    "default": 1344,
+}
+SCREENSHOT_SAVE_TO_DISK = True  # keep screen_00N.png copies (written in the background)
+SCREENSHOT_SAVE_QUEUE_SIZE = 2  # frames waiting to be written; more are not saved
+# Image encoding per vision mode (see image_encoder.py / benchmark_encoder.py)
+# format: "PNG" (compress_level 0-9), "JPEG" or "WEBP" (quality 1-100); grayscale: True/False
+VISION_ENCODER_POLICIES = {
+    "Vision Text": {"format": "PNG", "compress_level": 1, "grayscale": True},  # text stays lossless
+    "Vision Image": {"format": "JPEG", "quality": 85},
+    "default": {"format": "PNG", "compress_level": 1},
+}
+VISION_REENCODE_MIN_BYTES = 1024 * 1024  # chosen files larger than this are re-encoded before sending
+INTERPRETATION_CACHE_SIZE = 64  # remembered frame interpretations (least recently used dropped first)
+INTERPRETATION_CACHE_TTL = 600  # seconds before a cached interpretation is considered stale
+INTERPRETATION_CACHE_MAX_DISTANCE = 4  # perceptual hash bits (of 64) a cache hit may differ by
+ANALYSIS_WORKERS = 1  # vision model requests running at once during rotation
+ANALYSIS_QUEUE_SIZE = 1  # frames waiting for a worker; the oldest is dropped when full
+FRAME_CHANGE_SAMPLE_WIDTH = 256  # grayscale sample width used for change detection
+FRAME_CHANGE_MIN_MEAN_DIFF = 2.0  # mean abs pixel difference (0-255) that counts as a change
+FRAME_CHANGE_MIN_HASH_DISTANCE = 6  # perceptual hash bits (of 64) that count as a change
+FRAME_DIRTY_TILE = 8  # dirty-region tile edge in sample pixels (~120px on a 4K frame)
+FRAME_DIRTY_TILE_MIN_DIFF = 3.0  # mean abs difference that marks a tile dirty
+FRAME_DIRTY_MAX_AREA = 0.5  # larger changes send the whole frame
+FRAME_DIRTY_MAX_REGIONS = 4  # more separate regions are merged into one box
 
 # ===== MEMORY LIMITS =====
 MAX_SYSTEM_MEMORY_ENTRIES = 1000
 MAX_CHAT_MEMORY_ENTRIES = 500
+MEMORY_COMPACT_INTERVAL = 200  # Extra journal lines allowed before compaction
+MEMORY_FLUSH_INTERVAL = 0.5  # seconds - background writer batch window
+MEMORY_FLUSH_BATCH_SIZE = 50  # entries - flush early when a batch fills up
+MEMORY_STARTUP_TAIL_ENTRIES = 100  # Newest entries loaded at startup - older history is paged in
+SYSTEM_MEMORY_COLLAPSE_REPEATS = True  # Back-to-back identical system messages become one entry with a count
+MEMORY_PAGE_SIZE = 50  # Entries per page when browsing older history
+MEMORY_TAIL_MMAP_MIN_BYTES = 1024 * 1024  # Journals/segments this large are memory-mapped for tail reads
+
+# Vision memory retention - hot path only touches the small active segment
+VISION_SEGMENTS_DIR = "vision_segments"
+VISION_SEGMENT_MAX_ENTRIES = 500  # Roll the active journal into a dated segment
+VISION_SEGMENT_MAX_BYTES = 1024 * 1024  # ...or once it reaches 1 MB
+VISION_MERGED_SEGMENT_MAX_BYTES = 8 * 1024 * 1024  # Compactor merges same-day segments up to this
+VISION_RETENTION_MAX_ENTRIES = 20000
+VISION_RETENTION_MAX_AGE_DAYS = 30
+VISION_RETENTION_MAX_BYTES = 64 * 1024 * 1024
+VISION_COMPACT_INTERVAL = 300  # seconds between background compaction passes
+VISION_ARCHIVE_AFTER_DAYS = 2  # Segments older than this are compressed into the archive tier
+VISION_ARCHIVE_COMPRESSION = "gzip"  # "gzip", "lzma", "zstd" (pip install zstandard) or None
+
+# Full-text search over vision and chat memory
+SEARCH_RESULT_LIMIT = 50
+SEARCH_COMPACT_FRACTION = 0.25  # Re-index once pruned/cleared documents are this share of the index
+
+# Rollup analytics - counts and bytes per minute / hour, updated as entries are saved
+ROLLUP_MINUTE_RETENTION_HOURS = 48  # Minute buckets older than this are dropped
+ROLLUP_HOUR_RETENTION_DAYS = 90  # Hour buckets older than this are dropped
+ROLLUP_SAVE_INTERVAL = 60  # seconds between background saves of the rollup file
+
+# ===== LOGGING =====
+LOG_MIN_LEVEL = "INFO"  # "DEBUG" while troubleshooting - debug lines are dropped below this
+
+# Which sinks each level reaches: "widget" (chat/status display), "memory" (system memory file), "console"
+LOG_LEVEL_SINKS = {
+    "DEBUG": ["widget"],
+    "INFO": ["widget", "memory"],
+    "WARN": ["widget", "memory", "console"],
+    "ERROR": ["widget", "memory", "console"],
+}
+
+# Per-sender token buckets: (messages per second, burst). Unlisted senders and ERROR are unlimited.
+LOG_RATE_LIMITS = {
+    "Debug": (2.0, 10),
+    "Preview": (1.0, 5),
+    "System": (20.0, 200),
+}
 
 # ===== GUI SETTINGS =====
 WINDOW_GEOMETRY = "1000x800"
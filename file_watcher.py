@@ -0,0 +1,273 @@
+"""
+File Watcher - Change Notifications for Memory Files
+====================================================
+
+Replaces timer polling of memory/state files with in-process events:
+- Linux: inotify (via ctypes) on the watched files' directories - the
+  watcher thread sleeps until the kernel reports a change
+- Elsewhere (or if inotify is unavailable): a stat() poll every
+  FILE_WATCH_POLL_INTERVAL seconds, which costs one stat per watched file
+- Each change is classified from the file's (inode, size, mtime) before and after:
+    "appended" - same file, grew (new lines at the end)
+    "rotated"  - replaced, renamed away or shrunk but still has content
+                 (segment roll, compaction, atomic rewrite)
+    "cleared"  - now empty or deleted
+- Subscribers get callback(path, event, size) on the watcher thread, and
+  only when the file actually changed - Tk consumers hop back to the UI
+  thread with root.after(0, ...)
+
+Writers in other processes (e.g. model_manager.py) are picked up the same
+way, since the notification comes from the file system.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from config import FILE_WATCH_POLL_INTERVAL
+
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+libc = None
+if sys.platform.startswith("linux"):
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        INOTIFY_AVAILABLE = hasattr(libc, "inotify_init1")
+    except OSError:
+        INOTIFY_AVAILABLE = False
+else:
+    INOTIFY_AVAILABLE = False
+
+
+class InotifyBackend:
+    """Thin ctypes wrapper: one inotify fd, watches on directories"""
+
+    def __init__(self):
+        """Create a non-blocking inotify instance"""
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}  # watch descriptor -> directory
+        self.watches = {}  # directory -> watch descriptor
+
+    def watch_directory(self, directory):
+        """Start watching a directory; returns False if it cannot be watched (yet)"""
+        if directory in self.watches:
+            return True
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            return False
+        self.watches[directory] = wd
+        self.directories[wd] = directory
+        return True
+
+    def read_events(self, timeout):
+        """Wait up to timeout seconds; returns [(directory, name, mask)]"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            directory = self.directories.get(wd)
+            if mask & IN_IGNORED and directory is not None:
+                # Directory removed - re-added on a later poll pass if it comes back
+                del self.directories[wd]
+                self.watches.pop(directory, None)
+            if directory is not None:
+                events.append((directory, name, mask))
+        return events
+
+    def close(self):
+        """Release the inotify fd"""
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+def file_state(path):
+    """(inode, size, mtime_ns) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def classify_change(before, after, moved_away=False):
+    """Event name for a state change, or None if nothing changed"""
+    if before == after and not moved_away:
+        return None
+    if after is None or after[1] == 0:
+        if before is None or before[1] == 0:
+            return "rotated" if moved_away else None
+        return "rotated" if moved_away else "cleared"
+    if before is None:
+        return "appended"
+    if moved_away or after[0] != before[0] or after[1] < before[1]:
+        return "rotated"
+    if after[1] > before[1]:
+        return "appended"
+    # Same size, rewritten in place
+    return "rotated"
+
+
+class FileWatcher:
+    """Publishes appended/rotated/cleared events for subscribed files"""
+
+    def __init__(self, poll_interval=FILE_WATCH_POLL_INTERVAL, use_inotify=True):
+        """Start the watcher thread (inotify when available, stat polling otherwise)"""
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.subscribers = {}  # absolute path -> [callback]
+        self.states = {}  # absolute path -> last file_state
+        self.moved_away = set()  # paths renamed away since the last check
+        self.stop_event = threading.Event()
+
+        self.inotify = None
+        if use_inotify and INOTIFY_AVAILABLE:
+            try:
+                self.inotify = InotifyBackend()
+            except Exception as e:
+                print(f"inotify unavailable, using stat polling: {e}")
+        self.backend = "inotify" if self.inotify else "poll"
+
+        self.thread = threading.Thread(target=self.watch_loop, name="FileWatcher", daemon=True)
+        self.thread.start()
+
+    def subscribe(self, path, callback):
+        """Call callback(path, event, size) whenever path changes"""
+        path = os.path.abspath(path)
+        with self.lock:
+            if path not in self.subscribers:
+                self.subscribers[path] = []
+                self.states[path] = file_state(path)
+                if self.inotify:
+                    self.inotify.watch_directory(os.path.dirname(path))
+            self.subscribers[path].append(callback)
+        return path
+
+    def unsubscribe(self, path, callback):
+        """Stop delivering events for path to callback"""
+        path = os.path.abspath(path)
+        with self.lock:
+            callbacks = self.subscribers.get(path)
+            if not callbacks or callback not in callbacks:
+                return
+            callbacks.remove(callback)
+            if not callbacks:
+                del self.subscribers[path]
+                self.states.pop(path, None)
+                self.moved_away.discard(path)
+
+    def check(self, path):
+        """Compare path with its last known state and publish the change (if any)"""
+        with self.lock:
+            if path not in self.subscribers:
+                return None
+            before = self.states.get(path)
+            after = file_state(path)
+            moved_away = path in self.moved_away
+            self.moved_away.discard(path)
+            event = classify_change(before, after, moved_away)
+            self.states[path] = after
+            callbacks = list(self.subscribers[path]) if event else []
+
+        for callback in callbacks:
+            try:
+                callback(path, event, after[1] if after else 0)
+            except Exception as e:
+                print(f"File watcher callback error: {e}")
+        return event
+
+    def check_all(self):
+        """Check every subscribed file (poll pass)"""
+        with self.lock:
+            paths = list(self.subscribers)
+        for path in paths:
+            self.check(path)
+
+    def watch_new_directories(self):
+        """inotify: pick up directories that did not exist at subscribe time"""
+        with self.lock:
+            added = [path for path in self.subscribers
+                     if os.path.dirname(path) not in self.inotify.watches
+                     and self.inotify.watch_directory(os.path.dirname(path))]
+        for path in added:
+            self.check(path)
+
+    def watch_loop(self):
+        """Wait for changes and publish them until stopped"""
+        while not self.stop_event.is_set():
+            try:
+                if not self.inotify:
+                    self.stop_event.wait(self.poll_interval)
+                    self.check_all()
+                    continue
+
+                events = self.inotify.read_events(self.poll_interval)
+                if not events:
+                    self.watch_new_directories()
+                    continue
+
+                changed = []
+                for directory, name, mask in events:
+                    path = os.path.join(directory, name)
+                    if mask & IN_MOVED_FROM:
+                        with self.lock:
+                            if path in self.subscribers:
+                                self.moved_away.add(path)
+                    if path not in changed:
+                        changed.append(path)
+                for path in changed:
+                    self.check(path)
+
+            except Exception as e:
+                print(f"File watcher error: {e}")
+                self.stop_event.wait(self.poll_interval)
+
+    def stop(self):
+        """Stop the watcher thread"""
+        self.stop_event.set()
+        self.thread.join(timeout=5.0)
+        if self.inotify:
+            self.inotify.close()
+
+
+shared_watcher = None
+shared_watcher_lock = threading.Lock()
+
+
+def get_file_watcher():
+    """Process-wide watcher shared by all consumers (started on first use)"""
+    global shared_watcher
+    with shared_watcher_lock:
+        if shared_watcher is None:
+            shared_watcher = FileWatcher()
+        return shared_watcher
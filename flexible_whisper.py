@@ -8,6 +8,8 @@ import threading
 import time
 import torch
 import os
+import json
+from datetime import datetime
 from typing import Optional, Callable
 
 # Try to import faster-whisper for CUDA acceleration
@@ -19,6 +21,10 @@ except ImportError:
     FASTER_WHISPER_AVAILABLE = False
     print("⚠️ faster-whisper not available - falling back to Google Speech")
 
+# Last model activated by any process (GUI or model_manager.py) - watched by the GUI
+ACTIVE_MODEL_FILE = os.path.join(os.path.dirname(__file__), "models", "active_model.json")
+
+
 class FlexibleWhisper:
     """Fast speech recognition using CUDA-accelerated faster-whisper or SpeechRecognition fallback"""
     
@@ -233,6 +239,7 @@ class FlexibleWhisper:
                     )
                     self.selected_model_name = f"faster-whisper-{model_size} (CUDA)"
                     print(f"✅ Switched to YOUR {model_size} model!")
+                    self.publish_active_model(model_size)
                     return True
             
             print(f"❌ Unknown model: {model_name}")
@@ -242,6 +249,22 @@ class FlexibleWhisper:
             print(f"❌ Model switch failed: {e}")
             return False
     
+    def publish_active_model(self, model_size: str):
+        """Record the activated model so other processes (the GUI) can follow the switch"""
+        try:
+            state = {
+                "model": model_size,
+                "selected_model_name": self.selected_model_name,
+                "pid": os.getpid(),
+                "timestamp": datetime.now().isoformat()
+            }
+            temp_path = ACTIVE_MODEL_FILE + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temp_path, ACTIVE_MODEL_FILE)
+        except Exception as e:
+            print(f"⚠️ Could not publish active model: {e}")
+    
     def switch_model(self, model_name: str) -> bool:
         """Switch to a different model - alias for change_model to fix compatibility"""
         return self.change_model(f"faster-whisper-{model_name}")
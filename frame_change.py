@@ -0,0 +1,244 @@
+"""
+Frame Change Detection - Skip Unchanged Screens
+===============================================
+
+Decides whether a captured frame is worth sending to the vision model:
+- Each frame is shrunk to a small grayscale sample (FRAME_CHANGE_SAMPLE_WIDTH
+  pixels wide) - cheap even for 4K captures
+- Mean absolute difference (NumPy) against the last analyzed frame catches
+  any visible change in content
+- A 64-bit perceptual hash (DCT of a 32x32 thumbnail) catches layout
+  changes
+- The frame counts as changed when either measure reaches its threshold,
+  or when any single tile does (see below) - so even a small local change
+  such as a few typed characters or a blinking cursor counts; the reference
+  only moves on changed frames, so slow drift still adds up
+
+Dirty regions: the sample is split into FRAME_DIRTY_TILE-pixel tiles, tiles
+whose mean difference reaches FRAME_DIRTY_TILE_MIN_DIFF are marked dirty,
+neighbouring dirty tiles are merged into bounding boxes (in full-frame
+pixels). When the boxes cover at most FRAME_DIRTY_MAX_AREA of the frame the
+caller sends only those crops (compose_regions) instead of the whole screen.
+
+Without NumPy every frame counts as changed (the old behaviour).
+"""
+
+from PIL import Image
+from config import (
+    FRAME_CHANGE_SAMPLE_WIDTH, FRAME_CHANGE_MIN_MEAN_DIFF, FRAME_CHANGE_MIN_HASH_DISTANCE,
+    FRAME_DIRTY_TILE, FRAME_DIRTY_TILE_MIN_DIFF, FRAME_DIRTY_MAX_AREA, FRAME_DIRTY_MAX_REGIONS
+)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+HASH_SIZE = 8  # 8x8 low-frequency DCT block -> 64-bit hash
+HASH_SAMPLE = 32  # thumbnail edge the DCT runs on
+HASH_AC_STEP = 1.0  # AC terms are rounded to this step - flat screens hash to stable zeros, not float noise
+
+if NUMPY_AVAILABLE:
+    # Orthonormal DCT-II basis - dct(x) = DCT_MATRIX @ x @ DCT_MATRIX.T
+    index = np.arange(HASH_SAMPLE)
+    DCT_MATRIX = np.cos(np.pi * (2 * index[None, :] + 1) * index[:, None] / (2 * HASH_SAMPLE))
+    DCT_MATRIX[0] *= 1 / np.sqrt(2)
+    DCT_MATRIX *= np.sqrt(2 / HASH_SAMPLE)
+    del index
+
+
+def grayscale_sample(image, width=FRAME_CHANGE_SAMPLE_WIDTH):
+    """Small grayscale float32 array of an image (aspect ratio kept)"""
+    height = max(1, round(image.height * width / image.width))
+    # Shrink first (box filter averages), then convert - far cheaper than converting 4K pixels
+    small = image.resize((width, height), Image.BOX)
+    return np.asarray(small.convert("L"), dtype=np.float32)
+
+
+def perceptual_hash(sample):
+    """64-bit DCT hash of a grayscale sample array"""
+    thumbnail = Image.fromarray(sample.astype(np.uint8)).resize((HASH_SAMPLE, HASH_SAMPLE), Image.BOX)
+    pixels = np.asarray(thumbnail, dtype=np.float32)
+    low = (DCT_MATRIX @ pixels @ DCT_MATRIX.T)[:HASH_SIZE, :HASH_SIZE].flatten()
+    # On blank pages and dark desktops the AC terms are rounding error around 0 -
+    # quantize so a blinking caret cannot flip half the bits
+    low = np.round(low / HASH_AC_STEP)
+    # Compare against the median of the AC terms (the DC term is overall brightness)
+    bits = low > np.median(low[1:])
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def hash_distance(first, second):
+    """Number of differing bits between two hashes"""
+    return bin(first ^ second).count("1")
+
+
+def dirty_tiles(difference, tile=FRAME_DIRTY_TILE, min_diff=FRAME_DIRTY_TILE_MIN_DIFF):
+    """Boolean (rows, cols) grid of tiles whose mean abs difference reaches min_diff"""
+    height, width = difference.shape
+    rows, cols = -(-height // tile), -(-width // tile)
+    # Pad to whole tiles; edge tiles are averaged over their real pixels only
+    padded = np.zeros((rows * tile, cols * tile), dtype=np.float32)
+    padded[:height, :width] = difference
+    counts = np.zeros_like(padded)
+    counts[:height, :width] = 1
+    sums = padded.reshape(rows, tile, cols, tile).sum(axis=(1, 3))
+    pixels = counts.reshape(rows, tile, cols, tile).sum(axis=(1, 3))
+    return sums / pixels >= min_diff
+
+
+def merge_boxes(boxes):
+    """Merge touching or overlapping (left, top, right, bottom) tile boxes until none touch"""
+    merged = list(boxes)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                a, b = merged[i], merged[j]
+                if a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]:
+                    merged[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    del merged[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return merged
+
+
+def tile_boxes(grid):
+    """Bounding boxes (in tiles, right/bottom exclusive) of 8-connected dirty tile groups"""
+    rows, cols = grid.shape
+    seen = set()
+    boxes = []
+    for row, col in zip(*np.nonzero(grid)):
+        if (row, col) in seen:
+            continue
+        seen.add((row, col))
+        stack = [(row, col)]
+        top, left, bottom, right = row, col, row, col
+        while stack:
+            r, c = stack.pop()
+            top, left, bottom, right = min(top, r), min(left, c), max(bottom, r), max(right, c)
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < rows and 0 <= nc < cols and grid[nr, nc] and (nr, nc) not in seen:
+                        seen.add((nr, nc))
+                        stack.append((nr, nc))
+        boxes.append((int(left), int(top), int(right) + 1, int(bottom) + 1))
+    # Boxes one tile apart are merged too - one crop reads better than two slivers
+    padded = merge_boxes([(l - 1, t - 1, r + 1, b + 1) for l, t, r, b in boxes])
+    return [(max(0, l), max(0, t), min(cols, r), min(rows, b)) for l, t, r, b in padded]
+
+
+def dirty_regions(grid, frame_size, sample_shape, tile=FRAME_DIRTY_TILE,
+                  max_area=FRAME_DIRTY_MAX_AREA, max_regions=FRAME_DIRTY_MAX_REGIONS):
+    """Dirty tile grid -> [(left, top, right, bottom)] in frame pixels
+
+    Returns None when the change is not localized (too large, or too many
+    separate regions) and the whole frame should be analyzed.
+    """
+    boxes = tile_boxes(grid)
+    if not boxes:
+        return None
+    if len(boxes) > max_regions:
+        boxes = [(min(b[0] for b in boxes), min(b[1] for b in boxes),
+                  max(b[2] for b in boxes), max(b[3] for b in boxes))]
+
+    frame_width, frame_height = frame_size
+    scale_x = frame_width / sample_shape[1]
+    scale_y = frame_height / sample_shape[0]
+    regions = []
+    for left, top, right, bottom in boxes:
+        regions.append((int(left * tile * scale_x), int(top * tile * scale_y),
+                        min(frame_width, int(round(right * tile * scale_x))),
+                        min(frame_height, int(round(bottom * tile * scale_y)))))
+
+    area = sum((r - l) * (b - t) for l, t, r, b in regions)
+    if area > max_area * frame_width * frame_height:
+        return None
+    return regions
+
+
+def compose_regions(image, regions, gap=8):
+    """Crop the regions out of a frame; several crops are stacked into one image"""
+    crops = [image.crop(region) for region in regions]
+    if len(crops) == 1:
+        return crops[0]
+    width = max(crop.width for crop in crops)
+    height = sum(crop.height for crop in crops) + gap * (len(crops) - 1)
+    composite = Image.new("RGB", (width, height), (0, 0, 0))
+    top = 0
+    for crop in crops:
+        composite.paste(crop, (0, top))
+        top += crop.height + gap
+    return composite
+
+
+class FrameChangeDetector:
+    """Mean-abs-diff + perceptual hash comparison against the last analyzed frame"""
+
+    def __init__(self, min_mean_diff=FRAME_CHANGE_MIN_MEAN_DIFF,
+                 min_hash_distance=FRAME_CHANGE_MIN_HASH_DISTANCE, sample_width=FRAME_CHANGE_SAMPLE_WIDTH):
+        """Thresholds: mean diff on the 0-255 gray scale, hash distance in bits (of 64)"""
+        self.min_mean_diff = min_mean_diff
+        self.min_hash_distance = min_hash_distance
+        self.sample_width = sample_width
+        self.enabled = NUMPY_AVAILABLE
+        self.reference = None  # (sample, hash) of the last changed frame
+        self.frames_checked = 0
+        self.frames_skipped = 0
+        self.unchanged_streak = 0  # consecutive skipped frames
+
+        if not NUMPY_AVAILABLE:
+            print("⚠️ NumPy not available - frame change detection disabled (every frame is analyzed)")
+
+    def check(self, image):
+        """Compare a frame with the reference
+
+        Returns {"changed", "mean_diff", "hash_distance", "regions"}; regions
+        lists the changed (left, top, right, bottom) boxes in frame pixels, or
+        is None when the whole frame should be analyzed. A changed frame
+        becomes the new reference.
+        """
+        self.frames_checked += 1
+        if not self.enabled:
+            return {"changed": True, "mean_diff": None, "hash_distance": None, "regions": None}
+
+        sample = grayscale_sample(image, self.sample_width)
+        frame_hash = perceptual_hash(sample)
+        if self.reference is None or self.reference[0].shape != sample.shape:
+            # First frame, or the screen/resolution changed
+            self.reference = (sample, frame_hash)
+            self.unchanged_streak = 0
+            return {"changed": True, "mean_diff": None, "hash_distance": None, "regions": None}
+
+        difference = np.abs(sample - self.reference[0])
+        mean_diff = float(difference.mean())
+        distance = hash_distance(frame_hash, self.reference[1])
+        grid = dirty_tiles(difference)
+        # A localized change (one pane, one terminal line) barely moves the frame-wide numbers
+        changed = mean_diff >= self.min_mean_diff or distance >= self.min_hash_distance or bool(grid.any())
+        regions = dirty_regions(grid, image.size, sample.shape) if changed else None
+
+        if changed:
+            self.reference = (sample, frame_hash)
+            self.unchanged_streak = 0
+        else:
+            self.frames_skipped += 1
+            self.unchanged_streak += 1
+        return {"changed": changed, "mean_diff": round(mean_diff, 2), "hash_distance": distance,
+                "regions": regions}
+
+    def reset(self):
+        """Forget the reference - the next frame is always analyzed"""
+        self.reference = None
+        self.unchanged_streak = 0
+
+    def stats(self):
+        """Counters for the status display"""
+        return {"checked": self.frames_checked, "skipped": self.frames_skipped}
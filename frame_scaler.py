@@ -0,0 +1,129 @@
+"""
+Frame Scaler - Policy-Driven Downscaling of Captured Frames
+===========================================================
+
+Shrinks frames to what the vision model actually uses before they are
+encoded and sent. Strategies (FRAME_RESIZE_STRATEGY), cheapest first:
+- "reduce"   - Image.reduce() by the largest integer factor (block average
+               in C), then a bilinear step for the small remainder
+- "draft"    - JPEG sources decode at reduced size (Image.draft), then as
+               "reduce"; other images go straight to "reduce"
+- "numpy"    - NumPy area averaging for the integer factor, then bilinear
+- "box"      - one Image.BOX resize
+- "bilinear" - one Image.BILINEAR resize
+- "lanczos"  - one Image.LANCZOS resize (the old path - sharpest, slowest)
+
+Target size: VISION_MODEL_INPUT_SIZES gives each model's largest useful
+image side; pixels beyond that are resized away inside the model anyway.
+Per-strategy timings are kept for the status display; compare quality and
+speed on your own screens:  python benchmark_downscale.py
+"""
+
+import threading
+import time
+from PIL import Image
+from config import FRAME_RESIZE_STRATEGY, VISION_MODEL_INPUT_SIZES
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+RESIZE_STRATEGIES = ("reduce", "draft", "numpy", "box", "bilinear", "lanczos")
+
+
+def fit_size(size, max_width, max_height):
+    """Largest size within max_width x max_height keeping the aspect ratio (never upscales)"""
+    width, height = size
+    scale = min(max_width / width, max_height / height, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def model_input_side(model_name):
+    """Largest useful image side for a vision model ("llava:13b" -> the "llava" entry)"""
+    base = (model_name or "").split(":")[0].split("/")[-1].lower()
+    matches = [name for name in VISION_MODEL_INPUT_SIZES if name != "default" and base.startswith(name)]
+    if matches:
+        return VISION_MODEL_INPUT_SIZES[max(matches, key=len)]
+    return VISION_MODEL_INPUT_SIZES["default"]
+
+
+def integer_factor(size, target):
+    """Largest whole reduction factor that does not go below target"""
+    return max(1, min(size[0] // target[0], size[1] // target[1]))
+
+
+def area_average(image, factor):
+    """NumPy block mean over factor x factor pixels"""
+    pixels = np.asarray(image)
+    height, width = pixels.shape[0] // factor * factor, pixels.shape[1] // factor * factor
+    # Sum the factor x factor strided views - far faster than reshape + mean over
+    # non-contiguous axes; uint16 holds up to 16x16 blocks of 255
+    totals = np.zeros((height // factor, width // factor) + pixels.shape[2:],
+                      dtype=np.uint16 if factor <= 16 else np.uint32)
+    for dy in range(factor):
+        for dx in range(factor):
+            totals += pixels[dy:height:factor, dx:width:factor]
+    averaged = ((totals + factor * factor // 2) // (factor * factor)).astype(np.uint8)
+    return Image.fromarray(averaged)
+
+
+class FrameScaler:
+    """Resizes frames with one strategy and records how long each strategy takes"""
+
+    def __init__(self, strategy=FRAME_RESIZE_STRATEGY):
+        """strategy: one of RESIZE_STRATEGIES"""
+        if strategy not in RESIZE_STRATEGIES:
+            print(f"⚠️ Unknown resize strategy '{strategy}' - using 'reduce'")
+            strategy = "reduce"
+        if strategy == "numpy" and not NUMPY_AVAILABLE:
+            print("⚠️ NumPy not available - using 'reduce' for downscaling")
+            strategy = "reduce"
+        self.strategy = strategy
+        self.lock = threading.Lock()
+        self.timings = {}  # strategy -> (count, total seconds)
+
+    def resize(self, image, size, strategy=None):
+        """Image resized to exactly size with the given (or configured) strategy"""
+        strategy = strategy or self.strategy
+        if image.size == tuple(size):
+            return image
+        started = time.perf_counter()
+
+        if strategy in ("reduce", "draft", "numpy"):
+            if strategy == "draft" and getattr(image, "format", None) == "JPEG":
+                image.draft(image.mode, size)  # decoder-side 1/2, 1/4, 1/8 scaling
+            factor = integer_factor(image.size, size)
+            if factor > 1:
+                image = area_average(image, factor) if strategy == "numpy" else image.reduce(factor)
+            if image.size != tuple(size):
+                image = image.resize(size, Image.BILINEAR)
+        elif strategy == "box":
+            image = image.resize(size, Image.BOX)
+        elif strategy == "bilinear":
+            image = image.resize(size, Image.BILINEAR)
+        else:
+            image = image.resize(size, Image.LANCZOS)
+
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            count, total = self.timings.get(strategy, (0, 0.0))
+            self.timings[strategy] = (count + 1, total + elapsed)
+        return image
+
+    def fit(self, image, max_width, max_height=None, strategy=None):
+        """Downscale to fit max_width x max_height (default square); smaller images are returned as is"""
+        size = fit_size(image.size, max_width, max_height or max_width)
+        return self.resize(image, size, strategy)
+
+    def fit_model(self, image, model_name, strategy=None):
+        """Downscale to the model's input resolution"""
+        return self.fit(image, model_input_side(model_name), strategy=strategy)
+
+    def stats(self):
+        """Average milliseconds per strategy used so far"""
+        with self.lock:
+            return {strategy: {"frames": count, "average_ms": round(total / count * 1000, 2)}
+                    for strategy, (count, total) in self.timings.items()}
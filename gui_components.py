@@ -18,7 +18,7 @@ from datetime import datetime
 from visual_log_window import VisualLogWindow
 from config import (
     WINDOW_TITLE, WINDOW_GEOMETRY, APP_COLORS, UI_FONTS,
-    BUTTON_PADDING, TEXT_AREAS, STARTUP_MESSAGES
+    BUTTON_PADDING, TEXT_AREAS, STARTUP_MESSAGES, VISION_MEMORY_FILE
 )
 
 
@@ -53,6 +53,12 @@ class GUIComponents:
             # Create UI components
             self.create_ui_components()
             
+            # Route logged system messages to the status bar (thread-safe via after)
+            self.app_controller.memory_manager.log_pipeline.register_sink(
+                "widget", lambda level, message_type, sender, message:
+                    self.root.after(0, self.update_status, f"{sender}: {message}")
+            )
+            
             # Show startup message
             self.show_startup_message()
             
@@ -420,10 +426,13 @@ class GUIComponents:
     def on_show_visual_log(self):
         """Handle visual log button"""
         try:
-            if not self.visual_log_window or not self.visual_log_window.window.winfo_exists():
-                self.visual_log_window = VisualLogWindow()
+            if not self.visual_log_window:
+                memory_manager = self.app_controller.memory_manager
+                self.visual_log_window = VisualLogWindow(
+                    self, VISION_MEMORY_FILE, memory_manager.vision_store, memory_manager.search_index
+                )
                 
-            self.visual_log_window.show()
+            self.visual_log_window.show_window()
             self.update_status("Visual log window opened")
             
         except Exception as e:
@@ -0,0 +1,80 @@
+"""
+Image Encoder - Per-Mode Encoding Policy for Vision Payloads
+============================================================
+
+Decides how a captured image is turned into bytes for the vision model:
+- PNG with a tuned compress_level (1 is several times faster than Pillow's
+  default 6 on desktop captures, for a slightly larger file)
+- JPEG / WebP with a quality setting - much smaller payloads for photos,
+  video and busy screens
+- grayscale - a third of the pixels for text-reading modes
+
+VISION_ENCODER_POLICIES in config.py maps each vision mode ("Vision Text",
+"Vision Image", "default") to its settings. Compare the options on your
+own screens:  python benchmark_encoder.py
+"""
+
+from io import BytesIO
+from config import VISION_ENCODER_POLICIES
+
+# Extensions written for each format (rotation files keep the format they were sent in)
+FORMAT_EXTENSIONS = {"PNG": ".png", "JPEG": ".jpg", "WEBP": ".webp"}
+IMAGE_EXTENSIONS = tuple(FORMAT_EXTENSIONS.values())
+
+
+class ImageEncoder:
+    """Encodes PIL images with one fixed set of format options"""
+
+    def __init__(self, format="PNG", quality=85, compress_level=6, grayscale=False, method=4):
+        """format: PNG/JPEG/WEBP; quality for JPEG/WebP, compress_level for PNG, method for WebP"""
+        self.format = format.upper()
+        if self.format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"Unsupported image format: {format}")
+        self.quality = quality
+        self.compress_level = compress_level
+        self.grayscale = grayscale
+        self.method = method
+
+    @property
+    def extension(self):
+        """File extension matching the encoded bytes"""
+        return FORMAT_EXTENSIONS[self.format]
+
+    def describe(self):
+        """Short label for logs and benchmark tables"""
+        if self.format == "PNG":
+            label = f"PNG level {self.compress_level}"
+        else:
+            label = f"{self.format} q{self.quality}"
+        return label + (" gray" if self.grayscale else "")
+
+    def prepare(self, image):
+        """Convert to the pixel mode the format expects"""
+        if self.grayscale:
+            return image if image.mode == "L" else image.convert("L")
+        if image.mode not in ("RGB", "L"):
+            # JPEG cannot store alpha; screenshots never need it
+            return image.convert("RGB")
+        return image
+
+    def encode(self, image):
+        """Encoded image bytes"""
+        image = self.prepare(image)
+        buffer = BytesIO()
+        if self.format == "PNG":
+            image.save(buffer, format="PNG", compress_level=self.compress_level)
+        elif self.format == "JPEG":
+            image.save(buffer, format="JPEG", quality=self.quality)
+        else:
+            image.save(buffer, format="WEBP", quality=self.quality, method=self.method)
+        return buffer.getvalue()
+
+
+def get_encoder(mode="default"):
+    """Encoder for a vision mode (unknown modes use the "default" policy)"""
+    policy = VISION_ENCODER_POLICIES.get(mode, VISION_ENCODER_POLICIES["default"])
+    try:
+        return ImageEncoder(**policy)
+    except (TypeError, ValueError) as e:
+        print(f"⚠️ Invalid encoder policy for '{mode}' ({e}) - using PNG")
+        return ImageEncoder()
@@ -0,0 +1,138 @@
+"""
+Interpretation Cache - Reuse Results for Near-Identical Frames
+==============================================================
+
+Users switch between the same few windows all day, so rotation keeps
+sending screens the model has already described. Before a frame goes to
+Ollama the cache is consulted:
+- Entries are keyed by the frame's 64-bit perceptual hash (frame_change.py)
+  and a context (model + prompt kind) - a prompt change never reuses text
+- A lookup matches the closest cached hash within
+  INTERPRETATION_CACHE_MAX_DISTANCE bits, then confirms it against the stored
+  grayscale sample (no dirty tile, see frame_change.dirty_tiles) - the same
+  window layout with different text is NOT a hit
+- LRU order with INTERPRETATION_CACHE_SIZE entries; entries older than
+  INTERPRETATION_CACHE_TTL seconds expire
+- hits / misses / hit rate / evictions for the status display
+
+Without NumPy the cache stays empty (every lookup misses).
+"""
+
+import collections
+import threading
+import time
+from frame_change import NUMPY_AVAILABLE, grayscale_sample, perceptual_hash, hash_distance, dirty_tiles
+from config import (
+    INTERPRETATION_CACHE_SIZE, INTERPRETATION_CACHE_TTL, INTERPRETATION_CACHE_MAX_DISTANCE,
+    FRAME_CHANGE_MIN_MEAN_DIFF
+)
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+
+def fingerprint(image):
+    """(perceptual hash, uint8 grayscale sample) of an image, or None without NumPy"""
+    if not NUMPY_AVAILABLE or image is None:
+        return None
+    sample = grayscale_sample(image)
+    return perceptual_hash(sample), sample.astype(np.uint8)
+
+
+class InterpretationCache:
+    """LRU + TTL cache of interpretations keyed by perceptual hash"""
+
+    def __init__(self, max_entries=INTERPRETATION_CACHE_SIZE, ttl=INTERPRETATION_CACHE_TTL,
+                 max_distance=INTERPRETATION_CACHE_MAX_DISTANCE):
+        """max_entries for LRU eviction, ttl in seconds, max_distance in hash bits"""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self.entries = collections.OrderedDict()  # entry id -> entry dict, least recently used first
+        self.next_id = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def expire(self, now):
+        """Drop entries past their TTL (caller holds the lock)"""
+        stale = [key for key, entry in self.entries.items() if now - entry["created"] > self.ttl]
+        for key in stale:
+            del self.entries[key]
+        self.expired += len(stale)
+
+    def matches(self, entry, sample):
+        """Pixel-level confirmation of a hash match"""
+        cached = entry["sample"]
+        if cached.shape != sample.shape:
+            return False
+        difference = np.abs(sample.astype(np.float32) - cached.astype(np.float32))
+        return difference.mean() < FRAME_CHANGE_MIN_MEAN_DIFF and not dirty_tiles(difference).any()
+
+    def find(self, frame_hash, sample, context):
+        """Id of the closest matching entry, or None (caller holds the lock)
+
+        Different screens with the same layout can share a hash, so every
+        candidate within max_distance is confirmed against its sample.
+        """
+        best_id, best_distance = None, None
+        for entry_id, entry in self.entries.items():
+            if entry["context"] != context:
+                continue
+            distance = hash_distance(frame_hash, entry["hash"])
+            if distance <= self.max_distance and (best_distance is None or distance < best_distance) \
+                    and self.matches(entry, sample):
+                best_id, best_distance = entry_id, distance
+        return best_id
+
+    def lookup(self, frame_print, context=""):
+        """Cached interpretation for a fingerprint, or None (counted as hit/miss)"""
+        if frame_print is None:
+            return None
+        frame_hash, sample = frame_print
+        with self.lock:
+            self.expire(time.monotonic())
+            entry_id = self.find(frame_hash, sample, context)
+            if entry_id is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry = self.entries[entry_id]
+            entry["hits"] += 1
+            self.entries.move_to_end(entry_id)
+            return entry["interpretation"]
+
+    def store(self, frame_print, interpretation, context=""):
+        """Remember the interpretation of a frame"""
+        if frame_print is None or not interpretation:
+            return
+        frame_hash, sample = frame_print
+        now = time.monotonic()
+        with self.lock:
+            self.expire(now)
+            # The same screen stored again replaces its entry (fresh TTL)
+            entry_id = self.find(frame_hash, sample, context)
+            if entry_id is None:
+                entry_id = self.next_id
+                self.next_id += 1
+            self.entries[entry_id] = {"context": context, "hash": frame_hash, "sample": sample,
+                                      "interpretation": interpretation, "created": now, "hits": 0}
+            self.entries.move_to_end(entry_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evicted += 1
+
+    def clear(self):
+        """Forget every entry (statistics are kept)"""
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Hit-rate statistics"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses,
+                    "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                    "expired": self.expired, "evicted": self.evicted}
@@ -0,0 +1,151 @@
+"""
+Log Pipeline - Leveled, Rate-Limited Message Routing
+====================================================
+
+One entry point for every status/debug/error line:
+- Four levels: DEBUG < INFO < WARN < ERROR
+- Messages below LOG_MIN_LEVEL are dropped before any sink runs
+- Per-sender token buckets cap chatty senders (e.g. per-frame "Debug" lines);
+  ERROR is never rate-limited
+- Each level is routed to its own set of sinks - "widget" (chat/status
+  display), "memory" (system memory file) and "console"
+
+Callers building expensive debug strings can check enabled(DEBUG) first, so
+debug noise costs a single comparison when it is switched off.
+"""
+
+import threading
+import time
+from config import LOG_MIN_LEVEL, LOG_LEVEL_SINKS, LOG_RATE_LIMITS
+
+
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARN: "WARN", ERROR: "ERROR"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+# Sender names / message types that imply a level (everything else is INFO)
+SENDER_LEVELS = {
+    "debug": DEBUG,
+    "warn": WARN,
+    "warning": WARN,
+    "error": ERROR,
+}
+
+
+def level_for(name):
+    """Level implied by a sender name or message type ("Debug", "error", ...)"""
+    return SENDER_LEVELS.get(name.lower(), INFO) if name else INFO
+
+
+class TokenBucket:
+    """Classic token bucket: rate tokens per second, up to burst tokens"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "suppressed")
+
+    def __init__(self, rate, burst):
+        """Start with a full bucket"""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.suppressed = 0
+
+    def allow(self):
+        """Take one token if available"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        self.suppressed += 1
+        return False
+
+
+class LogPipeline:
+    """Routes messages by level to registered sinks, rate-limited per sender"""
+
+    def __init__(self, min_level=LOG_MIN_LEVEL, level_sinks=LOG_LEVEL_SINKS, rate_limits=LOG_RATE_LIMITS):
+        """Configure levels, routes and per-sender limits (defaults from config)"""
+        self.min_level = LEVELS.get(min_level, min_level) if isinstance(min_level, str) else min_level
+        self.routes = {LEVELS[name]: tuple(sinks) for name, sinks in level_sinks.items()}
+        self.rate_limits = rate_limits
+        self.sinks = {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+        # Counters for the status/diagnostics display
+        self.emitted = 0
+        self.filtered = 0
+        self.rate_limited = 0
+
+    def register_sink(self, name, sink):
+        """Register sink(level, message_type, sender, message) under a route name"""
+        self.sinks[name] = sink
+
+    def set_min_level(self, level):
+        """Change the minimum level at runtime ("DEBUG", "INFO", ... or a number)"""
+        self.min_level = LEVELS.get(level, level) if isinstance(level, str) else level
+
+    def enabled(self, level):
+        """Would a message at this level reach any sink?"""
+        return level >= self.min_level and bool(self.routes.get(level))
+
+    def allow(self, sender):
+        """Token-bucket check for a sender; returns (allowed, suppressed since last pass)"""
+        limit = self.rate_limits.get(sender)
+        if not limit:
+            return True, 0
+        with self.lock:
+            bucket = self.buckets.get(sender)
+            if bucket is None:
+                bucket = self.buckets[sender] = TokenBucket(*limit)
+            if not bucket.allow():
+                return False, 0
+            suppressed, bucket.suppressed = bucket.suppressed, 0
+            return True, suppressed
+
+    def log(self, sender, message, level=None, message_type=None):
+        """Route one message; returns True if it reached at least one sink"""
+        if level is None:
+            level = level_for(sender)
+        if not self.enabled(level):
+            self.filtered += 1
+            return False
+
+        if level < ERROR:
+            allowed, suppressed = self.allow(sender)
+            if not allowed:
+                self.rate_limited += 1
+                return False
+            if suppressed:
+                message = f"{message} (+{suppressed} similar suppressed)"
+
+        message_type = message_type or sender.lower()
+        delivered = False
+        for name in self.routes[level]:
+            sink = self.sinks.get(name)
+            if sink is None:
+                continue
+            try:
+                sink(level, message_type, sender, message)
+                delivered = True
+            except Exception as e:
+                print(f"Log sink '{name}' error: {e}")
+
+        if delivered:
+            self.emitted += 1
+        return delivered
+
+    def stats(self):
+        """Counters: emitted, filtered by level, rate-limited"""
+        return {"emitted": self.emitted, "filtered": self.filtered, "rate_limited": self.rate_limited}
+
+
+def console_sink(level, message_type, sender, message):
+    """Print sink: [LEVEL] sender: message"""
+    print(f"[{LEVEL_NAMES.get(level, level)}] {sender}: {message}")
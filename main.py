@@ -23,6 +23,7 @@ from config import WINDOW_TITLE, STARTUP_MESSAGES
 from memory_manager import MemoryManager
 from speech_system import SpeechSystem  
 from vision_system import VisionSystem
+from capture_engine import close_capture_engine
 from window_manager import WindowManager
 from gui_components import GUIComponents
 
@@ -95,10 +96,6 @@ class VisualInterpretationSystem:
         try:
             print("🧹 Cleaning up system resources...")
             
-            # Save final memory state
-            if hasattr(self, 'memory_manager'):
-                self.memory_manager.save_all()
-            
             # Clean up components
             if hasattr(self, 'speech_system'):
                 self.speech_system.cleanup()
@@ -106,11 +103,15 @@ class VisualInterpretationSystem:
             if hasattr(self, 'gui_components'):
                 self.gui_components.cleanup()
             
-            # Log shutdown
+            # Release the shared screen capture session
+            close_capture_engine()
+            
+            # Log shutdown, then flush everything queued to disk
             if hasattr(self, 'memory_manager'):
                 self.memory_manager.save_system_message(
                     "system", "Main", "Visual Interpretation System shutdown"
                 )
+                self.memory_manager.shutdown()
             
             print("✅ Cleanup completed successfully")
             
@@ -120,6 +121,11 @@ class VisualInterpretationSystem:
     def signal_handler(self, signum, frame):
         """Handle system signals for graceful shutdown"""
         print(f"\n🛑 Received signal {signum}, shutting down...")
+        
+        # Flush queued memory writes first - cleanup may be interrupted
+        if hasattr(self, 'memory_manager'):
+            self.memory_manager.flush()
+            
         self.cleanup()
         sys.exit(0)
 
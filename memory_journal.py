@@ -0,0 +1,429 @@
+"""
+Memory Journal - Append-Only JSONL Backend
+==========================================
+
+Stores memory entries as one JSON object per line:
+- Every log call appends a single line (O(1) disk I/O)
+- Optional run-length collapsing: back-to-back identical (type, sender,
+  content) entries become one line with a count and first/last timestamps
+- Startup reads only the snapshot header and the newest journal lines
+  (seeking back from the end, memory-mapped for large files); older
+  history is paged in on demand
+- The journal is compacted to the newest entries once it grows past its limit
+- A classic {"total_entries", "last_updated", "entries"} snapshot is written
+  next to the journal on compaction/save, so existing readers keep working
+
+This replaces re-serializing the whole memory file on every log line.
+"""
+
+import gzip
+import lzma
+import mmap
+import os
+import re
+import threading
+import zlib
+from datetime import datetime
+from config import MEMORY_COMPACT_INTERVAL, MEMORY_TAIL_MMAP_MIN_BYTES
+from memory_serializer import serializer
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+
+# Archive codecs for compressed segments -> file extension
+ARCHIVE_EXTENSIONS = {
+    "gzip": ".gz",
+    "lzma": ".xz",
+    "zstd": ".zst",
+}
+
+# What a truncated or corrupt archive raises while it is read
+ARCHIVE_READ_ERRORS = (OSError, EOFError, zlib.error, lzma.LZMAError) + (
+    (zstandard.ZstdError,) if ZSTD_AVAILABLE else ())
+
+
+def archive_codec(path):
+    """Compression codec of a segment file by extension (None = plain JSONL)"""
+    for codec, extension in ARCHIVE_EXTENSIONS.items():
+        if path.endswith(extension):
+            return codec
+    return None
+
+
+def resolve_archive_codec(codec):
+    """Usable codec for a configured name - zstd falls back to gzip if not installed"""
+    if codec == "zstd" and not ZSTD_AVAILABLE:
+        print("⚠️ zstandard not installed - archiving with gzip instead")
+        return "gzip"
+    if codec is not None and codec not in ARCHIVE_EXTENSIONS:
+        print(f"⚠️ Unknown archive compression '{codec}' - archiving with gzip instead")
+        return "gzip"
+    return codec
+
+
+def open_jsonl(path, mode='r', codec=None):
+    """Open a plain or compressed JSONL file ('r'/'w'/'a' text, or 'rb')"""
+    codec = codec or archive_codec(path)
+    binary = 'b' in mode
+    if codec == "gzip":
+        return gzip.open(path, mode if binary else mode + 't', encoding=None if binary else 'utf-8')
+    if codec == "lzma":
+        return lzma.open(path, mode if binary else mode + 't', encoding=None if binary else 'utf-8')
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(f"zstandard is required to read {os.path.basename(path)}")
+        return zstandard.open(path, mode if binary else mode + 't', encoding=None if binary else 'utf-8')
+    return open(path, mode, encoding=None if binary else 'utf-8')
+
+
+def count_jsonl_lines(path):
+    """Count complete lines in a journal/segment file without parsing"""
+    count = 0
+    with open_jsonl(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            count += chunk.count(b'\n')
+    return count
+
+
+def read_jsonl_file(path):
+    """Read every complete JSON line from a journal/segment file"""
+    entries = []
+    if not os.path.exists(path):
+        return entries
+
+    with open_jsonl(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(serializer.loads(line))
+            except ValueError:
+                # Torn last line after a crash - skip it
+                continue
+    return entries
+
+
+def iter_jsonl_lines_reversed(path, block_size=1 << 16, mmap_min_bytes=MEMORY_TAIL_MMAP_MIN_BYTES):
+    """Yield raw lines of a plain journal newest first, seeking back from the end
+
+    Large files are memory-mapped and walked with rfind, so only the pages
+    holding the returned lines are ever read.
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        if mmap_min_bytes and position >= mmap_min_bytes:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                end = len(view)
+                while end > 0:
+                    start = view.rfind(b'\n', 0, end) + 1
+                    line = view[start:end]
+                    if line.strip():
+                        yield line
+                    end = start - 1
+            return
+
+        remainder = b''
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + remainder).split(b'\n')
+            # First piece may be the tail of a line that starts in an earlier block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
+
+
+def read_jsonl_tail(path, count, skip=0):
+    """Newest count entries before the newest skip ones (oldest first)
+
+    Plain journals are read backwards from the end, so the cost depends on
+    count + skip, not on the file size. Compressed archives are read whole.
+    """
+    if count <= 0 or not os.path.exists(path):
+        return []
+    if archive_codec(path):
+        entries = read_jsonl_file(path)
+        end = len(entries) - skip
+        return entries[max(0, end - count):max(0, end)]
+
+    entries = []
+    for line in iter_jsonl_lines_reversed(path):
+        try:
+            entry = serializer.loads(line)
+        except ValueError:
+            # Torn last line after a crash - skip it
+            continue
+        if skip:
+            skip -= 1
+            continue
+        entries.append(entry)
+        if len(entries) >= count:
+            break
+    entries.reverse()
+    return entries
+
+
+def read_snapshot_header(path, size=1024):
+    """(total_entries, entries_count) from the top of a snapshot without parsing it all"""
+    with open(path, 'rb') as f:
+        head = f.read(size).decode('utf-8', errors='ignore')
+    total = re.search(r'"total_entries":\s*(\d+)', head)
+    count = re.search(r'"entries_count":\s*(\d+)', head)
+    if total and count:
+        return int(total.group(1)), int(count.group(1))
+    return None
+
+
+# Entries that agree on these fields and arrive back to back collapse into one run
+RUN_LENGTH_FIELDS = ("type", "sender", "content")
+
+
+def is_repeat(run, entry):
+    """Is entry a consecutive repeat of run (same type, sender and content)?"""
+    return all(run.get(field) == entry.get(field) for field in RUN_LENGTH_FIELDS)
+
+
+def merge_repeat(run, entry):
+    """New run entry: count plus first/last timestamps (inputs are not modified)"""
+    merged = dict(run)
+    merged["count"] = run.get("count", 1) + entry.get("count", 1)
+    merged["first_timestamp"] = run.get("first_timestamp", run.get("timestamp"))
+    merged["last_timestamp"] = entry.get("last_timestamp", entry.get("timestamp"))
+    return merged
+
+
+def write_jsonl_file(path, entries):
+    """Atomically replace a journal/segment file (compressed if an archive)"""
+    temp_path = path + ".tmp"
+    with open_jsonl(temp_path, 'wb', codec=archive_codec(path)) as f:
+        for entry in entries:
+            f.write(serializer.dumps(entry) + b"\n")
+    os.replace(temp_path, path)
+
+
+class MemoryJournal:
+    """Append-only JSONL journal with periodic compaction"""
+
+    def __init__(self, snapshot_path, max_entries, compact_interval=MEMORY_COMPACT_INTERVAL,
+                 collapse_repeats=False):
+        """Initialize journal next to its JSON snapshot file"""
+        self.snapshot_path = snapshot_path
+        self.journal_path = os.path.splitext(snapshot_path)[0] + ".jsonl"
+        self.max_entries = max_entries  # None = keep everything (no compaction)
+        self.compact_interval = compact_interval
+        self.lock = threading.RLock()
+
+        # Entries already compacted away (kept so total_entries stays honest)
+        self.dropped_entries = 0
+        self.journal_entries = 0
+
+        # Run-length collapsing: the last line is rewritten in place while it repeats
+        self.collapse_repeats = collapse_repeats
+        self.last_entry = None
+        self.last_line_offset = None
+
+        self.open_journal()
+        self.terminate_last_line()
+        self.load_last_line()
+
+    def open_journal(self):
+        """Count existing journal lines, migrating the old JSON file if needed"""
+        try:
+            if os.path.exists(self.journal_path) and os.path.exists(self.snapshot_path):
+                # Normal startup: only the snapshot header is needed, not its entries
+                header = read_snapshot_header(self.snapshot_path)
+                if header:
+                    self.dropped_entries = max(0, header[0] - header[1])
+                    self.journal_entries = self.count_journal_lines()
+                    return
+
+            snapshot = self.read_snapshot()
+            snapshot_entries = snapshot.get('entries', [])
+            snapshot_total = snapshot.get('total_entries', len(snapshot_entries))
+            self.dropped_entries = max(0, snapshot_total - len(snapshot_entries))
+
+            if os.path.exists(self.journal_path):
+                self.journal_entries = self.count_journal_lines()
+            elif snapshot_entries:
+                # First run on this file: seed the journal from the old snapshot
+                self.rewrite_journal(snapshot_entries)
+                print(f"📒 Migrated {len(snapshot_entries)} entries to {os.path.basename(self.journal_path)}")
+
+        except Exception as e:
+            print(f"Memory journal open error: {e}")
+
+    def read_snapshot(self):
+        """Read the JSON snapshot file (empty view if missing or broken)"""
+        try:
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, 'rb') as f:
+                    return serializer.loads(f.read())
+        except Exception as e:
+            print(f"Memory snapshot read error: {e}")
+        return {"entries": []}
+
+    def count_journal_lines(self):
+        """Count complete lines in the journal file"""
+        return count_jsonl_lines(self.journal_path)
+
+    @property
+    def total_entries(self):
+        """Total entries ever logged (including compacted ones)"""
+        return self.dropped_entries + self.journal_entries
+
+    def append(self, entry):
+        """Append one entry to the journal"""
+        self.append_many([entry])
+
+    def terminate_last_line(self):
+        """Add the newline a crash or external writer left off, so appends start a new line"""
+        try:
+            if not os.path.exists(self.journal_path) or not os.path.getsize(self.journal_path):
+                return
+            with open(self.journal_path, 'rb+') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+                    self.journal_entries += 1
+        except OSError as e:
+            print(f"Memory journal repair error: {e}")
+
+    def load_last_line(self):
+        """Remember the final journal line and its byte offset (for run-length collapsing)"""
+        self.last_entry = None
+        self.last_line_offset = None
+        if not self.collapse_repeats or not os.path.exists(self.journal_path):
+            return
+        try:
+            size = os.path.getsize(self.journal_path)
+            for line in iter_jsonl_lines_reversed(self.journal_path):
+                # Only a complete, newline-terminated last line can be rewritten -
+                # check the bytes on disk instead of trusting the offset
+                offset = size - len(line) - 1
+                with open(self.journal_path, 'rb') as f:
+                    f.seek(offset)
+                    if f.read() != bytes(line) + b"\n":
+                        return
+                self.last_entry = serializer.loads(line)
+                self.last_line_offset = offset
+                break
+        except (ValueError, OSError):
+            # Torn last line - start a fresh run after it
+            self.last_entry = None
+            self.last_line_offset = None
+
+    def append_many(self, entries):
+        """Append several entries with a single write"""
+        if not entries:
+            return
+
+        with self.lock:
+            rewrite_last = False
+            if self.collapse_repeats:
+                # Fold consecutive repeats into runs; the journal's last run may keep growing
+                head = None  # updated version of the journal's last line
+                collapsed = []
+                run = self.last_entry
+                for entry in entries:
+                    if run is not None and is_repeat(run, entry):
+                        run = merge_repeat(run, entry)
+                        if collapsed:
+                            collapsed[-1] = run
+                        else:
+                            head = run
+                    else:
+                        run = entry
+                        collapsed.append(entry)
+                rewrite_last = head is not None
+                entries = ([head] if rewrite_last else []) + collapsed
+
+            lines = [serializer.dumps(entry) + b"\n" for entry in entries]
+
+            if rewrite_last:
+                # Drop the old run line - its updated version is the first line written
+                os.truncate(self.journal_path, self.last_line_offset)
+            with open(self.journal_path, 'ab') as f:
+                start = f.tell()
+                f.write(b"".join(lines))
+
+            if self.collapse_repeats:
+                self.last_entry = entries[-1]
+                self.last_line_offset = start + sum(len(line) for line in lines[:-1])
+            self.journal_entries += len(entries) - (1 if rewrite_last else 0)
+
+            # Compact once we are a full interval past the retention limit
+            if self.max_entries and self.journal_entries >= self.max_entries + self.compact_interval:
+                self.compact()
+
+    def read_entries(self):
+        """Read all entries currently in the journal"""
+        with self.lock:
+            return read_jsonl_file(self.journal_path)
+
+    def read_tail(self, count, skip=0):
+        """Newest count entries (skipping the newest skip) without reading the whole journal"""
+        with self.lock:
+            return read_jsonl_tail(self.journal_path, count, skip)
+
+    def read_view(self):
+        """Return the classic memory file view for readers"""
+        with self.lock:
+            entries = self.read_entries()
+            if self.max_entries:
+                entries = entries[-self.max_entries:]
+            return {
+                "total_entries": self.total_entries,
+                "entries_count": len(entries),  # lets startup skip parsing the entries
+                "last_updated": datetime.now().isoformat(),
+                "entries": entries
+            }
+
+    def compact(self):
+        """Trim the journal to the newest entries and refresh the snapshot"""
+        with self.lock:
+            entries = self.read_entries()
+            keep = entries[-self.max_entries:] if self.max_entries else entries
+            self.dropped_entries += len(entries) - len(keep)
+            self.rewrite_journal(keep)
+            self.dump_snapshot()
+
+    def rewrite_journal(self, entries):
+        """Atomically replace the journal with the given entries"""
+        with self.lock:
+            write_jsonl_file(self.journal_path, entries)
+            self.journal_entries = len(entries)
+            self.load_last_line()
+
+    def write_snapshot(self):
+        """Compact if needed, then write the classic JSON view"""
+        with self.lock:
+            # Snapshot entries must match the journal so total_entries survives restarts
+            if self.max_entries and self.journal_entries > self.max_entries:
+                self.compact()
+            else:
+                self.dump_snapshot()
+
+    def dump_snapshot(self):
+        """Write the classic JSON view next to the journal"""
+        with self.lock:
+            view = self.read_view()
+            with open(self.snapshot_path, 'wb') as f:
+                f.write(serializer.dumps_pretty(view))
+
+    def clear(self):
+        """Remove all entries from journal and snapshot"""
+        with self.lock:
+            self.dropped_entries = 0
+            self.rewrite_journal([])
+            self.write_snapshot()
@@ -10,12 +10,19 @@ Handles all three types of memory:
 This replaces the scattered memory code from the monolith.
 """
 
-import json
-import os
 from datetime import datetime
+from memory_journal import MemoryJournal
+from memory_writer import MemoryWriter
+from memory_search import MemorySearchIndex
+from memory_rollups import MemoryRollups
+from memory_records import MemoryRecordBuffer, SystemMemoryRecord, ChatMemoryRecord
+from log_pipeline import LogPipeline, level_for
+from vision_store import VisionMemoryStore, VisionSegmentCompactor
 from config import (
     SYSTEM_MEMORY_FILE, CHAT_MEMORY_FILE, VISION_MEMORY_FILE,
-    MAX_SYSTEM_MEMORY_ENTRIES, MAX_CHAT_MEMORY_ENTRIES
+    MAX_SYSTEM_MEMORY_ENTRIES, MAX_CHAT_MEMORY_ENTRIES,
+    MEMORY_STORAGE_ENGINE, SQLITE_MEMORY_FILE, SEARCH_RESULT_LIMIT,
+    MEMORY_STARTUP_TAIL_ENTRIES, MEMORY_PAGE_SIZE, SYSTEM_MEMORY_COLLAPSE_REPEATS
 )
 
 
@@ -24,49 +31,102 @@ class MemoryManager:
     
     def __init__(self):
         """Initialize memory systems"""
-        self.system_memory = []
-        self.chat_memory = []
+        # Bounded in-RAM history - same limits the journals keep on disk
+        self.system_memory = MemoryRecordBuffer(SystemMemoryRecord, MAX_SYSTEM_MEMORY_ENTRIES,
+                                                collapse_repeats=SYSTEM_MEMORY_COLLAPSE_REPEATS)
+        self.chat_memory = MemoryRecordBuffer(ChatMemoryRecord, MAX_CHAT_MEMORY_ENTRIES)
+        
+        # Append-only journals - one line per entry instead of full rewrites
+        self.system_journal = MemoryJournal(SYSTEM_MEMORY_FILE, MAX_SYSTEM_MEMORY_ENTRIES,
+                                            collapse_repeats=SYSTEM_MEMORY_COLLAPSE_REPEATS)
+        self.chat_journal = MemoryJournal(CHAT_MEMORY_FILE, MAX_CHAT_MEMORY_ENTRIES)
+        self.vision_store = VisionMemoryStore(VISION_MEMORY_FILE)
+        
+        # Background writer - callers never block on disk I/O
+        self.writer = MemoryWriter()
+        
+        # Leveled log pipeline in front of system memory (GUI registers the "widget" sink).
+        # No console sink - the components already print their own errors.
+        self.log_pipeline = LogPipeline()
+        self.log_pipeline.register_sink("memory", self.persist_system_message)
+        
+        # Full-text index over vision interpretations and chat text (kept up to date on save)
+        self.search_index = MemorySearchIndex({
+            "vision": self.vision_store.read_all_entries,
+            "chat": self.chat_journal.read_entries
+        }, limits={"chat": MAX_CHAT_MEMORY_ENTRIES})
+        
+        # Vision retention in the background - the index drops what the store pruned
+        self.vision_compactor = VisionSegmentCompactor(self.vision_store, after_prune=self.prune_search_index)
+        
+        # Per-minute / per-hour activity counters, updated on every save
+        self.rollups = MemoryRollups()
+        if not self.rollups.loaded_from_file:
+            self.rollups.seed_in_background({
+                "system": self.system_journal.read_entries,
+                "chat": self.chat_journal.read_entries,
+                "vision": self.vision_store.read_all_entries
+            })
+        self.rollups.start_autosave()
+        
+        # Optional indexed SQLite engine for fast queries over long histories
+        self.sqlite_store = None
+        if MEMORY_STORAGE_ENGINE == "sqlite":
+            self.open_sqlite_store()
         
         # Load existing memory
         self.load_all_memory()
+        self.search_index.build_in_background()
         
+    def open_sqlite_store(self):
+        """Open the SQLite engine and import existing JSON memory once"""
+        try:
+            from sqlite_memory_store import SQLiteMemoryStore
+            self.sqlite_store = SQLiteMemoryStore(SQLITE_MEMORY_FILE)
+            imported = self.sqlite_store.import_json_files()
+            if any(imported.values()):
+                print(f"🗄️ Imported JSON memory into SQLite: {imported}")
+                
+        except Exception as e:
+            print(f"SQLite memory store error: {e}")
+            self.sqlite_store = None
+            
     def load_all_memory(self):
         """Load all memory types from files"""
         self.load_system_memory()
         self.load_chat_memory()
         
     def load_system_memory(self):
-        """Load system memory (debug/technical logs)"""
+        """Load the newest system memory entries (debug/technical logs)"""
         try:
-            if os.path.exists(SYSTEM_MEMORY_FILE):
-                with open(SYSTEM_MEMORY_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.system_memory = data.get('entries', [])
-                    print(f"📂 Loaded {len(self.system_memory)} system memory entries")
-            else:
-                self.system_memory = []
+            # Tail only - startup time does not grow with the history on disk
+            self.system_memory.load(self.system_journal.read_tail(MEMORY_STARTUP_TAIL_ENTRIES))
+            print(f"📂 Loaded newest {len(self.system_memory)} of {self.system_journal.journal_entries} system memory entries")
                 
         except Exception as e:
             print(f"System memory load error: {e}")
-            self.system_memory = []
+            self.system_memory.clear()
             
     def load_chat_memory(self):
-        """Load chat memory (conversations & voice)"""
+        """Load the newest chat memory entries (conversations & voice)"""
         try:
-            if os.path.exists(CHAT_MEMORY_FILE):
-                with open(CHAT_MEMORY_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.chat_memory = data.get('entries', [])
-                    print(f"📂 Loaded {len(self.chat_memory)} chat memory entries")
-            else:
-                self.chat_memory = []
+            self.chat_memory.load(self.chat_journal.read_tail(MEMORY_STARTUP_TAIL_ENTRIES))
+            print(f"📂 Loaded newest {len(self.chat_memory)} of {self.chat_journal.journal_entries} chat memory entries")
                 
         except Exception as e:
             print(f"Chat memory load error: {e}")
-            self.chat_memory = []
+            self.chat_memory.clear()
             
     def save_system_message(self, message_type, sender, content):
-        """Save system/debug messages to system memory"""
+        """Log a system/debug message - level, rate limit and sinks decide where it goes"""
+        try:
+            self.log_pipeline.log(sender, content, level_for(message_type), message_type)
+            
+        except Exception as e:
+            print(f"System log error: {e}")
+            
+    def persist_system_message(self, level, message_type, sender, content):
+        """Log sink: save system/debug messages to system memory"""
         try:
             memory_entry = {
                 "timestamp": datetime.now().isoformat(),
@@ -77,7 +137,10 @@ class MemoryManager:
             }
             
             self.system_memory.append(memory_entry)
-            self.write_system_memory_to_file()
+            self.rollups.record("system", memory_entry)
+            self.writer.submit(self.system_journal, memory_entry)
+            if self.sqlite_store:
+                self.writer.submit(self.sqlite_store.system, memory_entry)
             
         except Exception as e:
             print(f"System memory save error: {e}")
@@ -96,7 +159,11 @@ class MemoryManager:
             }
             
             self.chat_memory.append(chat_entry)
-            self.write_chat_memory_to_file()
+            self.rollups.record("chat", chat_entry)
+            self.writer.submit(self.chat_journal, chat_entry)
+            self.writer.submit(self.search_index.write_target("chat"), chat_entry)  # indexed once on disk
+            if self.sqlite_store:
+                self.writer.submit(self.sqlite_store.chat, chat_entry)
             
         except Exception as e:
             print(f"Chat memory save error: {e}")
@@ -104,54 +171,39 @@ class MemoryManager:
     def save_vision_result(self, filename, interpretation):
         """Save vision analysis result to vision memory"""
         try:
-            # Load existing vision log
-            if os.path.exists(VISION_MEMORY_FILE):
-                with open(VISION_MEMORY_FILE, 'r', encoding='utf-8') as f:
-                    log_data = json.load(f)
-            else:
-                log_data = {"entries": []}
-            
-            # Add new entry
             entry = {
                 "timestamp": datetime.now().isoformat(),
                 "screenshot_filename": filename,
                 "interpreted_text": interpretation
             }
-            log_data["entries"].append(entry)
             
-            # Save back to file
-            with open(VISION_MEMORY_FILE, 'w', encoding='utf-8') as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+            # Constant-time append - no reload/rewrite of the whole log
+            self.vision_store.append(entry)
+            self.search_index.add("vision", entry)
+            self.rollups.record("vision", entry)
+            
+            if self.sqlite_store:
+                self.writer.submit(self.sqlite_store.vision, entry)
                 
         except Exception as e:
             print(f"Vision memory save error: {e}")
             
+    def prune_search_index(self):
+        """Drop vision documents the compactor removed from the store"""
+        self.search_index.prune("vision", self.vision_store.oldest_timestamp())
+            
     def write_system_memory_to_file(self):
-        """Write system memory to JSON file"""
+        """Write system memory JSON snapshot from the journal"""
         try:
-            memory_data = {
-                "total_entries": len(self.system_memory),
-                "last_updated": datetime.now().isoformat(),
-                "entries": self.system_memory[-MAX_SYSTEM_MEMORY_ENTRIES:]  # Keep recent entries
-            }
-            
-            with open(SYSTEM_MEMORY_FILE, 'w', encoding='utf-8') as f:
-                json.dump(memory_data, f, indent=2, ensure_ascii=False)
+            self.system_journal.write_snapshot()
                 
         except Exception as e:
             print(f"System memory file write error: {e}")
             
     def write_chat_memory_to_file(self):
-        """Write chat memory to JSON file"""
+        """Write chat memory JSON snapshot from the journal"""
         try:
-            chat_data = {
-                "total_entries": len(self.chat_memory),
-                "last_updated": datetime.now().isoformat(),
-                "entries": self.chat_memory[-MAX_CHAT_MEMORY_ENTRIES:]  # Keep recent entries
-            }
-            
-            with open(CHAT_MEMORY_FILE, 'w', encoding='utf-8') as f:
-                json.dump(chat_data, f, indent=2, ensure_ascii=False)
+            self.chat_journal.write_snapshot()
                 
         except Exception as e:
             print(f"Chat memory file write error: {e}")
@@ -159,14 +211,12 @@ class MemoryManager:
     def clear_chat_memory(self):
         """Clear chat memory completely"""
         try:
-            self.chat_memory = []
-            empty_chat = {
-                "total_entries": 0, 
-                "last_updated": datetime.now().isoformat(), 
-                "entries": []
-            }
-            with open(CHAT_MEMORY_FILE, 'w', encoding='utf-8') as f:
-                json.dump(empty_chat, f, indent=2, ensure_ascii=False)
+            self.writer.flush()
+            self.chat_memory.clear()
+            self.chat_journal.clear()
+            self.search_index.clear("chat")
+            if self.sqlite_store:
+                self.sqlite_store.chat.clear()
                 
             return True
             
@@ -177,17 +227,20 @@ class MemoryManager:
     def clear_all_memory(self):
         """Clear all memory files - DANGER ZONE!"""
         try:
+            self.writer.flush()
+            
             # Clear chat memory
-            self.chat_memory = []
-            empty_chat = {"total_entries": 0, "last_updated": datetime.now().isoformat(), "entries": []}
-            with open(CHAT_MEMORY_FILE, 'w', encoding='utf-8') as f:
-                json.dump(empty_chat, f, indent=2, ensure_ascii=False)
+            self.chat_memory.clear()
+            self.chat_journal.clear()
+            self.search_index.clear("chat")
             
             # Clear system memory
-            self.system_memory = []
-            empty_system = {"total_entries": 0, "last_updated": datetime.now().isoformat(), "entries": []}
-            with open(SYSTEM_MEMORY_FILE, 'w', encoding='utf-8') as f:
-                json.dump(empty_system, f, indent=2, ensure_ascii=False)
+            self.system_memory.clear()
+            self.system_journal.clear()
+            
+            if self.sqlite_store:
+                self.sqlite_store.chat.clear()
+                self.sqlite_store.system.clear()
             
             return True
             
@@ -195,21 +248,160 @@ class MemoryManager:
             print(f"Memory cleaning error: {e}")
             return False
             
-    def get_vision_memory(self):
-        """Get recent vision memory entries"""
+    def get_vision_memory(self, limit=None):
+        """Get recent vision memory entries (oldest first)"""
         try:
-            if os.path.exists(VISION_MEMORY_FILE):
-                with open(VISION_MEMORY_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get('entries', [])
-            return []
+            if self.sqlite_store:
+                self.writer.flush()
+                if limit:
+                    return self.sqlite_store.vision.latest(limit)
+                return self.sqlite_store.vision.select()
+                
+            if limit:
+                return self.vision_store.read_recent(limit)
+            return self.vision_store.read_all_entries()
             
         except Exception as e:
             print(f"Vision memory read error: {e}")
             return []
             
+    def get_latest_vision_entry(self, screenshot_filename=None):
+        """Get the newest vision entry, optionally for one screenshot file"""
+        try:
+            if self.sqlite_store:
+                self.writer.flush()
+                if screenshot_filename:
+                    entries = self.sqlite_store.vision.by_screenshot(screenshot_filename, limit=1)
+                else:
+                    entries = self.sqlite_store.vision.latest(1)
+                return entries[-1] if entries else None
+                
+            # Shared cache - no JSON parse, picks up writes from other processes
+            cache = self.vision_store.context_cache
+            if screenshot_filename:
+                return cache.get_for_screenshot(screenshot_filename)
+            return cache.get_latest()
+            
+        except Exception as e:
+            print(f"Vision memory lookup error: {e}")
+            return None
+            
+    def query_memory(self, kind, limit=None, start=None, end=None, entry_type=None, sender=None):
+        """Query system/chat/vision memory (indexed when the SQLite engine is on)
+        
+        Filters combine: time range [start, end), entry_type (system type or
+        chat action) and sender. Results are returned oldest first.
+        """
+        try:
+            if self.sqlite_store:
+                self.writer.flush()
+                return self.sqlite_store.table(kind).query(start, end, entry_type, sender, limit)
+                
+            # JSON engine: linear scan over the on-disk entries
+            self.writer.flush()
+            if kind == "vision":
+                entries = self.get_vision_memory()
+            else:
+                entries = self.journal_for(kind).read_entries()
+            if isinstance(start, datetime):
+                start = start.isoformat()
+            if isinstance(end, datetime):
+                end = end.isoformat()
+                
+            results = []
+            for entry in entries:
+                timestamp = entry.get('timestamp', '')
+                if start is not None and timestamp < start:
+                    continue
+                if end is not None and timestamp >= end:
+                    continue
+                if entry_type is not None and entry.get('type', entry.get('action')) != entry_type:
+                    continue
+                if sender is not None and entry.get('sender') != sender:
+                    continue
+                results.append(entry)
+            return results[-limit:] if limit else results
+            
+        except Exception as e:
+            print(f"Memory query error: {e}")
+            return []
+            
+    def journal_for(self, kind):
+        """Journal/store backing a memory kind: 'system', 'chat' or 'vision'"""
+        return {"system": self.system_journal, "chat": self.chat_journal, "vision": self.vision_store}[kind]
+        
+    def get_memory_page(self, kind, page=0, page_size=MEMORY_PAGE_SIZE):
+        """Page older history in from disk on demand (page 0 = newest, oldest first within a page)"""
+        try:
+            self.writer.flush()
+            skip = page * page_size
+            if kind == "vision":
+                return self.vision_store.read_recent(page_size, skip)
+            return self.journal_for(kind).read_tail(page_size, skip)
+            
+        except Exception as e:
+            print(f"Memory page read error: {e}")
+            return []
+            
+    def search(self, query, kinds=None, start=None, end=None, limit=SEARCH_RESULT_LIMIT):
+        """Full-text search over vision interpretations and chat text
+        
+        All words of query must match; results are ranked best first as
+        {"kind", "score", "timestamp", "entry"} dicts. kinds narrows to
+        "vision" and/or "chat"; start/end bound the timestamp [start, end).
+        """
+        try:
+            return self.search_index.search(query, kinds, start, end, limit)
+            
+        except Exception as e:
+            print(f"Memory search error: {e}")
+            return []
+            
+    def get_rollup(self, kind, when, dimension=None, value=None, resolution="minute"):
+        """(count, bytes) for one minute/hour bucket - e.g. ("system", now, "type", "error")"""
+        try:
+            return self.rollups.get(kind, when, dimension, value, resolution)
+            
+        except Exception as e:
+            print(f"Rollup query error: {e}")
+            return (0, 0)
+            
+    def rollup_report(self, resolution="hour", last=24):
+        """Text table of recent activity per minute/hour"""
+        try:
+            return self.rollups.report(resolution, last)
+            
+        except Exception as e:
+            print(f"Rollup report error: {e}")
+            return ""
+            
+    def flush(self):
+        """Write all queued memory entries to disk now"""
+        try:
+            self.writer.flush()
+            
+        except Exception as e:
+            print(f"Memory flush error: {e}")
+            
     def save_all(self):
         """Save all memory systems to files"""
+        self.flush()
         self.write_system_memory_to_file()
         self.write_chat_memory_to_file()
+        self.rollups.save()
         print("💾 All memory systems saved")
+        
+    def shutdown(self):
+        """Flush pending writes and stop the background writer"""
+        try:
+            self.writer.stop()
+            self.vision_compactor.stop()
+            self.rollups.stop()
+            self.write_system_memory_to_file()
+            self.write_chat_memory_to_file()
+            self.vision_store.write_snapshot()
+            if self.sqlite_store:
+                self.sqlite_store.close()
+            
+        except Exception as e:
+            print(f"Memory shutdown error: {e}")
@@ -0,0 +1,143 @@
+"""
+Memory Records - Bounded In-RAM Memory Buffers
+==============================================
+
+Compact replacement for the unbounded system_memory / chat_memory lists:
+- Fixed-capacity ring buffers (collections.deque with maxlen) - RAM stays
+  flat for the whole session, matching what the journals keep on disk
+- __slots__ records instead of one dict per entry
+- Repeated sender/type/action strings are interned and shared
+- Entry length is computed once when the record is created
+- Optionally, consecutive identical system entries collapse into one record
+  with a repeat count and first/last timestamps
+
+Records still answer entry.get(key) so code written against the dict
+entries keeps working; to_dict() gives back the JSON layout.
+"""
+
+import sys
+from collections import deque
+
+
+class SystemMemoryRecord:
+    """One system memory entry (debug/technical log line), possibly a run of repeats"""
+
+    FIELDS = ("timestamp", "type", "sender", "content", "length")
+    __slots__ = FIELDS + ("count", "last_timestamp")
+
+    def __init__(self, timestamp, type, sender, content, length=None, count=1, last_timestamp=None):
+        """Build a record, interning the low-cardinality fields"""
+        self.timestamp = timestamp
+        self.type = sys.intern(type) if isinstance(type, str) else type
+        self.sender = sys.intern(sender) if isinstance(sender, str) else sender
+        self.content = content
+        self.length = len(content) if length is None and content is not None else length
+        self.count = count
+        self.last_timestamp = last_timestamp
+
+    @classmethod
+    def from_entry(cls, entry):
+        """Record from a JSON entry dict"""
+        return cls(entry.get("first_timestamp", entry.get("timestamp")), entry.get("type"),
+                   entry.get("sender"), entry.get("content", ""), entry.get("length"),
+                   entry.get("count", 1), entry.get("last_timestamp"))
+
+    def is_repeat(self, entry):
+        """Same type, sender and content as this record?"""
+        return (self.content == entry.get("content") and self.sender == entry.get("sender")
+                and self.type == entry.get("type"))
+
+    def add_repeat(self, entry):
+        """Fold a consecutive repeat into this record"""
+        self.count += entry.get("count", 1)
+        self.last_timestamp = entry.get("last_timestamp", entry.get("timestamp"))
+
+    def get(self, key, default=None):
+        """dict-style field access"""
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def to_dict(self):
+        """JSON entry layout (runs add count and first/last timestamps)"""
+        entry = {field: getattr(self, field) for field in self.FIELDS}
+        if self.count > 1:
+            entry["count"] = self.count
+            entry["first_timestamp"] = self.timestamp
+            entry["last_timestamp"] = self.last_timestamp
+        return entry
+
+
+class ChatMemoryRecord:
+    """One chat memory entry (user input / sent message)"""
+
+    __slots__ = ("timestamp", "action", "text", "length")
+    FIELDS = __slots__
+
+    def __init__(self, timestamp, action, text, length=None):
+        """Build a record, interning the action name"""
+        self.timestamp = timestamp
+        self.action = sys.intern(action) if isinstance(action, str) else action
+        self.text = text
+        self.length = len(text) if length is None and text is not None else length
+
+    @classmethod
+    def from_entry(cls, entry):
+        """Record from a JSON entry dict"""
+        return cls(entry.get("timestamp"), entry.get("action"), entry.get("text", ""),
+                   entry.get("length"))
+
+    def get(self, key, default=None):
+        """dict-style field access"""
+        value = getattr(self, key, None) if key in self.FIELDS else None
+        return default if value is None else value
+
+    def to_dict(self):
+        """JSON entry layout"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class MemoryRecordBuffer:
+    """Fixed-capacity ring buffer of memory records (oldest dropped first)"""
+
+    def __init__(self, record_class, capacity, collapse_repeats=False):
+        """Create an empty buffer holding at most capacity records"""
+        self.record_class = record_class
+        self.capacity = capacity
+        self.collapse_repeats = collapse_repeats
+        self.records = deque(maxlen=capacity)
+
+    def append(self, entry):
+        """Add a JSON entry dict as the newest record (or extend the current run)"""
+        if self.collapse_repeats and self.records and self.records[-1].is_repeat(entry):
+            self.records[-1].add_repeat(entry)
+            return
+        self.records.append(self.record_class.from_entry(entry))
+
+    def load(self, entries):
+        """Replace the contents with the newest entries of a list"""
+        self.records.clear()
+        for entry in entries[-self.capacity:]:
+            self.append(entry)
+
+    def clear(self):
+        """Drop all records"""
+        self.records.clear()
+
+    def latest(self, count):
+        """Newest N records, oldest first"""
+        if count >= len(self.records):
+            return list(self.records)
+        return list(self.records)[-count:]
+
+    def to_dicts(self):
+        """All records as JSON entry dicts, oldest first"""
+        return [record.to_dict() for record in self.records]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
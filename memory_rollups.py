@@ -0,0 +1,283 @@
+"""
+Memory Rollups - Per-Minute / Per-Hour Activity Aggregates
+==========================================================
+
+Incrementally maintained counters for charting a session without
+re-reading the memory files:
+- Every saved entry bumps (count, bytes) for its memory kind and for each of
+  its dimensions - system type/sender, chat action - in its minute and
+  hour bucket
+- Lookups are two dict hits, so any single (bucket, kind, dimension) query
+  is constant time
+- Old buckets are pruned as new ones open (ROLLUP_*_RETENTION_*)
+- Persisted to MEMORY_ROLLUPS_FILE (msgpack when installed, every
+  ROLLUP_SAVE_INTERVAL seconds and on shutdown); seeded once from the stored
+  entries on a background thread when that file does not exist yet
+
+Run directly for a report:  python memory_rollups.py [--minutes] [--last N]
+"""
+
+import argparse
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from memory_serializer import binary_serializer, load_document
+from config import (
+    MEMORY_ROLLUPS_FILE, ROLLUP_MINUTE_RETENTION_HOURS, ROLLUP_HOUR_RETENTION_DAYS,
+    ROLLUP_SAVE_INTERVAL
+)
+
+
+# Bucket key = ISO timestamp prefix ("2026-10-17T09:05" / "2026-10-17T09")
+RESOLUTIONS = {
+    "minute": (16, "%Y-%m-%dT%H:%M", timedelta(hours=ROLLUP_MINUTE_RETENTION_HOURS)),
+    "hour": (13, "%Y-%m-%dT%H", timedelta(days=ROLLUP_HOUR_RETENTION_DAYS)),
+}
+
+# Entry fields each memory kind is broken down by
+ROLLUP_DIMENSIONS = {
+    "system": ("type", "sender"),
+    "chat": ("action",),
+    "vision": (),
+}
+
+# Chat actions shown in the report - speech_system.py writes "speech_input",
+# ollama_interface_fixed.py "input"; both apps write "send"
+REPORT_CHAT_ACTIONS = (
+    ("speech_input", "🎤 speech"),
+    ("input", "⌨️ input"),
+    ("send", "📤 sent"),
+)
+
+# Text field whose UTF-8 size is summed as "bytes"
+ROLLUP_BYTE_FIELDS = {
+    "system": "content",
+    "chat": "text",
+    "vision": "interpreted_text",
+}
+
+
+def rollup_key(kind, dimension=None, value=None):
+    """Counter key: "vision", "system:type=error", "chat:action=send", ..."""
+    return kind if dimension is None else f"{kind}:{dimension}={value}"
+
+
+def bucket_for(timestamp, resolution="minute"):
+    """Bucket key of a datetime or ISO timestamp"""
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat()
+    return timestamp[:RESOLUTIONS[resolution][0]]
+
+
+class MemoryRollups:
+    """Per-minute and per-hour (count, bytes) tables over saved memory entries"""
+
+    def __init__(self, path=MEMORY_ROLLUPS_FILE):
+        """Load the persisted tables (empty if the file does not exist)"""
+        self.path = path
+        self.lock = threading.Lock()
+        self.tables = {resolution: {} for resolution in RESOLUTIONS}  # bucket -> {key: [count, bytes]}
+        self.dirty = False
+        self.created = datetime.now().isoformat()  # entries from here on are recorded live
+        self.newest = {resolution: "" for resolution in RESOLUTIONS}  # newest bucket seen (prune reference)
+        self.loaded_from_file = self.load()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.seed_thread = None
+
+    def start_autosave(self, interval=ROLLUP_SAVE_INTERVAL):
+        """Save the tables every interval seconds on a daemon thread"""
+        self.thread = threading.Thread(target=self.autosave_loop, args=(interval,),
+                                       name="RollupAutosave", daemon=True)
+        self.thread.start()
+
+    def autosave_loop(self, interval):
+        """Save until stopped"""
+        while not self.stop_event.wait(interval):
+            self.save()
+
+    def stop(self):
+        """Stop autosaving and write the final tables"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=5.0)
+        self.save()
+
+    def load(self):
+        """Read the rollup file; returns False if there was nothing to load"""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'rb') as f:
+                data = load_document(f.read())
+            for resolution in RESOLUTIONS:
+                buckets = data.get(resolution, {})
+                self.tables[resolution] = {bucket: buckets[bucket] for bucket in sorted(buckets)}
+                self.newest[resolution] = max(buckets, default="")
+            return True
+
+        except Exception as e:
+            print(f"Rollup load error: {e}")
+            return False
+
+    def save(self):
+        """Write the tables if anything changed since the last save"""
+        if self.seed_thread and self.seed_thread.is_alive():
+            # Partial tables would count as seeded on the next start
+            return
+        with self.lock:
+            if not self.dirty:
+                return
+            data = binary_serializer.dumps(self.tables)
+            self.dirty = False
+        try:
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+
+        except Exception as e:
+            print(f"Rollup save error: {e}")
+
+    def seed(self, sources, before=None):
+        """Build the tables from stored entries - sources: {kind: callable returning entries}
+
+        Entries stamped at or after before are skipped (they are recorded live).
+        """
+        for kind, read_entries in sources.items():
+            try:
+                for entry in read_entries():
+                    if before is None or entry.get('timestamp', '') < before:
+                        self.record(kind, entry)
+            except Exception as e:
+                print(f"Rollup seed error ({kind}): {e}")
+
+    def seed_in_background(self, sources):
+        """Seed on a daemon thread so startup does not wait for the whole history"""
+        self.seed_thread = threading.Thread(target=self.seed, args=(sources, self.created),
+                                            name="RollupSeed", daemon=True)
+        self.seed_thread.start()
+
+    def record(self, kind, entry):
+        """Count one saved entry (a collapsed run counts as its repeat count)"""
+        timestamp = entry.get('timestamp')
+        if not timestamp:
+            return
+        count = entry.get('count', 1)
+        size = len((entry.get(ROLLUP_BYTE_FIELDS[kind]) or '').encode('utf-8')) * count
+        keys = [rollup_key(kind)] + [rollup_key(kind, dimension, entry.get(dimension))
+                                     for dimension in ROLLUP_DIMENSIONS[kind]]
+
+        with self.lock:
+            for resolution, table in self.tables.items():
+                bucket = timestamp[:RESOLUTIONS[resolution][0]]
+                counters = table.get(bucket)
+                if counters is None:
+                    counters = table[bucket] = {}
+                    if bucket > self.newest[resolution]:
+                        self.newest[resolution] = bucket
+                    self.prune(resolution)
+                for key in keys:
+                    totals = counters.get(key)
+                    if totals is None:
+                        counters[key] = [count, size]
+                    else:
+                        totals[0] += count
+                        totals[1] += size
+            self.dirty = True
+
+    def prune(self, resolution):
+        """Drop buckets that fell out of the retention window behind the newest bucket
+
+        Buckets are not inserted in time order (seeding goes kind by kind), so
+        every key is compared against the cutoff.
+        """
+        bucket_format, retention = RESOLUTIONS[resolution][1:]
+        try:
+            cutoff = (datetime.strptime(self.newest[resolution], bucket_format) - retention).strftime(bucket_format)
+        except ValueError:
+            return
+        table = self.tables[resolution]
+        for bucket in [bucket for bucket in table if bucket < cutoff]:
+            del table[bucket]
+
+    def get(self, kind, bucket, dimension=None, value=None, resolution="minute"):
+        """(count, bytes) for one kind (optionally one dimension value) in one bucket"""
+        if not isinstance(bucket, str):
+            bucket = bucket_for(bucket, resolution)
+        totals = self.tables[resolution].get(bucket, {}).get(rollup_key(kind, dimension, value))
+        return tuple(totals) if totals else (0, 0)
+
+    def series(self, kind, dimension=None, value=None, resolution="minute", start=None, end=None):
+        """[(bucket, count, bytes)] for every bucket in [start, end), oldest first"""
+        if start is not None:
+            start = bucket_for(start, resolution)
+        if end is not None:
+            end = bucket_for(end, resolution)
+        key = rollup_key(kind, dimension, value)
+        with self.lock:
+            buckets = sorted(self.tables[resolution].items())
+        results = []
+        for bucket, counters in buckets:
+            if start is not None and bucket < start:
+                continue
+            if end is not None and bucket >= end:
+                continue
+            count, size = counters.get(key, (0, 0))
+            results.append((bucket, count, size))
+        return results
+
+    def breakdown(self, bucket, resolution="minute"):
+        """Every counter of one bucket: {key: (count, bytes)}"""
+        if not isinstance(bucket, str):
+            bucket = bucket_for(bucket, resolution)
+        with self.lock:
+            counters = self.tables[resolution].get(bucket, {})
+            return {key: tuple(totals) for key, totals in counters.items()}
+
+    def report(self, resolution="hour", last=24):
+        """Text table of the newest buckets: screenshots, chat actions, errors, bytes"""
+        with self.lock:
+            buckets = sorted(self.tables[resolution])[-last:]
+        width = 16 if resolution == "minute" else 13
+        lines = [
+            f"📊 Memory activity per {resolution} (last {len(buckets)})",
+            f"{'bucket':<{width}} {'📸 vision':>10} "
+            + "".join(f"{label:>10} " for _, label in REPORT_CHAT_ACTIONS)
+            + f"{'❌ errors':>9} {'📝 system':>10} {'KB':>9}",
+        ]
+        for bucket in buckets:
+            size = sum(self.get(kind, bucket, resolution=resolution)[1] for kind in ROLLUP_DIMENSIONS)
+            lines.append(
+                f"{bucket:<{width}} "
+                f"{self.get('vision', bucket, resolution=resolution)[0]:>10} "
+                + "".join(f"{self.get('chat', bucket, 'action', action, resolution)[0]:>10} "
+                          for action, _ in REPORT_CHAT_ACTIONS)
+                + f"{self.get('system', bucket, 'type', 'error', resolution)[0]:>9} "
+                f"{self.get('system', bucket, resolution=resolution)[0]:>10} "
+                f"{size / 1024:>9.1f}"
+            )
+        if not buckets:
+            lines.append("(no activity recorded yet)")
+        return "\n".join(lines)
+
+
+def main():
+    """Print the rollup report from the saved rollup file"""
+    parser = argparse.ArgumentParser(description="Memory activity rollup report")
+    parser.add_argument("--minutes", action="store_true", help="per-minute buckets instead of per-hour")
+    parser.add_argument("--last", type=int, default=24, help="number of newest buckets to show")
+    parser.add_argument("--file", default=MEMORY_ROLLUPS_FILE, help="rollup file to read")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"❌ File not found: {args.file} (it is written when the app saves memory)")
+        return 1
+    rollups = MemoryRollups(args.file)
+    print(rollups.report("minute" if args.minutes else "hour", args.last))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
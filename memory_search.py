@@ -0,0 +1,330 @@
+"""
+Memory Search - Full-Text Index over Vision and Chat Memory
+===========================================================
+
+Inverted index for "when did this app / error / phrase show up?":
+- Tokens from vision interpreted_text and chat text map to compact
+  posting arrays (doc ids + term counts)
+- Built once from the stored entries (on a background thread at startup or
+  on the first search), then kept up to date incrementally as entries are
+  written - chat entries are indexed by the MemoryWriter after their journal
+  line (write_target), so a build never misses an entry still in the queue
+- Bounded like the stores it mirrors: per-kind limits drop the oldest
+  documents, prune() follows store retention, clear() drops a kind. Dropped
+  documents are released at once; their postings are compacted away once
+  they make up SEARCH_COMPACT_FRACTION of the index
+- Results are ranked with BM25 (all query words must match) and can be
+  filtered by memory kind and time range [start, end)
+
+A query only touches the postings of its own words, so searches stay in the
+millisecond range over tens of thousands of entries.
+"""
+
+import math
+import re
+import threading
+from collections import Counter, deque
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from config import SEARCH_RESULT_LIMIT, SEARCH_COMPACT_FRACTION
+
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Text field that gets indexed for each memory kind
+SEARCH_TEXT_FIELDS = {
+    "vision": "interpreted_text",
+    "chat": "text",
+}
+
+
+def tokenize(text):
+    """Lowercase word tokens of a text"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class IndexWriteTarget:
+    """MemoryWriter target that indexes one kind's entries after they are written"""
+
+    def __init__(self, index, kind):
+        """index: the MemorySearchIndex to feed"""
+        self.index = index
+        self.kind = kind
+
+    def append_many(self, entries):
+        """Index entries the writer just persisted"""
+        for entry in entries:
+            self.index.add(self.kind, entry)
+
+
+class MemorySearchIndex:
+    """Incrementally maintained BM25 index over memory entries"""
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, sources, limits=None):
+        """sources: {kind: callable returning that kind's stored entries (oldest first)}
+        limits: {kind: max documents kept} for kinds whose store keeps only the newest entries
+        """
+        self.sources = sources
+        self.limits = limits or {}
+        self.write_targets = {}
+        self.lock = threading.RLock()
+        self.loaded = False
+        self.building = False
+        self.built = threading.Event()
+        self.pending = []  # entries saved while a build is running
+        self.reset()
+
+    def reset(self):
+        """Drop all indexed documents"""
+        self.documents = []  # doc id -> (kind, entry), None once dropped
+        self.doc_lengths = array('I')
+        self.total_length = 0  # tokens in live documents
+        self.postings = {}  # token -> (array of doc ids, array of term counts)
+        self.kind_docs = {}  # kind -> deque of live doc ids, oldest first
+        self.removed = 0  # dropped documents still referenced by postings
+
+    def build(self):
+        """(Re)build the index from every source without blocking new saves"""
+        with self.lock:
+            already_building = self.building
+            self.building = True
+            if not already_building:
+                self.built.clear()
+                self.pending = []
+        if already_building:
+            # Another thread is on it - just wait for its result
+            self.built.wait()
+            return
+
+        try:
+            # Tokenize into a fresh index outside the lock - saves only queue up meanwhile
+            fresh = MemorySearchIndex({}, self.limits)
+            for kind, read_entries in self.sources.items():
+                try:
+                    for entry in read_entries():
+                        fresh.index_entry(kind, entry)
+                except Exception as e:
+                    print(f"Search index build error ({kind}): {e}")
+
+            with self.lock:
+                # Replay saves that raced with the build, skipping ones it already read
+                if self.pending:
+                    oldest = min(entry.get('timestamp', '') for _, entry in self.pending)
+                    recent = [item for item in fresh.documents
+                              if item is not None and item[1].get('timestamp', '') >= oldest]
+                    for item in self.pending:
+                        if item not in recent:
+                            fresh.index_entry(*item)
+
+                fresh.compact_if_needed()
+                self.swap(fresh)
+                self.pending = []
+                self.loaded = True
+        finally:
+            with self.lock:
+                self.building = False
+            self.built.set()
+
+    def build_in_background(self):
+        """Warm the index on a daemon thread so the first search is instant"""
+        thread = threading.Thread(target=self.build, name="MemorySearchIndexer", daemon=True)
+        thread.start()
+        return thread
+
+    def ensure_loaded(self):
+        """Build on first use (or wait for a background build to finish)"""
+        if self.loaded:
+            return
+        if self.building:
+            self.built.wait()
+        else:
+            self.build()
+
+    def swap(self, fresh):
+        """Take over another index's documents and postings (caller holds the lock)"""
+        self.documents = fresh.documents
+        self.doc_lengths = fresh.doc_lengths
+        self.total_length = fresh.total_length
+        self.postings = fresh.postings
+        self.kind_docs = fresh.kind_docs
+        self.removed = fresh.removed
+
+    def index_entry(self, kind, entry):
+        """Add one entry's text to the postings"""
+        tokens = tokenize(entry.get(SEARCH_TEXT_FIELDS[kind], ''))
+        if not tokens:
+            return
+
+        doc_id = len(self.documents)
+        self.documents.append((kind, entry))
+        self.doc_lengths.append(len(tokens))
+        self.total_length += len(tokens)
+        self.kind_docs.setdefault(kind, deque()).append(doc_id)
+
+        postings = self.postings
+        for token, count in Counter(tokens).items():
+            posting = postings.get(token)
+            if posting is None:
+                posting = postings[token] = (array('I'), array('I'))
+            posting[0].append(doc_id)
+            posting[1].append(count)
+
+        # Mirror the store's retention - it only keeps the newest entries
+        limit = self.limits.get(kind)
+        if limit:
+            live = self.kind_docs[kind]
+            while len(live) > limit:
+                self.drop(live.popleft())
+
+    def drop(self, doc_id):
+        """Release one document; its postings stay until compact() (caller holds the lock)"""
+        self.documents[doc_id] = None
+        self.total_length -= self.doc_lengths[doc_id]
+        self.removed += 1
+
+    def compact(self):
+        """Re-index the live documents so dropped ones leave the postings (caller holds the lock)"""
+        fresh = MemorySearchIndex({}, self.limits)
+        for item in self.documents:
+            if item is not None:
+                fresh.index_entry(*item)
+        self.swap(fresh)
+
+    def compact_if_needed(self):
+        """Compact once dropped documents are a large share of the index (caller holds the lock)"""
+        if self.removed and self.removed >= SEARCH_COMPACT_FRACTION * len(self.documents):
+            self.compact()
+
+    def write_target(self, kind):
+        """MemoryWriter target for kind - submit it after the journal so entries are indexed once on disk"""
+        with self.lock:
+            if kind not in self.write_targets:
+                self.write_targets[kind] = IndexWriteTarget(self, kind)
+            return self.write_targets[kind]
+
+    def add(self, kind, entry):
+        """Index a newly saved entry"""
+        try:
+            with self.lock:
+                if self.building:
+                    self.pending.append((kind, entry))
+                    return
+                if not self.loaded:
+                    # The first build reads it from the store anyway
+                    return
+                self.index_entry(kind, entry)
+                self.compact_if_needed()
+
+        except Exception as e:
+            print(f"Search index add error: {e}")
+
+    def clear(self, kind=None):
+        """Forget one memory kind (or everything) after its store was cleared"""
+        if self.building:
+            self.built.wait()
+        with self.lock:
+            if kind is None:
+                self.reset()
+                return
+            for doc_id in self.kind_docs.pop(kind, ()):
+                self.drop(doc_id)
+            self.compact()
+
+    def prune(self, kind, oldest_timestamp):
+        """Drop kind's documents older than the store's oldest retained entry"""
+        if not oldest_timestamp:
+            return
+        if self.building:
+            self.built.wait()
+        with self.lock:
+            live = self.kind_docs.get(kind)
+            while live and self.documents[live[0]][1].get('timestamp', '') < oldest_timestamp:
+                self.drop(live.popleft())
+            self.compact_if_needed()
+
+    def search(self, query, kinds=None, start=None, end=None, limit=SEARCH_RESULT_LIMIT):
+        """Ranked matches for all words of query, best first
+
+        Returns a list of {"kind", "score", "timestamp", "entry"} dicts.
+        kinds limits the memory kinds searched; start/end (datetime or ISO
+        string) limit results to start <= timestamp < end.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        if isinstance(start, datetime):
+            start = start.isoformat()
+        if isinstance(end, datetime):
+            end = end.isoformat()
+
+        self.ensure_loaded()
+        with self.lock:
+            postings = [self.postings.get(term) for term in terms]
+            if not all(postings) or not self.document_count:
+                return []
+
+            # Intersect starting from the rarest word - keeps the candidate set small
+            order = sorted(range(len(terms)), key=lambda i: len(postings[i][0]))
+            candidates = None
+            for i in order:
+                doc_ids = postings[i][0]
+                candidates = set(doc_ids) if candidates is None else candidates.intersection(doc_ids)
+                if not candidates:
+                    return []
+
+            # Kind / time filters only run on the matching documents
+            matches = []
+            for doc_id in candidates:
+                if self.documents[doc_id] is None:
+                    continue
+                kind, entry = self.documents[doc_id]
+                if kinds is not None and kind not in kinds:
+                    continue
+                timestamp = entry.get('timestamp', '')
+                if start is not None and timestamp < start:
+                    continue
+                if end is not None and timestamp >= end:
+                    continue
+                matches.append(doc_id)
+            if not matches:
+                return []
+
+            # BM25 scoring - statistics over live documents only
+            documents = self.documents
+            document_count = self.document_count
+            average_length = self.total_length / document_count
+            scores = dict.fromkeys(matches, 0.0)
+            for doc_ids, counts in postings:
+                frequency = len(doc_ids) if not self.removed else \
+                    sum(1 for doc_id in doc_ids if documents[doc_id] is not None)
+                idf = math.log(1 + (document_count - frequency + 0.5) / (frequency + 0.5))
+                for doc_id in matches:
+                    # Posting arrays are sorted by doc id - binary search the term count
+                    count = counts[bisect_left(doc_ids, doc_id)]
+                    norm = self.K1 * (1 - self.B + self.B * self.doc_lengths[doc_id] / average_length)
+                    scores[doc_id] += idf * count * (self.K1 + 1) / (count + norm)
+
+            # Best score first, newest first on ties
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+            if limit:
+                ranked = ranked[:limit]
+
+            results = []
+            for doc_id, score in ranked:
+                kind, entry = self.documents[doc_id]
+                results.append({
+                    "kind": kind,
+                    "score": round(score, 3),
+                    "timestamp": entry.get('timestamp', ''),
+                    "entry": entry,
+                })
+            return results
+
+    @property
+    def document_count(self):
+        """Number of indexed (live) entries"""
+        return len(self.documents) - self.removed
@@ -0,0 +1,130 @@
+"""
+Memory Serializer - Pluggable Encoding for Memory Files
+=======================================================
+
+One place that turns memory entries into bytes and back:
+- "json"    - stdlib json, always available
+- "orjson"  - the same JSON text, several times faster (pip install orjson)
+- "msgpack" - compact binary (pip install msgpack); only for app-private
+              state files, since external tools expect JSON
+
+MEMORY_SERIALIZER picks the codec for JSON files (journals, snapshots,
+safety net); "auto" uses orjson when it is installed. MEMORY_BINARY_SERIALIZER
+picks the codec for app-private state (rollups); "auto" prefers msgpack.
+load_document() detects the format, so switching codecs never strands an
+existing file.
+
+Compare the codecs on your own memory files:  python benchmark_serializer.py
+"""
+
+import json
+from config import MEMORY_SERIALIZER, MEMORY_BINARY_SERIALIZER
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+
+class JsonSerializer:
+    """stdlib json - UTF-8 text, non-ASCII kept as is"""
+
+    name = "json"
+    binary = False
+
+    def dumps(self, obj):
+        """Compact encoding (one journal line, no newline)"""
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def dumps_pretty(self, obj):
+        """Indented encoding for snapshot files people open"""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data):
+        """Decode bytes or str"""
+        return json.loads(data)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """orjson - same JSON text as stdlib json, encoded/decoded in C"""
+
+    name = "orjson"
+
+    def dumps(self, obj):
+        """Compact encoding (one journal line, no newline)"""
+        return orjson.dumps(obj)
+
+    def dumps_pretty(self, obj):
+        """Indented encoding for snapshot files people open"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def loads(self, data):
+        """Decode bytes or str"""
+        return orjson.loads(data)
+
+
+class MsgpackSerializer:
+    """msgpack - binary, smallest output; not readable by JSON tools"""
+
+    name = "msgpack"
+    binary = True
+
+    def dumps(self, obj):
+        """Binary encoding"""
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def dumps_pretty(self, obj):
+        """Binary has no pretty form"""
+        return self.dumps(obj)
+
+    def loads(self, data):
+        """Decode msgpack bytes"""
+        return msgpack.unpackb(data, raw=False)
+
+
+SERIALIZERS = {"json": JsonSerializer()}
+if ORJSON_AVAILABLE:
+    SERIALIZERS["orjson"] = OrjsonSerializer()
+if MSGPACK_AVAILABLE:
+    SERIALIZERS["msgpack"] = MsgpackSerializer()
+
+
+def get_serializer(name=MEMORY_SERIALIZER, binary=False):
+    """Serializer by name ("auto" = fastest installed); falls back to JSON codecs
+
+    binary=False only returns JSON text codecs, for files other tools read.
+    """
+    preference = (["msgpack"] if binary else []) + ["orjson", "json"]
+    if name != "auto":
+        if name in SERIALIZERS and (binary or not SERIALIZERS[name].binary):
+            return SERIALIZERS[name]
+        print(f"⚠️ Serializer '{name}' not available here - using the fastest installed JSON codec")
+        preference = ["orjson", "json"]
+    for candidate in preference:
+        if candidate in SERIALIZERS:
+            return SERIALIZERS[candidate]
+    return SERIALIZERS["json"]
+
+
+# Shared instances used by the memory modules
+serializer = get_serializer(MEMORY_SERIALIZER)
+binary_serializer = get_serializer(MEMORY_BINARY_SERIALIZER, binary=True)
+
+
+def load_document(data):
+    """Decode a whole file written by any of the serializers (format auto-detected)"""
+    start = data.lstrip()[:1]
+    if start in (b'{', b'[', b'"') or not start:
+        return serializer.loads(data)
+    if not MSGPACK_AVAILABLE:
+        raise ValueError("file is msgpack-encoded but msgpack is not installed")
+    return SERIALIZERS["msgpack"].loads(data)
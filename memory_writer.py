@@ -0,0 +1,109 @@
+"""
+Memory Writer - Background Batched Persistence
+==============================================
+
+Moves memory file writes off the calling thread (Tk main loop, rotation
+thread, speech callbacks):
+- Entries are queued and written by one dedicated writer thread
+- Batches flush on a time interval or when the batch size is reached
+- flush()/stop() guarantee everything queued so far reaches disk
+
+Any object with an append_many(entries) method (e.g. MemoryJournal) can be
+used as a write target.
+"""
+
+import queue
+import threading
+import time
+from config import MEMORY_FLUSH_INTERVAL, MEMORY_FLUSH_BATCH_SIZE
+
+
+class MemoryWriter:
+    """Dedicated writer thread that persists memory entries in batches"""
+
+    STOP = object()
+
+    def __init__(self, flush_interval=MEMORY_FLUSH_INTERVAL, batch_size=MEMORY_FLUSH_BATCH_SIZE):
+        """Start the background writer thread"""
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.running = True
+
+        self.thread = threading.Thread(target=self.writer_loop, name="MemoryWriter", daemon=True)
+        self.thread.start()
+
+    def submit(self, target, entry):
+        """Queue an entry for the given write target"""
+        if not self.running:
+            # Writer already stopped (late shutdown logging) - write directly
+            target.append_many([entry])
+            return
+        self.queue.put((target, entry))
+
+    def flush(self, timeout=5.0):
+        """Block until everything queued so far has been written"""
+        if not self.running or not self.thread.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put((None, done))
+        done.wait(timeout)
+
+    def stop(self, timeout=5.0):
+        """Flush pending entries and stop the writer thread"""
+        if not self.running:
+            return
+        self.flush(timeout)
+        self.running = False
+        self.queue.put(self.STOP)
+        self.thread.join(timeout)
+
+    def writer_loop(self):
+        """Collect queued entries and write them in batches"""
+        pending = []
+        deadline = 0.0
+
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                # Flush interval elapsed
+                self.write_batch(pending)
+                pending = []
+                continue
+
+            if item is self.STOP:
+                self.write_batch(pending)
+                return
+
+            target, payload = item
+            if target is None:
+                # Explicit flush request
+                self.write_batch(pending)
+                pending = []
+                payload.set()
+                continue
+
+            if not pending:
+                deadline = time.monotonic() + self.flush_interval
+            pending.append(item)
+
+            if len(pending) >= self.batch_size:
+                self.write_batch(pending)
+                pending = []
+
+    def write_batch(self, pending):
+        """Write pending entries grouped by target, preserving order"""
+        if not pending:
+            return
+
+        batches = {}
+        for target, entry in pending:
+            batches.setdefault(id(target), (target, []))[1].append(entry)
+
+        for target, entries in batches.values():
+            try:
+                target.append_many(entries)
+            except Exception as e:
+                print(f"Memory writer flush error: {e}")
@@ -3,14 +3,11 @@ from tkinter import ttk, filedialog
 import requests
 import json
 import threading
-import base64
 import time
 import os
 import sys
 import subprocess
 from datetime import datetime
-from PIL import Image
-import mss
 import pygetwindow as gw
 import pyautogui
 import win32gui
@@ -18,14 +15,36 @@ import win32con
 import win32api  # Fixed: moved from inside method to prevent crashes
 import pyperclip
 from visual_log_window import VisualLogWindow
+from memory_journal import MemoryJournal
+from memory_writer import MemoryWriter
+from memory_search import MemorySearchIndex
+from memory_rollups import MemoryRollups
+from memory_records import MemoryRecordBuffer, SystemMemoryRecord, ChatMemoryRecord
+from vision_store import VisionMemoryStore, VisionSegmentCompactor
+from log_pipeline import LogPipeline, DEBUG, console_sink
+from file_watcher import get_file_watcher
+from memory_serializer import serializer
+from frame_change import FrameChangeDetector, compose_regions
+from interpretation_cache import InterpretationCache, fingerprint
+from analysis_queue import AnalysisQueue
+from rotation_scheduler import AdaptiveScheduler
+from frame_scaler import FrameScaler
+from vision_frame import VisionFrame, FrameSaver
+from image_encoder import get_encoder, IMAGE_EXTENSIONS
+from capture_engine import get_capture_engine
+from config import (
+    MAX_SYSTEM_MEMORY_ENTRIES, MAX_CHAT_MEMORY_ENTRIES, SYSTEM_MEMORY_COLLAPSE_REPEATS, MEMORY_STARTUP_TAIL_ENTRIES,
+    MEMORY_ROLLUPS_FILE
+)
 
 # Import speech system (with error handling to prevent crashes)
 try:
-    from flexible_whisper import FlexibleWhisper
+    from flexible_whisper import FlexibleWhisper, ACTIVE_MODEL_FILE
     SPEECH_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️ Speech system not available: {e}")
     FlexibleWhisper = None
+    ACTIVE_MODEL_FILE = None
     SPEECH_AVAILABLE = False
 
 class OllamaInterface:
@@ -53,11 +72,22 @@ class OllamaInterface:
         self.rotation_interval = 5  # Default 5 seconds
         self.max_screenshots = 3
         self.screenshot_counter = 0  # Will cycle through 1, 2, 3
+        # Fixed worker pool with drop-oldest backpressure - a slow model never piles up threads
+        self.analysis_queue = AnalysisQueue(self.process_screenshot)
+        # "Auto" interval - follows screen activity and model latency within user bounds
+        self.rotation_scheduler = AdaptiveScheduler(workers=len(self.analysis_queue.threads))
+        self.adaptive_rotation = False
+        # Frames reach the model from memory; screen_00N.png copies are written in the background
+        self.frame_saver = FrameSaver(after_save=self.cleanup_old_screenshots)
+        self.latest_frame = None
+        self.frame_detector = FrameChangeDetector()  # Unchanged screens are never sent to the model
+        self.interpretation_cache = InterpretationCache()  # Screens seen before reuse their interpretation
         
         # Multi-screen support
         self.screen_selection = tk.StringVar(value="All Screens")
         self.available_screens = []
         self.selected_screen_index = None  # None = all screens, 0 = primary, 1 = secondary, etc.
+        self.capture_engine = get_capture_engine()  # Shared by rotation, Vision Image sends, etc.
         
         # Window targeting system
         self.target_windows = []
@@ -71,8 +101,9 @@ class OllamaInterface:
         self.vision_mode = tk.StringVar(value="Vision Text")  # Default to working system
         
         # Screenshot resolution control
-        self.screenshot_resolution = tk.StringVar(value="Original (4K)")  # Default to original resolution
-        self.available_resolutions = ["Original (4K)", "Reduced (1080p)"]
+        self.screenshot_resolution = tk.StringVar(value="Model Input")  # Downscale to what the model uses
+        self.available_resolutions = ["Model Input", "Reduced (1080p)", "Original (4K)"]
+        self.frame_scaler = FrameScaler()
         
         # Message system
         self.message_queue = []
@@ -167,12 +198,50 @@ class OllamaInterface:
         
         # MEMORY SYSTEM - UNIFIED ARCHITECTURE!
         self.system_memory_file = os.path.join(os.path.dirname(__file__), "system_memory.json")
-        self.system_memory = []  # List of all system messages and debug info
+        self.system_memory = MemoryRecordBuffer(SystemMemoryRecord, MAX_SYSTEM_MEMORY_ENTRIES,
+                                                collapse_repeats=SYSTEM_MEMORY_COLLAPSE_REPEATS)  # Newest system messages and debug info
         self.chat_memory_file = os.path.join(os.path.dirname(__file__), "chat_memory.json") 
-        self.chat_memory = []  # List of all user conversations and input text
+        self.chat_memory = MemoryRecordBuffer(ChatMemoryRecord, MAX_CHAT_MEMORY_ENTRIES)  # Newest user conversations and input text
         
-        # Visual memory system
+        # Append-only journals - one line per entry instead of full rewrites
+        self.system_journal = MemoryJournal(self.system_memory_file, max_entries=MAX_SYSTEM_MEMORY_ENTRIES,
+                                            collapse_repeats=SYSTEM_MEMORY_COLLAPSE_REPEATS)
+        self.chat_journal = MemoryJournal(self.chat_memory_file, max_entries=MAX_CHAT_MEMORY_ENTRIES)
+        
+        # Background batched writer - the Tk loop never blocks on memory file I/O
+        self.memory_writer = MemoryWriter()
+        
+        # Per-minute / per-hour activity counters (python memory_rollups.py), updated on every save
+        self.rollups = MemoryRollups(os.path.join(os.path.dirname(__file__), MEMORY_ROLLUPS_FILE))
+        
+        # Leveled log pipeline - add_chat_message routes through it (levels/sinks/rate limits in config.py)
+        self.log_pipeline = LogPipeline()
+        self.log_pipeline.register_sink("widget", self.insert_chat_line)
+        self.log_pipeline.register_sink("memory", self.save_log_to_memory)
+        self.log_pipeline.register_sink("console", console_sink)
+        
+        # Visual memory system - incremental append-only store
         self.vision_memory_file = os.path.join(os.path.dirname(__file__), "vision_memory.json")
+        self.vision_store = VisionMemoryStore(self.vision_memory_file)
+        self.vision_cache = self.vision_store.context_cache  # Shared latest-context cache
+        
+        # Full-text search over vision interpretations and chat text (kept up to date on save)
+        self.search_index = MemorySearchIndex({
+            "vision": self.vision_store.read_all_entries,
+            "chat": self.chat_journal.read_entries
+        }, limits={"chat": MAX_CHAT_MEMORY_ENTRIES})
+        
+        # Retention in background - the index drops what the store pruned
+        self.vision_compactor = VisionSegmentCompactor(self.vision_store, after_prune=self.prune_search_index)
+        
+        # Seed the activity counters once from the stored history (background thread)
+        if not self.rollups.loaded_from_file:
+            self.rollups.seed_in_background({
+                "system": self.system_journal.read_entries,
+                "chat": self.chat_journal.read_entries,
+                "vision": self.vision_store.read_all_entries
+            })
+        self.rollups.start_autosave()
         
         # Ensure screenshots directory exists
         os.makedirs(self.screenshots_dir, exist_ok=True)
@@ -187,6 +256,7 @@ class OllamaInterface:
         # Load unified memory systems
         self.load_system_memory()
         self.load_chat_memory()
+        self.search_index.build_in_background()  # Warm after chat memory is loaded
         
         # Add initial instructions
         self.add_initial_instructions()
@@ -197,7 +267,7 @@ class OllamaInterface:
         # Initialize speech system status - UPDATE THE INDICATOR!
         self.root.after(200, self.initialize_speech_status)
         
-        # Start periodic status checking to detect external model changes
+        # Follow model switches made from the terminal (model_manager.py)
         self.start_periodic_status_check()
     
     def create_widgets(self):
@@ -260,7 +330,14 @@ class OllamaInterface:
         # Auto-press Enter toggle (row 2, center)
         self.auto_enter_check = ttk.Checkbutton(window_frame, text="⚡ Auto-Press Enter", 
                                                variable=self.auto_press_enter)
-        self.auto_enter_check.grid(row=2, column=0, columnspan=3, sticky=tk.W, pady=(2, 0))
+        self.auto_enter_check.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(2, 0))
+        
+        # Debug logging toggle (same row, right side) - debug lines are dropped unless enabled
+        self.debug_logging_enabled = tk.BooleanVar(value=self.log_pipeline.enabled(DEBUG))
+        self.debug_logging_check = ttk.Checkbutton(window_frame, text="🐞 Debug Log",
+                                                  variable=self.debug_logging_enabled,
+                                                  command=self.on_debug_logging_toggled)
+        self.debug_logging_check.grid(row=2, column=2, sticky=tk.W, pady=(2, 0), padx=(10, 0))
         
         # Keyword activation toggle (row 2.5, new row)
         self.keyword_activation_check = ttk.Checkbutton(window_frame, text="🎯 Keyword Activation", 
@@ -314,7 +391,7 @@ class OllamaInterface:
         self.vision_mode_label = ttk.Label(window_frame, text="📝 Text Mode", foreground="blue")
         self.vision_mode_label.grid(row=5, column=2, sticky=tk.W, padx=(5, 0), pady=(5, 0))
         
-        # Screenshot resolution selector (only visible in Vision Image mode)
+        # Screenshot resolution selector (applies to every vision mode)
         ttk.Label(window_frame, text="Resolution:").grid(row=5, column=3, sticky=tk.W, padx=(15, 0), pady=(5, 0))
         self.resolution_combo = ttk.Combobox(window_frame, textvariable=self.screenshot_resolution, 
                                             values=self.available_resolutions, 
@@ -532,10 +609,26 @@ class OllamaInterface:
         ttk.Label(interval_frame, text="Interval:").pack(side="left")
         self.interval_var = tk.StringVar(value="5s")
         interval_combo = ttk.Combobox(interval_frame, textvariable=self.interval_var, 
-                                     values=["3s", "5s", "10s"], state="readonly", width=5)
+                                     values=["Auto", "3s", "5s", "10s"], state="readonly", width=5)
         interval_combo.pack(side="left", padx=(2, 0))
         interval_combo.bind('<<ComboboxSelected>>', self.update_interval)
         
+        # Bounds for the "Auto" interval (seconds)
+        self.interval_min_var = tk.IntVar(value=int(self.rotation_scheduler.min_interval))
+        self.interval_max_var = tk.IntVar(value=int(self.rotation_scheduler.max_interval))
+        # command only fires on arrow clicks - typed values apply on Enter / focus out
+        ttk.Label(interval_frame, text="min").pack(side="left", padx=(4, 0))
+        min_spinbox = ttk.Spinbox(interval_frame, from_=1, to=300, width=3, textvariable=self.interval_min_var,
+                                  command=self.update_interval)
+        min_spinbox.pack(side="left")
+        ttk.Label(interval_frame, text="max").pack(side="left", padx=(2, 0))
+        max_spinbox = ttk.Spinbox(interval_frame, from_=1, to=300, width=3, textvariable=self.interval_max_var,
+                                  command=self.update_interval)
+        max_spinbox.pack(side="left")
+        for spinbox in (min_spinbox, max_spinbox):
+            spinbox.bind('<Return>', self.update_interval)
+            spinbox.bind('<FocusOut>', self.update_interval)
+        
         # Configure grid weights for the MAIN FRAME
         main_frame.columnconfigure(1, weight=1)
         main_frame.rowconfigure(3, weight=1)  # Chat frame is now row 3
@@ -607,14 +700,10 @@ class OllamaInterface:
             # SIMPLIFIED: Just two options - Screen 1 and Screen 2
             screens = []
             
-            # Method 1: Using PIL ImageGrab to detect virtual screen size
+            # Method 1: Virtual desktop size from the capture engine (re-read - screens may have changed)
             try:
-                from PIL import ImageGrab
-                # Get the virtual screen size using MSS
-                with mss.mss() as sct:
-                    # All monitors combined
-                    all_monitors = sct.monitors[0]
-                    virtual_width, virtual_height = all_monitors['width'], all_monitors['height']
+                all_monitors = self.capture_engine.refresh_monitors()[0]
+                virtual_width, virtual_height = all_monitors['width'], all_monitors['height']
                 
                 self.add_chat_message("Debug", f"🔍 SIMPLIFIED Screen Detection:")
                 self.add_chat_message("Debug", f"  Primary Screen: {screen_width}x{screen_height}")
@@ -1754,32 +1843,37 @@ class OllamaInterface:
             self.add_chat_message("Error", f"Model switch error: {e}")
 
     def start_periodic_status_check(self):
-        """Start periodic checking for external model changes - DETECTS TERMINAL SWITCHES!"""
+        """Watch for external model changes - DETECTS TERMINAL SWITCHES without polling!"""
         try:
-            self.check_for_model_changes()
-            # Check every 2 seconds for external model changes
-            self.root.after(2000, self.start_periodic_status_check)
+            if ACTIVE_MODEL_FILE:
+                get_file_watcher().subscribe(ACTIVE_MODEL_FILE, self.on_active_model_file_event)
         except Exception as e:
-            # If something goes wrong, try again in 5 seconds
-            self.root.after(5000, self.start_periodic_status_check)
+            self.add_chat_message("Error", f"Model watcher error: {e}")
+    
+    def on_active_model_file_event(self, path, event, size):
+        """File watcher callback (watcher thread) - check on the Tk thread"""
+        if event != "cleared":
+            self.root.after(0, self.check_for_model_changes)
     
     def check_for_model_changes(self):
-        """Check if model was changed externally and update the interface - YOUR SYNC SYSTEM!"""
+        """Report a model activated in another process and refresh the status - YOUR SYNC SYSTEM!"""
         try:
-            if self.speech_whisper and hasattr(self, 'whisper_status_label'):
-                # Get what the interface currently shows
-                current_displayed = self.whisper_status_label.cget("text")
+            with open(ACTIVE_MODEL_FILE, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get("pid") == os.getpid():
+                return  # Our own switch - the interface is already up to date
+            
+            model = state.get("model", "")
+            self.add_chat_message("System", f"🔄 EXTERNAL MODEL CHANGE DETECTED!")
+            self.add_chat_message("System", f"📢 Terminal switched to: {model}")
+            
+            # Status only - loading the model here would block the Tk thread and put
+            # a second copy on the GPU; switching stays with the Whisper selector
+            if self.speech_whisper and f"-{model} " not in self.speech_whisper.selected_model_name:
+                self.add_chat_message("System", f"💡 This window still uses {self.speech_whisper.selected_model_name} - pick {model} in the Whisper selector to switch")
+            self.add_chat_message("System", f"📱 Updating main interface...")
+            self.update_whisper_status()
                 
-                # Get what the actual loaded model is
-                actual_model = self.speech_whisper.selected_model_name
-                
-                # Check if they don't match (external change detected!)
-                if actual_model and actual_model not in current_displayed:
-                    self.add_chat_message("System", f"🔄 EXTERNAL MODEL CHANGE DETECTED!")
-                    self.add_chat_message("System", f"📢 Terminal switched to: {actual_model}")
-                    self.add_chat_message("System", f"📱 Updating main interface...")
-                    self.update_whisper_status()
-                    
         except Exception as e:
             # Silent error handling for background checking
             pass
@@ -2042,8 +2136,8 @@ class OllamaInterface:
         """Load safety net data from JSON file"""
         try:
             if os.path.exists(self.safety_net_file):
-                with open(self.safety_net_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(self.safety_net_file, 'rb') as f:
+                    data = serializer.loads(f.read())
                     self.safety_net_segments = data.get('segments', [])
                     self.safety_net_current = data.get('current', "")
                     
@@ -2066,8 +2160,8 @@ class OllamaInterface:
                 "last_updated": datetime.now().isoformat()
             }
             
-            with open(self.safety_net_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(self.safety_net_file, 'wb') as f:
+                f.write(serializer.dumps_pretty(data))
                 
             self.add_chat_message("Debug", f"💾 Safety net data saved ({len(self.safety_net_segments)} segments)")
             
@@ -2139,15 +2233,10 @@ class OllamaInterface:
             # Clear screen display
             self.chat_text.delete(1.0, tk.END)
             
-            # Clear system memory completely
-            self.system_memory = []
-            empty_system = {
-                "total_entries": 0, 
-                "last_updated": datetime.now().isoformat(), 
-                "entries": []
-            }
-            with open(self.system_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(empty_system, f, indent=2, ensure_ascii=False)
+            # Clear system memory completely - journal and JSON snapshot
+            self.memory_writer.flush()
+            self.system_memory.clear()
+            self.system_journal.clear()
             
             self.add_chat_message("System", "🧹 SYSTEM MEMORY COMPLETELY CLEARED!")
             self.add_chat_message("System", "🗑️ All system logs and debug data permanently deleted")
@@ -2173,7 +2262,8 @@ class OllamaInterface:
         """Show the visual log window"""
         try:
             if self.visual_log_window is None:
-                self.visual_log_window = VisualLogWindow(self, self.vision_memory_file)
+                self.visual_log_window = VisualLogWindow(self, self.vision_memory_file, self.vision_store,
+                                                         self.search_index)
             
             self.visual_log_window.show_window()
             self.add_chat_message("System", "📋 Visual log window opened")
@@ -2184,12 +2274,9 @@ class OllamaInterface:
     def clean_visual_log(self):
         """Clean the visual log JSON file for fresh start"""
         try:
-            # Create empty log structure
-            empty_log = {"entries": []}
-            
-            # Write to file
-            with open(self.vision_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(empty_log, f, indent=2, ensure_ascii=False)
+            # Empty the vision journal and its JSON snapshot
+            self.vision_store.clear()
+            self.search_index.clear("vision")
             
             self.add_chat_message("System", "🧹 Visual log cleaned! Fresh start ready.")
             
@@ -2199,7 +2286,7 @@ class OllamaInterface:
             try:
                 if os.path.exists(self.screenshots_dir):
                     screenshot_files = [f for f in os.listdir(self.screenshots_dir) 
-                                      if f.startswith("screen_") and f.endswith(".png")]
+                                      if f.startswith("screen_") and f.endswith(IMAGE_EXTENSIONS)]
                     for file in screenshot_files:
                         os.remove(os.path.join(self.screenshots_dir, file))
                     
@@ -2376,17 +2463,13 @@ class OllamaInterface:
     def get_latest_visual_context(self):
         """Get the latest visual context from vision log"""
         try:
-            if os.path.exists(self.vision_memory_file):
-                with open(self.vision_memory_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    entries = data.get('entries', [])
-                    if entries:
-                        latest = entries[-1]
-                        # Return a shortened version of the interpretation
-                        interpretation = latest.get('interpreted_text', '')
-                        if len(interpretation) > 300:
-                            interpretation = interpretation[:300] + "..."
-                        return f"[{latest.get('timestamp', '')}] {interpretation}"
+            latest = self.vision_cache.get_latest()
+            if latest:
+                # Return a shortened version of the interpretation
+                interpretation = latest.get('interpreted_text', '')
+                if len(interpretation) > 300:
+                    interpretation = interpretation[:300] + "..."
+                return f"[{latest.get('timestamp', '')}] {interpretation}"
         except Exception as e:
             print(f"Error getting visual context: {e}")
         return None
@@ -2396,15 +2479,8 @@ class OllamaInterface:
     def get_simple_visual_context(self):
         """Simply get the latest visual interpretation from JSON log"""
         try:
-            if not os.path.exists(self.vision_memory_file):
-                return None
-                
-            with open(self.vision_memory_file, 'r', encoding='utf-8') as f:
-                log_data = json.load(f)
-                
-            entries = log_data.get('entries', [])
-            if entries:
-                latest = entries[-1]  # Get the most recent entry
+            latest = self.vision_cache.get_latest()  # No JSON parse - shared cache
+            if latest:
                 return latest.get('interpreted_text', '')
                 
         except Exception as e:
@@ -2420,7 +2496,7 @@ class OllamaInterface:
                 
             # Get all screenshot files
             screenshot_files = [f for f in os.listdir(self.screenshots_dir) 
-                              if f.startswith("screen_") and f.endswith(".png")]
+                              if f.startswith("screen_") and f.endswith(IMAGE_EXTENSIONS)]
             
             if not screenshot_files:
                 return None
@@ -2437,20 +2513,14 @@ class OllamaInterface:
             # Try to get interpretation from vision log
             interpretation = None
             try:
-                if os.path.exists(self.vision_memory_file):
-                    with open(self.vision_memory_file, 'r', encoding='utf-8') as f:
-                        log_data = json.load(f)
-                    
-                    # Find interpretation for this screenshot
-                    entries = log_data.get('entries', [])
-                    for entry in reversed(entries):  # Start from most recent
-                        if entry.get('screenshot_filename') == latest_file:
-                            interpretation = entry.get('interpreted_text', '')
-                            break
-                    
-                    # If no exact match, use the most recent interpretation
-                    if not interpretation and entries:
-                        interpretation = entries[-1].get('interpreted_text', '')
+                # Find interpretation for this screenshot
+                entry = self.vision_cache.get_for_screenshot(latest_file)
+                
+                # If no exact match, use the most recent interpretation
+                if not entry:
+                    entry = self.vision_cache.get_latest()
+                if entry:
+                    interpretation = entry.get('interpreted_text', '')
                         
             except Exception as e:
                 print(f"Error getting interpretation: {e}")
@@ -2470,12 +2540,16 @@ class OllamaInterface:
             print(f"Error getting latest screenshot data: {e}")
         return None
     
-    def interpret_screenshot_full(self, filepath):
-        """Get full visual interpretation (not truncated) from screenshot"""
+    def interpret_screenshot_full(self, frame=None):
+        """Get full visual interpretation (not truncated) of a frame (default: the latest capture)"""
         try:
-            # Read and encode image
-            with open(filepath, "rb") as image_file:
-                image_data = base64.b64encode(image_file.read()).decode('utf-8')
+            frame = frame or self.latest_frame
+            if frame is None:
+                return None
+            if isinstance(frame, str):
+                # A screenshot path - its bytes are sent as they are
+                frame = VisionFrame.from_file(frame, encoder=get_encoder(self.vision_mode.get()))
+            image_data = frame.payload()
             
             # Send to Ollama for full interpretation
             response = requests.post(
@@ -2746,14 +2820,23 @@ class OllamaInterface:
         except Exception:
             return False
 
-    def add_chat_message(self, sender: str, message: str):
-        """Add message to chat area and save to SYSTEM memory (debug/technical logs)"""
+    def add_chat_message(self, sender: str, message: str, level=None):
+        """Log a message - the pipeline decides chat area / SYSTEM memory / console by level"""
+        self.log_pipeline.log(sender, message, level)
+        
+    def on_debug_logging_toggled(self):
+        """Switch DEBUG-level logging on/off at runtime"""
+        self.log_pipeline.set_min_level("DEBUG" if self.debug_logging_enabled.get() else "INFO")
+        self.add_chat_message("System", f"🐞 Debug logging {'ON' if self.debug_logging_enabled.get() else 'OFF'}")
+        
+    def insert_chat_line(self, level, message_type, sender, message):
+        """Log sink: show the message in the chat area"""
         self.chat_text.insert(tk.END, f"{sender}: {message}\n")
         self.chat_text.see(tk.END)
         
-        # SAVE TO SYSTEM MEMORY (technical/debug logs)
+    def save_log_to_memory(self, level, message_type, sender, message):
+        """Log sink: save to SYSTEM memory (debug/technical logs)"""
         try:
-            message_type = sender.lower()
             self.save_system_memory(message_type, sender, message)
         except Exception as e:
             print(f"System memory save error in add_chat_message: {e}")
@@ -2872,10 +2955,9 @@ class OllamaInterface:
                         if self.include_visual_context.get():
                             import io
                             import win32clipboard
-                            from PIL import ImageGrab
                             
-                            # Take screenshot and copy to clipboard as image
-                            screenshot = ImageGrab.grab()
+                            # Take screenshot of the selected screen and copy to clipboard as image
+                            screenshot, _ = self.capture_engine.grab(self.selected_screen_index)
                             output = io.BytesIO()
                             screenshot.save(output, 'BMP')
                             data = output.getvalue()[14:]
@@ -2928,24 +3010,20 @@ class OllamaInterface:
             # Vision Text mode: Standard text delivery with optional visual context
             else:
                 # SIMPLE VISUAL ATTACHMENT - ONLY for the NEW message segment
+                # Looked up once from the shared cache and reused for both delivery paths
+                visual_text = None
                 if self.include_visual_context.get():
                     try:
-                        if os.path.exists(self.vision_memory_file):
-                            with open(self.vision_memory_file, 'r', encoding='utf-8') as f:
-                                log_data = json.load(f)
-                            entries = log_data.get('entries', [])
-                            if entries:
-                                latest = entries[-1]
-                                visual_text = latest.get('interpreted_text', '')
-                                if visual_text:
-                                    message = f"""Based on this visual context from my screen: I can see {visual_text}\n\nPlease respond to my NEW message: {original_message}\n\nUse the visual context to provide a more informed and relevant response."""
-                                    self.add_chat_message("Info", "✅ Visual context attached to message segment")
-                                else:
-                                    self.add_chat_message("Info", "⚠️ No visual interpretation found")
+                        latest = self.vision_cache.get_latest()
+                        if latest:
+                            visual_text = latest.get('interpreted_text', '')
+                            if visual_text:
+                                message = f"""Based on this visual context from my screen: I can see {visual_text}\n\nPlease respond to my NEW message: {original_message}\n\nUse the visual context to provide a more informed and relevant response."""
+                                self.add_chat_message("Info", "✅ Visual context attached to message segment")
                             else:
-                                self.add_chat_message("Info", "⚠️ No visual entries - start screenshot rotation")
+                                self.add_chat_message("Info", "⚠️ No visual interpretation found")
                         else:
-                            self.add_chat_message("Info", "⚠️ No vision log found - start screenshot rotation")
+                            self.add_chat_message("Info", "⚠️ No visual entries - start screenshot rotation")
                     except Exception as e:
                         self.add_chat_message("Error", f"Visual context error: {e}")
                 
@@ -2953,10 +3031,8 @@ class OllamaInterface:
                 if self.direct_output_enabled.get():
                     if self.selected_window_handle:
                         final_message = original_message
-                        if self.include_visual_context.get():
-                            visual_context = self.get_simple_visual_context()
-                            if visual_context:
-                                final_message += f"\n\n[Visual Context: {visual_context}]"
+                        if visual_text:
+                            final_message += f"\n\n[Visual Context: {visual_text}]"
                         success = self.send_direct_to_window(final_message)
                         if success:
                             self.add_chat_message("System", "✅ Message segment sent to target window")
@@ -3012,13 +3088,12 @@ class OllamaInterface:
         """Take a screenshot and save it to the screenshots folder. Returns the file path or None."""
         try:
             import datetime
-            from PIL import ImageGrab
             screenshots_dir = self.screenshots_dir
             os.makedirs(screenshots_dir, exist_ok=True)
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"screen_{timestamp}.png"
             filepath = os.path.join(screenshots_dir, filename)
-            img = ImageGrab.grab()
+            img, _ = self.capture_engine.grab(self.selected_screen_index)
             img.save(filepath)
             return filepath
         except Exception as e:
@@ -3096,9 +3171,8 @@ class OllamaInterface:
         self.root.update()
         
         try:
-            # Read and encode image
-            with open(file_path, "rb") as image_file:
-                image_data = base64.b64encode(image_file.read()).decode('utf-8')
+            # File bytes are sent as they are (only very large files are re-encoded)
+            image_data = VisionFrame.from_file(file_path, encoder=get_encoder(self.vision_mode.get())).payload()
             
             # Send to Ollama with image
             response = requests.post(
@@ -3130,9 +3204,15 @@ class OllamaInterface:
             self.send_button.config(state='normal')
 
     def update_interval(self, event=None):
-        """Update rotation interval when user changes selection"""
+        """Update rotation interval (or the Auto bounds) when user changes selection"""
         interval_str = self.interval_var.get()
-        self.rotation_interval = int(interval_str.replace('s', ''))
+        self.adaptive_rotation = interval_str == "Auto"
+        if not self.adaptive_rotation:
+            self.rotation_interval = int(interval_str.replace('s', ''))
+        try:
+            self.rotation_scheduler.set_bounds(self.interval_min_var.get(), self.interval_max_var.get())
+        except (tk.TclError, ValueError):
+            pass  # Spinbox being edited - keep the previous bounds
         
     def toggle_rotation(self):
         """Start or stop the screenshot rotation system"""
@@ -3148,8 +3228,15 @@ class OllamaInterface:
             return
             
         self.rotation_active = True
+        self.frame_detector.reset()  # First frame of a rotation is always analyzed
+        self.update_interval()
+        self.rotation_scheduler.reset()
         self.rotation_button.config(text="🛑 STOP Rotation", style="Accent.TButton")
-        self.add_chat_message("System", f"🔄 Screenshot rotation STARTED (every {self.rotation_interval}s)")
+        if self.adaptive_rotation:
+            self.add_chat_message("System", f"🔄 Screenshot rotation STARTED (auto interval, "
+                                            f"{self.rotation_scheduler.min_interval:g}-{self.rotation_scheduler.max_interval:g}s)")
+        else:
+            self.add_chat_message("System", f"🔄 Screenshot rotation STARTED (every {self.rotation_interval}s)")
         self.add_chat_message("System", "🔴 Button is now HIGHLIGHTED - rotation is ACTIVE!")
         
         # Start the rotation thread
@@ -3159,8 +3246,12 @@ class OllamaInterface:
     def stop_rotation(self):
         """Stop the screenshot rotation system"""
         self.rotation_active = False
+        self.analysis_queue.clear()  # Frames already being analyzed still finish
         self.rotation_button.config(text="▶️ START Rotation", style="")
-        self.add_chat_message("System", "⏹️ Screenshot rotation STOPPED")
+        stats = self.analysis_queue.stats()
+        cache = self.interpretation_cache.stats()
+        self.add_chat_message("System", f"⏹️ Screenshot rotation STOPPED ({stats['processed']} analyzed, {stats['dropped']} dropped while busy, "
+                                        f"{cache['hits']} cache hits / {cache['hit_rate']:.0%} hit rate)")
         self.add_chat_message("System", "✅ Button is now NORMAL - rotation is INACTIVE!")
         
     def rotation_loop(self):
@@ -3168,10 +3259,19 @@ class OllamaInterface:
         while self.rotation_active:
             try:
                 # Take screenshot
+                started = time.monotonic()
                 self.take_screenshot()
                 
-                # Wait for next interval
-                for _ in range(self.rotation_interval * 10):  # Check every 0.1s for responsive stopping
+                # Next capture time - fixed, or adapted to screen activity and model latency
+                interval = self.rotation_interval
+                if self.adaptive_rotation:
+                    previous = self.rotation_scheduler.interval
+                    interval = self.rotation_scheduler.next_interval(backlog=self.analysis_queue.stats()["queued"])
+                    if abs(interval - previous) >= 0.5 and self.log_pipeline.enabled(DEBUG):
+                        self.add_chat_message("Debug", f"⏱️ Next capture in {interval:.1f}s ({self.rotation_scheduler.reason})")
+                
+                # Wait for next interval (counted from the capture start)
+                while time.monotonic() - started < interval:  # Check every 0.1s for responsive stopping
                     if not self.rotation_active:
                         return
                     time.sleep(0.1)
@@ -3181,115 +3281,135 @@ class OllamaInterface:
                 break
                 
     def take_screenshot(self):
-        """Capture a screenshot using MSS - EXACTLY like Athena suggested!"""
+        """Capture the selected screen through the shared capture engine"""
         try:
-            self.add_chat_message("Debug", f"📸 MSS CAPTURE: selected_screen_index = {self.selected_screen_index}")
-            
-            with mss.mss() as sct:
-                if self.selected_screen_index == 1:
-                    # SCREEN 1 - Primary monitor (MSS monitor 1)
-                    monitor = sct.monitors[1] 
-                    self.add_chat_message("Debug", f"   → SCREEN 1: monitor={monitor}")
-                    screenshot_mss = sct.grab(monitor)
-
+            # Per-frame debug lines are only formatted when DEBUG logging is on
+            debug = self.log_pipeline.enabled(DEBUG)
+            if debug:
+                self.add_chat_message("Debug", f"📸 CAPTURE: selected_screen_index = {self.selected_screen_index}")
+            
+            # Persistent capture session + cached monitor topology (mss numbering: 1 = primary, 2 = secondary)
+            monitors = self.capture_engine.monitors
+            if self.selected_screen_index == 2 and len(monitors) > 2:
+                if debug:
+                    self.add_chat_message("Debug", f"   → SCREEN 2: monitor={monitors[2]} (LEFT={monitors[2]['left']} to RIGHT={monitors[2]['left'] + monitors[2]['width']})")
+                screenshot, _ = self.capture_engine.grab(2)
+                screen_info = "Screen 2 (Native MSS)"
+            else:
+                if self.selected_screen_index == 2:
+                    screen_info = "Screen 2 (Fallback to Screen 1)"
+                    if debug:
+                        self.add_chat_message("Debug", f"   → SCREEN 2 FALLBACK: only {len(monitors)} monitors found, using monitor 1")
+                elif self.selected_screen_index == 1:
                     screen_info = "Screen 1"
-                    
-                elif self.selected_screen_index == 2:
-                    # SCREEN 2 - Secondary monitor with 1080p override for performance
-                    if len(sct.monitors) > 2:
-                        monitor = sct.monitors[2]
-                        self.add_chat_message("Debug", f"   → SCREEN 2: Original monitor={monitor}")
-                        
-                        # PERFECT! Use the EXACT coordinates MSS reports (they're correct!)
-                        # No need to force 1080p - MSS already reports it correctly as 1920x1080
-                        self.add_chat_message("Debug", f"   → SCREEN 2: Using EXACT MSS coordinates (no override needed!)")
-                        self.add_chat_message("Debug", f"   → Monitor coords: {monitor}")
-                        self.add_chat_message("Debug", f"   → This captures from LEFT={monitor['left']} to RIGHT={monitor['left']+monitor['width']}")
-                        
-                        # Use the monitor exactly as MSS reports it - it's already correct!
-                        screenshot_mss = sct.grab(monitor)
-                        self.add_chat_message("Debug", f"   → MSS captured: {screenshot_mss.size} pixels (native resolution)")
-                        
-                        screen_info = "Screen 2 (Native MSS)"
-                    else:
-                        # Fallback to primary if no secondary
-                        monitor = sct.monitors[1]
-                        self.add_chat_message("Debug", f"   → SCREEN 2 FALLBACK: only {len(sct.monitors)} monitors found, using monitor 1")
-                        screenshot_mss = sct.grab(monitor)
-                        screen_info = "Screen 2 (Fallback to Screen 1)"
-                        
                 else:
-                    # Fallback to primary screen
-                    monitor = sct.monitors[1]
-                    self.add_chat_message("Debug", f"   → FALLBACK: Unexpected index {self.selected_screen_index}, using monitor 1")
-                    screenshot_mss = sct.grab(monitor)
                     screen_info = "Screen 1 (Fallback)"
-                
-                # Convert MSS screenshot to PIL Image (IDENTICAL to debug script method)
-                screenshot = Image.frombytes("RGB", screenshot_mss.size, screenshot_mss.bgra, "raw", "BGRX")
-                
-                # Apply resolution reduction if selected and in Vision Image mode
-                if self.vision_mode.get() == "Vision Image" and self.screenshot_resolution.get() == "Reduced (1080p)":
-                    # Only resize if original is larger than 1080p
-                    original_width, original_height = screenshot.size
-                    if original_width > 1920 or original_height > 1080:
-                        # Calculate target size while maintaining aspect ratio
-                        target_height = 1080
-                        target_width = int(original_width * (target_height / original_height))
-                        
-                        # Make sure width doesn't exceed 1920
-                        if target_width > 1920:
-                            target_width = 1920
-                            target_height = int(original_height * (target_width / original_width))
-                        
-                        # Resize with Lanczos for best quality/speed balance
-                        screenshot = screenshot.resize((target_width, target_height), Image.LANCZOS)
-                        self.add_chat_message("Debug", f"   → Reduced to 1080p: {screenshot.size} pixels")
-                
-                self.add_chat_message("Debug", f"   → PIL conversion: {screenshot.size} pixels")
-                self.add_chat_message("Debug", f"   → Ready to save as: {screen_info}")
+                    if debug:
+                        self.add_chat_message("Debug", f"   → FALLBACK: Unexpected index {self.selected_screen_index}, using monitor 1")
+                screenshot, _ = self.capture_engine.grab(1)
+            if debug:
+                self.add_chat_message("Debug", f"   → Captured {screenshot.size} pixels via {self.capture_engine.backend.name} ({screen_info})")
+        
+            # Skip frames that look like the last analyzed one - no save, no model call
+            skipped = self.frame_detector.unchanged_streak
+            change = self.frame_detector.check(screenshot)
+            self.rotation_scheduler.record_frame(change["changed"])
+            if not change["changed"]:
+                if self.frame_detector.unchanged_streak == 1:
+                    self.add_chat_message("System", "⏸️ Screen unchanged - skipping analysis until it changes")
+                elif debug:
+                    self.add_chat_message("Debug", f"⏸️ Unchanged frame skipped (diff {change['mean_diff']}, hash distance {change['hash_distance']})")
+                return
+            if skipped:
+                self.add_chat_message("System", f"▶️ Screen changed - resuming analysis ({skipped} unchanged frames skipped)")
+            
+            # Localized change - send only the changed region(s), not the whole monitor
+            crop = None
+            full_screenshot = screenshot
+            if change["regions"]:
+                crop = {"regions": [list(region) for region in change["regions"]], "frame_size": list(screenshot.size)}
+                screenshot = compose_regions(screenshot, change["regions"])
+                if debug:
+                    self.add_chat_message("Debug", f"✂️ Dirty regions {crop['regions']} → {screenshot.width}x{screenshot.height} crop")
+            
+            # Downscale what is sent (full frame or crop) - detection and cropping used full resolution
+            screenshot = self.scale_for_model(screenshot, debug)
             
             # Generate filename with proper rotation (1, 2, 3, then back to 1)
+            # Encoding (format, quality, grayscale) follows the vision mode policy
+            encoder = get_encoder(self.vision_mode.get())
             self.screenshot_counter = (self.screenshot_counter % self.max_screenshots) + 1
-            filename = f"screen_{self.screenshot_counter:03d}.png"
+            filename = f"screen_{self.screenshot_counter:03d}{encoder.extension}"
             filepath = os.path.join(self.screenshots_dir, filename)
             
-            # Save screenshot (this will overwrite the oldest one automatically)
-            screenshot.save(filepath)
+            # Frame goes to the model from memory; the disk copy is written in the background
+            # (overwriting the oldest one, then cleaning up beyond the rotation limit)
+            frame = VisionFrame(screenshot, filename, encoder=encoder)
+            if crop is None:
+                saved_frame = frame
+            else:
+                # Disk copy and "latest screenshot" stay the whole screen under this name;
+                # only the model gets the crop (the vision entry's regions locate it in the frame)
+                saved_frame = VisionFrame(self.scale_for_model(full_screenshot), filename, encoder=encoder)
+            self.frame_saver.save(saved_frame, filepath)
+            self.latest_frame = saved_frame
             
             # Add screen info to log
-            self.add_chat_message("Debug", f"📸 Screenshot captured from: {screen_info} ({screenshot.width}x{screenshot.height})")
-            
-            # Clean up old screenshots beyond our rotation limit
-            self.cleanup_old_screenshots()
+            if debug:
+                self.add_chat_message("Debug", f"📸 Screenshot captured from: {screen_info} ({screenshot.width}x{screenshot.height})")
             
             # Process with AI (in background to not block rotation)
-            threading.Thread(target=self.process_screenshot, args=(filepath, filename), daemon=True).start()
+            self.queue_screenshot(frame, crop)
             
         except Exception as e:
             self.root.after(0, lambda: self.add_chat_message("Error", f"Screenshot failed: {str(e)}"))
             
             # Fallback to basic MSS screenshot
             try:
-                with mss.mss() as sct:
-                    # Grab from first monitor as fallback
-                    screenshot_mss = sct.grab(sct.monitors[1])
-                    screenshot = Image.frombytes("RGB", screenshot_mss.size, screenshot_mss.bgra, "raw", "BGRX")
-                    
+                # Re-read the monitor layout (a screen may have been unplugged) and grab the primary
+                self.capture_engine.refresh_monitors()
+                screenshot, _ = self.capture_engine.grab(1)
+                
+                encoder = get_encoder(self.vision_mode.get())
                 self.screenshot_counter = (self.screenshot_counter % self.max_screenshots) + 1
-                filename = f"screen_{self.screenshot_counter:03d}.png"
+                filename = f"screen_{self.screenshot_counter:03d}{encoder.extension}"
                 filepath = os.path.join(self.screenshots_dir, filename)
-                screenshot.save(filepath)
-                self.add_chat_message("Debug", "📸 MSS Fallback screenshot captured")
-                threading.Thread(target=self.process_screenshot, args=(filepath, filename), daemon=True).start()
+                frame = VisionFrame(screenshot, filename, encoder=encoder)
+                self.frame_saver.save(frame, filepath)
+                self.latest_frame = frame
+                if debug:
+                    self.add_chat_message("Debug", "📸 MSS Fallback screenshot captured")
+                self.queue_screenshot(frame, None)
             except Exception as fallback_error:
                 self.root.after(0, lambda: self.add_chat_message("Error", f"Fallback screenshot failed: {fallback_error}"))
     
+    def scale_for_model(self, image, debug=False):
+        """Downscale per the Resolution setting: the model's input size, a 1080p box, or untouched"""
+        resolution = self.screenshot_resolution.get()
+        original_size = image.size
+        started = time.perf_counter()
+        if resolution == "Reduced (1080p)":
+            image = self.frame_scaler.fit(image, 1920, 1080)
+        elif resolution == "Model Input":
+            image = self.frame_scaler.fit_model(image, self.selected_model.get())
+        if debug and image.size != original_size:
+            self.add_chat_message("Debug", f"   → Scaled {original_size[0]}x{original_size[1]} → {image.width}x{image.height} "
+                                           f"({self.frame_scaler.strategy}, {(time.perf_counter() - started) * 1000:.1f} ms)")
+        return image
+    
+    def queue_screenshot(self, frame, crop):
+        """Hand a captured frame to the analysis workers (drops the oldest waiting frame when busy)"""
+        dropped = self.analysis_queue.submit(frame, crop)
+        if dropped:
+            total = self.analysis_queue.dropped_frames
+            if total == 1 or self.log_pipeline.enabled(DEBUG):
+                self.add_chat_message("System", f"⏭️ Vision model busy - dropped queued frame {dropped[0].name} ({total} dropped so far)")
+    
     def cleanup_old_screenshots(self):
         """Remove screenshots beyond our rotation limit"""
         try:
             screenshot_files = [f for f in os.listdir(self.screenshots_dir) 
-                              if f.startswith("screen_") and f.endswith(".png")]
+                              if f.startswith("screen_") and f.endswith(IMAGE_EXTENSIONS)]
             
             # Keep only the newest max_screenshots files
             if len(screenshot_files) > self.max_screenshots:
@@ -3304,32 +3424,53 @@ class OllamaInterface:
                     
         except Exception as e:
             print(f"Cleanup error: {e}")
-    def process_screenshot(self, filepath, filename):
-        """Process screenshot with AI and log results"""
+    def process_screenshot(self, frame, crop=None):
+        """Process a captured frame with AI and log results (crop = dirty-region geometry, if cropped)"""
         try:
-            # Read and encode image
-            with open(filepath, "rb") as image_file:
-                image_data = base64.b64encode(image_file.read()).decode('utf-8')
+            filename = frame.name
+            prompt = "Describe what you see in this screenshot. Focus on text content, UI elements, and any important visual information."
+            if crop:
+                prompt = ("This image shows only the part(s) of the screen that just changed"
+                          f"{' (several regions stacked top to bottom)' if len(crop['regions']) > 1 else ''}. "
+                          "Describe what changed. Focus on text content, UI elements, and any important visual information.")
+            
+            # Seen this screen before (e.g. switched back to a window)? Reuse its interpretation
+            model = self.selected_model.get()
+            frame_print = fingerprint(frame.image)
+            cached = self.interpretation_cache.lookup(frame_print, (model, prompt))
+            if cached:
+                self.log_vision_result(filename, cached, crop, cached=True)
+                self.root.after(0, lambda: self.add_chat_message("Vision", f"📸 {filename} (cached): {cached[:100]}..."))
+                return
             
-            # Send to Ollama
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": self.selected_model.get(),
-                    "prompt": "Describe what you see in this screenshot. Focus on text content, UI elements, and any important visual information.",
-                    "images": [image_data],
-                    "stream": False
-                },
-                timeout=30,
-                headers={"Content-Type": "application/json"}
-            )
+            # Encoded straight from memory (shared with the background disk save)
+            image_data = frame.payload()
+            
+            # Send to Ollama (timed - the adaptive interval never outpaces the model)
+            request_started = time.monotonic()
+            try:
+                response = requests.post(
+                    f"{self.ollama_url}/api/generate",
+                    json={
+                        "model": model,
+                        "prompt": prompt,
+                        "images": [image_data],
+                        "stream": False
+                    },
+                    timeout=30,
+                    headers={"Content-Type": "application/json"}
+                )
+            finally:
+                # Timed-out requests count too - a saturated model must raise the latency floor
+                self.rotation_scheduler.record_analysis(time.monotonic() - request_started)
             
             if response.status_code == 200:
                 data = response.json()
                 interpretation = data.get('response', 'No response received')
+                self.interpretation_cache.store(frame_print, interpretation, (model, prompt))
                 
                 # Log to JSON
-                self.log_vision_result(filename, interpretation)
+                self.log_vision_result(filename, interpretation, crop)
                 
                 # Update UI
                 self.root.after(0, lambda: self.add_chat_message("Vision", f"📸 {filename}: {interpretation[:100]}..."))
@@ -3340,27 +3481,24 @@ class OllamaInterface:
         except Exception as e:
             self.root.after(0, lambda: self.add_chat_message("Error", f"Processing failed: {str(e)}"))
             
-    def log_vision_result(self, filename, interpretation):
-        """Log vision result to JSON file"""
+    def log_vision_result(self, filename, interpretation, crop=None, cached=False):
+        """Log vision result to JSON file (cached = reused from the interpretation cache)"""
         try:
-            # Load existing log or create new
-            if os.path.exists(self.vision_memory_file):
-                with open(self.vision_memory_file, 'r', encoding='utf-8') as f:
-                    log_data = json.load(f)
-            else:
-                log_data = {"entries": []}
-            
-            # Add new entry
             entry = {
                 "timestamp": datetime.now().isoformat(),
                 "screenshot_filename": filename,
                 "interpreted_text": interpretation
             }
-            log_data["entries"].append(entry)
+            if crop:
+                # Crop geometry in frame pixels - which part of the screen this describes
+                entry["crop"] = crop
+            if cached:
+                entry["cached"] = True
             
-            # Save back to file
-            with open(self.vision_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+            # Constant-time append - the store keeps the latest entry in memory
+            self.vision_store.append(entry)
+            self.search_index.add("vision", entry)
+            self.rollups.record("vision", entry)
                 
         except Exception as e:
             self.root.after(0, lambda: self.add_chat_message("Error", f"Logging failed: {str(e)}"))
@@ -3684,7 +3822,8 @@ class OllamaInterface:
             # KEYWORD ACTIVATION CHECK - CRITICAL FIX WITH ENHANCED DEBUGGING!
             if self.keyword_activation_enabled.get():
                 text_lower = text.lower().strip()
-                self.add_chat_message("Debug", f"🔍 Checking text: '{text_lower}' against keywords: {self.trigger_keywords}")
+                if self.log_pipeline.enabled(DEBUG):
+                    self.add_chat_message("Debug", f"🔍 Checking text: '{text_lower}' against keywords: {self.trigger_keywords}")
                 
                 # Check if text contains any trigger keywords
                 for keyword in self.trigger_keywords:
@@ -4108,15 +4247,11 @@ class OllamaInterface:
             # Clear the message input
             self.message_entry.delete("1.0", tk.END)
             
-            # Clear chat memory completely
-            self.chat_memory = []
-            empty_chat = {
-                "total_entries": 0, 
-                "last_updated": datetime.now().isoformat(), 
-                "entries": []
-            }
-            with open(self.chat_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(empty_chat, f, indent=2, ensure_ascii=False)
+            # Clear chat memory completely - journal and JSON snapshot
+            self.memory_writer.flush()
+            self.chat_memory.clear()
+            self.chat_journal.clear()
+            self.search_index.clear("chat")
             
             self.add_chat_message("System", "🧹 CHAT MEMORY COMPLETELY CLEARED!")
             self.add_chat_message("System", f"🗑️ Deleted {text_length} characters from input")
@@ -4248,9 +4383,10 @@ class OllamaInterface:
             }
             
             self.system_memory.append(memory_entry)
+            self.rollups.record("system", memory_entry)
             
-            # Save to file immediately
-            self.write_system_memory_to_file()
+            # Queue for the background writer - no disk I/O on this thread
+            self.memory_writer.submit(self.system_journal, memory_entry)
             
         except Exception as e:
             print(f"System memory save error: {e}")
@@ -4269,39 +4405,31 @@ class OllamaInterface:
             }
             
             self.chat_memory.append(chat_entry)
+            self.rollups.record("chat", chat_entry)
             
-            # Save to file immediately
-            self.write_chat_memory_to_file()
+            # Queue for the background writer - no disk I/O on this thread
+            self.memory_writer.submit(self.chat_journal, chat_entry)
+            self.memory_writer.submit(self.search_index.write_target("chat"), chat_entry)  # indexed once on disk
             
         except Exception as e:
             print(f"Chat memory save error: {e}")
     
+    def prune_search_index(self):
+        """Drop vision documents the compactor removed from the store"""
+        self.search_index.prune("vision", self.vision_store.oldest_timestamp())
+    
     def write_system_memory_to_file(self):
-        """Write system memory to JSON file"""
+        """Write system memory JSON snapshot (last 1000 entries) from the journal"""
         try:
-            memory_data = {
-                "total_entries": len(self.system_memory),
-                "last_updated": datetime.now().isoformat(),
-                "entries": self.system_memory[-1000:]  # Keep last 1000 entries
-            }
-            
-            with open(self.system_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(memory_data, f, indent=2, ensure_ascii=False)
+            self.system_journal.write_snapshot()
                 
         except Exception as e:
             print(f"System memory file write error: {e}")
     
     def write_chat_memory_to_file(self):
-        """Write chat memory to JSON file"""
+        """Write chat memory JSON snapshot (last 500 entries) from the journal"""
         try:
-            chat_data = {
-                "total_entries": len(self.chat_memory),
-                "last_updated": datetime.now().isoformat(),
-                "entries": self.chat_memory[-500:]  # Keep last 500 chat entries
-            }
-            
-            with open(self.chat_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(chat_data, f, indent=2, ensure_ascii=False)
+            self.chat_journal.write_snapshot()
                 
         except Exception as e:
             print(f"Chat memory file write error: {e}")
@@ -4309,52 +4437,59 @@ class OllamaInterface:
     def load_system_memory(self):
         """Load existing system memory from file"""
         try:
-            if os.path.exists(self.system_memory_file):
-                with open(self.system_memory_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.system_memory = data.get('entries', [])
-                    self.add_chat_message("System", f"📂 Loaded {len(self.system_memory)} system memory entries")
-            else:
-                self.system_memory = []
+            # Newest entries only - startup time does not grow with the history on disk
+            self.system_memory.load(self.system_journal.read_tail(MEMORY_STARTUP_TAIL_ENTRIES))
+            self.add_chat_message("System", f"📂 Loaded newest {len(self.system_memory)} of {self.system_journal.journal_entries} system memory entries")
                 
         except Exception as e:
             self.add_chat_message("Error", f"System memory load error: {e}")
-            self.system_memory = []
+            self.system_memory.clear()
     
     def load_chat_memory(self):
         """Load existing chat memory from file"""
         try:
-            if os.path.exists(self.chat_memory_file):
-                with open(self.chat_memory_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.chat_memory = data.get('entries', [])
-                    self.add_chat_message("System", f"📂 Loaded {len(self.chat_memory)} chat memory entries")
-            else:
-                self.chat_memory = []
+            self.chat_memory.load(self.chat_journal.read_tail(MEMORY_STARTUP_TAIL_ENTRIES))
+            self.add_chat_message("System", f"📂 Loaded newest {len(self.chat_memory)} of {self.chat_journal.journal_entries} chat memory entries")
                 
         except Exception as e:
             self.add_chat_message("Error", f"Chat memory load error: {e}")
-            self.chat_memory = []
+            self.chat_memory.clear()
     
     def clean_all_memory(self):
         """Clean all memory files - DANGER ZONE!"""
         try:
+            # Let queued entries land first so they don't reappear after clearing
+            self.memory_writer.flush()
+            
             # Clean chat memory
-            self.chat_memory = []
-            empty_chat = {"total_entries": 0, "last_updated": datetime.now().isoformat(), "entries": []}
-            with open(self.chat_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(empty_chat, f, indent=2, ensure_ascii=False)
+            self.chat_memory.clear()
+            self.chat_journal.clear()
+            self.search_index.clear("chat")
             
             # Clean system memory
-            self.system_memory = []
-            empty_system = {"total_entries": 0, "last_updated": datetime.now().isoformat(), "entries": []}
-            with open(self.system_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(empty_system, f, indent=2, ensure_ascii=False)
+            self.system_memory.clear()
+            self.system_journal.clear()
             
             self.add_chat_message("System", "🧹 ALL MEMORY CLEANED! Fresh start ready.")
             
         except Exception as e:
             self.add_chat_message("Error", f"Memory cleaning error: {e}")
+    
+    def shutdown_memory(self):
+        """Flush queued memory writes and refresh JSON snapshots on exit"""
+        try:
+            self.analysis_queue.stop(timeout=1.0)
+            self.frame_saver.stop()
+            self.capture_engine.close()
+            self.memory_writer.stop()
+            self.vision_compactor.stop()
+            self.rollups.stop()
+            self.write_system_memory_to_file()
+            self.write_chat_memory_to_file()
+            self.vision_store.write_snapshot()
+            
+        except Exception as e:
+            print(f"Memory shutdown error: {e}")
 
 
 # ===== MAIN EXECUTION - START THE APPLICATION =====
@@ -4375,6 +4510,9 @@ if __name__ == "__main__":
         # Start the GUI event loop
         root.mainloop()
         
+        # Flush queued memory writes and refresh JSON snapshots on exit
+        app.shutdown_memory()
+        
     except Exception as e:
         print(f"❌ Failed to start application: {e}")
         import traceback
@@ -0,0 +1,112 @@
+"""
+Rotation Scheduler - Adaptive Screenshot Interval
+=================================================
+
+Picks the time until the next rotation capture instead of a fixed 3/5/10 s:
+- Activity: every changed capture (frame_change.py) shortens the interval
+  by ROTATION_IDLE_BACKOFF, at least down to the change-rate target - the
+  fraction of the last ROTATION_ADAPTIVE_WINDOW captures that changed maps
+  linearly onto [max, min], so a steadily busy screen goes straight to min
+- Idle back-off: every unchanged capture stretches the interval by the same
+  factor, so a static screen is polled less and less
+- Model latency: rolling average of real Ollama calls (cache hits excluded).
+  Capturing faster than the workers can analyze only produces dropped
+  frames, so the interval never goes below latency / workers
+- Saturation: a frame still waiting in the analysis queue backs off further
+- Growth is capped at one back-off step per capture, so a single quiet
+  frame never jumps straight to the maximum
+
+The result is always within the user-set [min, max] bounds.
+"""
+
+import collections
+import threading
+from config import (
+    ROTATION_MIN_INTERVAL, ROTATION_MAX_INTERVAL, ROTATION_ADAPTIVE_WINDOW, ROTATION_IDLE_BACKOFF
+)
+
+
+class AdaptiveScheduler:
+    """Next-capture interval from screen change rate and analysis latency"""
+
+    def __init__(self, min_interval=ROTATION_MIN_INTERVAL, max_interval=ROTATION_MAX_INTERVAL,
+                 window=ROTATION_ADAPTIVE_WINDOW, backoff=ROTATION_IDLE_BACKOFF, workers=1):
+        """Bounds in seconds; window = captures/analyses the rolling averages cover"""
+        self.lock = threading.Lock()
+        self.backoff = backoff
+        self.workers = max(1, workers)
+        self.changes = collections.deque(maxlen=window)
+        self.latencies = collections.deque(maxlen=window)
+        self.set_bounds(min_interval, max_interval)
+        self.interval = self.max_interval
+        self.reason = "start"
+
+    def set_bounds(self, min_interval, max_interval):
+        """User-set bounds (swapped if given the wrong way round)"""
+        low, high = sorted((max(0.5, float(min_interval)), max(0.5, float(max_interval))))
+        with self.lock:
+            self.min_interval = low
+            self.max_interval = high
+
+    def reset(self):
+        """Forget history - a new rotation starts at the fastest rate until the screen settles"""
+        with self.lock:
+            self.changes.clear()
+            self.interval = self.min_interval
+            self.reason = "start"
+
+    def record_frame(self, changed):
+        """One rotation capture: did the screen change?"""
+        with self.lock:
+            self.changes.append(bool(changed))
+
+    def record_analysis(self, seconds):
+        """Wall time of one vision model request"""
+        with self.lock:
+            self.latencies.append(seconds)
+
+    def average_latency(self):
+        """Rolling mean model latency in seconds (0 before the first request)"""
+        with self.lock:
+            return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    def change_rate(self):
+        """Fraction of recent captures that changed (0.5 before the first capture)"""
+        with self.lock:
+            return sum(self.changes) / len(self.changes) if self.changes else 0.5
+
+    def next_interval(self, backlog=0):
+        """Seconds until the next capture; backlog = frames waiting for a worker"""
+        rate = self.change_rate()
+        latency_floor = self.average_latency() / self.workers
+        with self.lock:
+            last_changed = self.changes[-1] if self.changes else True
+            previous = self.interval
+
+            # Busy screen -> minimum, quiet screen -> maximum
+            rate_target = self.max_interval - rate * (self.max_interval - self.min_interval)
+            if last_changed:
+                target = min(rate_target, previous / self.backoff)
+                reason = f"screen active, change rate {rate:.0%}"
+            else:
+                target = previous * self.backoff
+                reason = "screen idle"
+            if latency_floor > target:
+                target = latency_floor
+                reason = f"model latency {latency_floor:.1f}s"
+            if backlog and previous * self.backoff > target:
+                target = previous * self.backoff
+                reason = "model saturated"
+
+            if target > previous and not backlog:
+                # Ease off gradually; speeding up (activity) is immediate
+                target = min(target, previous * self.backoff)
+            self.interval = min(self.max_interval, max(self.min_interval, target))
+            self.reason = reason
+            return self.interval
+
+    def stats(self):
+        """Current interval and the inputs behind it"""
+        return {"interval": round(self.interval, 2), "reason": self.reason,
+                "change_rate": round(self.change_rate(), 2), "latency": round(self.average_latency(), 2),
+                "min": self.min_interval, "max": self.max_interval}
@@ -2,7 +2,7 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog
 import pyautogui
 import win32clipboard
-from PIL import ImageGrab
+from capture_engine import get_capture_engine
 import io
 import pygetwindow as gw
 import pywinauto
@@ -20,7 +20,7 @@ class ScreenshotApp:
         tk.Button(root, text='Send Screenshot', command=self.send_screenshot).pack(pady=5)
 
     def take_screenshot(self):
-        self.screenshot = ImageGrab.grab()
+        self.screenshot, _ = get_capture_engine().grab(1)
         output = io.BytesIO()
         self.screenshot.save(output, 'BMP')
         data = output.getvalue()[14:]
@@ -0,0 +1,263 @@
+"""
+SQLite Memory Store - Indexed Storage Engine
+============================================
+
+Optional storage engine behind MemoryManager:
+- One WAL-mode database with tables for system, chat and vision memory
+- Indexes on timestamp, type/action, sender and screenshot filename
+- Small query API: latest-N, time range, type/sender, screenshot filename
+- One-shot importer for the existing *_memory.json files
+
+Run directly to import the JSON memory files:  python sqlite_memory_store.py
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from memory_journal import ARCHIVE_READ_ERRORS, read_jsonl_file
+from vision_store import segment_files
+from config import (
+    SQLITE_MEMORY_FILE, SYSTEM_MEMORY_FILE, CHAT_MEMORY_FILE, VISION_MEMORY_FILE, VISION_SEGMENTS_DIR
+)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS system_memory (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    type TEXT,
+    sender TEXT,
+    content TEXT,
+    length INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_system_timestamp ON system_memory(timestamp);
+CREATE INDEX IF NOT EXISTS idx_system_type ON system_memory(type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_system_sender ON system_memory(sender, timestamp);
+
+CREATE TABLE IF NOT EXISTS chat_memory (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    action TEXT,
+    text TEXT,
+    length INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_chat_timestamp ON chat_memory(timestamp);
+CREATE INDEX IF NOT EXISTS idx_chat_action ON chat_memory(action, timestamp);
+
+CREATE TABLE IF NOT EXISTS vision_memory (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    screenshot_filename TEXT,
+    interpreted_text TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_vision_timestamp ON vision_memory(timestamp);
+CREATE INDEX IF NOT EXISTS idx_vision_filename ON vision_memory(screenshot_filename, timestamp);
+
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    imported_at TEXT,
+    entries INTEGER
+);
+"""
+
+
+class SQLiteMemoryTable:
+    """Query/append access to one memory table"""
+
+    def __init__(self, store, table, columns, type_column=None):
+        """Bind table name and entry columns"""
+        self.store = store
+        self.table = table
+        self.columns = columns
+        self.type_column = type_column
+
+    def row_to_entry(self, row):
+        """Convert a database row back to the JSON entry layout"""
+        return {column: row[column] for column in self.columns if row[column] is not None}
+
+    def append_many(self, entries):
+        """Insert entries (MemoryWriter target interface)"""
+        placeholders = ", ".join("?" for _ in self.columns)
+        sql = f"INSERT INTO {self.table} ({', '.join(self.columns)}) VALUES ({placeholders})"
+        rows = [tuple(entry.get(column) for column in self.columns) for entry in entries]
+
+        with self.store.lock:
+            self.store.connection.executemany(sql, rows)
+            self.store.connection.commit()
+
+    def append(self, entry):
+        """Insert one entry"""
+        self.append_many([entry])
+
+    def select(self, where="", params=(), limit=None, newest_first=True):
+        """Run a SELECT and return entries in chronological order"""
+        sql = f"SELECT * FROM {self.table}"
+        if where:
+            sql += f" WHERE {where}"
+        sql += " ORDER BY timestamp DESC, id DESC" if newest_first else " ORDER BY timestamp, id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with self.store.lock:
+            rows = self.store.connection.execute(sql, params).fetchall()
+
+        entries = [self.row_to_entry(row) for row in rows]
+        if newest_first:
+            entries.reverse()
+        return entries
+
+    def latest(self, count=1):
+        """Newest N entries"""
+        return self.select(limit=count)
+
+    def query(self, start=None, end=None, entry_type=None, sender=None, limit=None):
+        """Combined filter: time range [start, end), type/action and sender"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start.isoformat() if isinstance(start, datetime) else start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end.isoformat() if isinstance(end, datetime) else end)
+        if entry_type is not None and self.type_column:
+            clauses.append(f"{self.type_column} = ?")
+            params.append(entry_type)
+        if sender is not None and "sender" in self.columns:
+            clauses.append("sender = ?")
+            params.append(sender)
+        return self.select(" AND ".join(clauses), tuple(params), limit)
+
+    def by_time_range(self, start=None, end=None, limit=None):
+        """Entries with start <= timestamp < end (ISO strings or datetimes)"""
+        return self.query(start=start, end=end, limit=limit)
+
+    def by_type(self, value, limit=None):
+        """Entries by type (system) or action (chat)"""
+        if not self.type_column:
+            return []
+        return self.select(f"{self.type_column} = ?", (value,), limit)
+
+    def by_sender(self, sender, limit=None):
+        """Entries by sender (system memory only)"""
+        if "sender" not in self.columns:
+            return []
+        return self.select("sender = ?", (sender,), limit)
+
+    def by_screenshot(self, filename, limit=None):
+        """Entries for a screenshot filename (vision memory only)"""
+        if "screenshot_filename" not in self.columns:
+            return []
+        return self.select("screenshot_filename = ?", (filename,), limit)
+
+    def count(self):
+        """Number of stored entries"""
+        with self.store.lock:
+            return self.store.connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def clear(self):
+        """Delete all entries"""
+        with self.store.lock:
+            self.store.connection.execute(f"DELETE FROM {self.table}")
+            self.store.connection.commit()
+
+
+class SQLiteMemoryStore:
+    """WAL-mode SQLite database holding all three memory kinds"""
+
+    def __init__(self, db_path=SQLITE_MEMORY_FILE):
+        """Open (or create) the memory database"""
+        self.db_path = db_path
+        self.lock = threading.RLock()
+
+        # Shared between the writer thread and readers - guarded by self.lock
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.commit()
+
+        self.system = SQLiteMemoryTable(
+            self, "system_memory",
+            ["timestamp", "type", "sender", "content", "length"], type_column="type"
+        )
+        self.chat = SQLiteMemoryTable(
+            self, "chat_memory",
+            ["timestamp", "action", "text", "length"], type_column="action"
+        )
+        self.vision = SQLiteMemoryTable(
+            self, "vision_memory",
+            ["timestamp", "screenshot_filename", "interpreted_text"]
+        )
+
+    def table(self, kind):
+        """Get table by memory kind: 'system', 'chat' or 'vision'"""
+        return {"system": self.system, "chat": self.chat, "vision": self.vision}[kind]
+
+    def import_json_file(self, kind, path):
+        """Import one *_memory.json file once (tracked in the imports table)"""
+        source = os.path.abspath(path)
+        with self.lock:
+            already = self.connection.execute(
+                "SELECT 1 FROM imports WHERE source = ?", (source,)
+            ).fetchone()
+        journal_path = os.path.splitext(path)[0] + ".jsonl"
+        if already or not (os.path.exists(path) or os.path.exists(journal_path)):
+            return 0
+
+        # Prefer the append-only journal next to the JSON file - it is never stale
+        if os.path.exists(journal_path):
+            paths = [journal_path]
+            if kind == "vision":
+                # Older vision history lives in rolled and archived segments (oldest first)
+                stem = os.path.splitext(os.path.basename(path))[0]
+                paths = segment_files(os.path.join(os.path.dirname(source), VISION_SEGMENTS_DIR), stem + ".") + paths
+            entries = []
+            for segment_path in paths:
+                try:
+                    entries.extend(read_jsonl_file(segment_path))
+                except ARCHIVE_READ_ERRORS as e:
+                    # One corrupt archive must not block importing the rest
+                    print(f"SQLite import skipped {os.path.basename(segment_path)}: {e}")
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('entries', [])
+
+        table = self.table(kind)
+        with self.lock:
+            table.append_many(entries)
+            self.connection.execute(
+                "INSERT INTO imports (source, imported_at, entries) VALUES (?, ?, ?)",
+                (source, datetime.now().isoformat(), len(entries))
+            )
+            self.connection.commit()
+        return len(entries)
+
+    def import_json_files(self, system_path=SYSTEM_MEMORY_FILE, chat_path=CHAT_MEMORY_FILE,
+                          vision_path=VISION_MEMORY_FILE):
+        """One-shot import of all existing JSON memory files"""
+        imported = {}
+        for kind, path in (("system", system_path), ("chat", chat_path), ("vision", vision_path)):
+            try:
+                imported[kind] = self.import_json_file(kind, path)
+            except Exception as e:
+                print(f"SQLite import error for {path}: {e}")
+                imported[kind] = 0
+        return imported
+
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            self.connection.close()
+
+
+if __name__ == "__main__":
+    store = SQLiteMemoryStore()
+    results = store.import_json_files()
+    for kind, count in results.items():
+        print(f"📥 Imported {count} {kind} memory entries")
+    print(f"🗄️ {store.db_path}: system={store.system.count()} "
+          f"chat={store.chat.count()} vision={store.vision.count()}")
+    store.close()
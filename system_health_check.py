@@ -189,6 +189,38 @@ def test_system_capabilities():
     except Exception as e:
         print(f"❌ Clipboard failed: {e}")
 
+def test_memory_journal():
+    """Test journal appends after an unterminated last line (crash or external writer)"""
+    print("\n🔍 Testing Memory Journal...")
+
+    try:
+        import json
+        import tempfile
+        from memory_journal import MemoryJournal
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            snapshot_path = os.path.join(temp_dir, "system_memory.json")
+            journal = MemoryJournal(snapshot_path, 1000, collapse_repeats=True)
+            journal.append({"type": "system", "sender": "System", "content": "first"})
+            with open(journal.journal_path, 'ab') as f:
+                f.write(b'{"type": "system", "sender": "System", "content": "second"}')
+
+            # Reopen and append a repeat of the unterminated line
+            journal = MemoryJournal(snapshot_path, 1000, collapse_repeats=True)
+            journal.append({"type": "system", "sender": "System", "content": "second"})
+            with open(journal.journal_path, 'rb') as f:
+                lines = [json.loads(line) for line in f.read().splitlines() if line.strip()]
+
+        if [(entry["content"], entry.get("count", 1)) for entry in lines] == [("first", 1), ("second", 2)]:
+            print("✅ Memory journal: unterminated last line repaired")
+            return True
+        print(f"❌ Memory journal: unexpected lines {lines}")
+        return False
+
+    except Exception as e:
+        print(f"❌ Memory journal failed: {e}")
+        return False
+
 def main():
     """Run complete health check"""
     print("🚀 RDC Visual STT System Health Check")
@@ -202,13 +234,14 @@ def main():
     test_optional_imports()
     files_ok = test_file_structure()
     modules_ok = test_main_module()
+    journal_ok = test_memory_journal()
     test_system_capabilities()
     
     print("\n" + "=" * 50)
     print("📋 HEALTH CHECK SUMMARY:")
     print("=" * 50)
     
-    if core_ok and files_ok and modules_ok:
+    if core_ok and files_ok and modules_ok and journal_ok:
         print("✅ SYSTEM STATUS: HEALTHY")
         print("🎯 All critical components working")
         print("🚀 Ready for production use!")
@@ -221,6 +254,8 @@ def main():
             print("🔧 Fix: Restore missing files")
         if not modules_ok:
             print("🔧 Fix: Check module syntax errors")
+        if not journal_ok:
+            print("🔧 Fix: Check memory_journal.py line handling")
         return 1
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+"""
+Vision Frame - Captured Pixels to Request Payload in Memory
+===========================================================
+
+A VisionFrame carries one captured image from the capture code straight
+to the vision model request:
+- The PIL image stays in memory; nothing is written and read back
+- The encoded payload (image bytes + base64) is produced lazily, once,
+  the first time something needs it - the request, or the disk save
+- The encoding follows the frame's ImageEncoder (per vision mode, see
+  image_encoder.py)
+- Frames built from a file (send_file) reuse the file's bytes as they are,
+  without decoding and re-encoding the image - unless the file is larger
+  than VISION_REENCODE_MIN_BYTES, then it is re-encoded with the encoder
+
+Writing screenshots to disk is a side effect handled by FrameSaver on its
+own thread (SCREENSHOT_SAVE_TO_DISK turns it off entirely); the analysis
+never waits for it.
+"""
+
+import base64
+import os
+import queue
+import threading
+from datetime import datetime
+from io import BytesIO
+from PIL import Image
+from image_encoder import ImageEncoder
+from config import SCREENSHOT_SAVE_TO_DISK, SCREENSHOT_SAVE_QUEUE_SIZE, VISION_REENCODE_MIN_BYTES
+
+
+class VisionFrame:
+    """One captured image plus its lazily encoded request payload"""
+
+    def __init__(self, image=None, name="frame.png", encoded=None, encoder=None):
+        """Wrap a PIL image (or already-encoded image bytes); encoder defaults to plain PNG"""
+        self.image = image
+        self.name = name
+        self.source_path = None
+        self.timestamp = datetime.now().isoformat()
+        self.encoder = encoder or ImageEncoder()
+        self.encoded = encoded
+        self.base64_payload = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path, encoder=None):
+        """Frame whose payload is the file's own bytes (read on first use)"""
+        frame = cls(name=os.path.basename(path), encoder=encoder)
+        frame.source_path = path
+        return frame
+
+    @property
+    def size(self):
+        """(width, height) of the image, if it is in memory"""
+        return self.image.size if self.image is not None else None
+
+    def encoded_bytes(self):
+        """Encoded image bytes - encoded (or read) once, then cached"""
+        with self.lock:
+            if self.encoded is None:
+                if self.image is None:
+                    with open(self.source_path, "rb") as image_file:
+                        self.encoded = image_file.read()
+                    if len(self.encoded) >= VISION_REENCODE_MIN_BYTES:
+                        # Big file (e.g. a 4K PNG) - re-encoding is cheaper than sending it
+                        reencoded = self.encoder.encode(Image.open(BytesIO(self.encoded)))
+                        if len(reencoded) < len(self.encoded):
+                            self.encoded = reencoded
+                else:
+                    self.encoded = self.encoder.encode(self.image)
+            return self.encoded
+
+    def payload(self):
+        """Base64 string for the Ollama "images" field"""
+        if self.base64_payload is None:
+            self.base64_payload = base64.b64encode(self.encoded_bytes()).decode('utf-8')
+        return self.base64_payload
+
+    def save(self, path):
+        """Write the encoded bytes to path (atomic replace)"""
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.encoded_bytes())
+        os.replace(temp_path, path)
+
+
+class FrameSaver:
+    """Background thread that writes frames to disk off the capture/analysis path"""
+
+    def __init__(self, enabled=SCREENSHOT_SAVE_TO_DISK, capacity=SCREENSHOT_SAVE_QUEUE_SIZE, after_save=None):
+        """Start the saver thread; after_save() runs after each write (e.g. rotation cleanup)"""
+        self.enabled = enabled
+        self.after_save = after_save
+        self.queue = queue.Queue(maxsize=max(1, capacity))
+        self.skipped_saves = 0
+        self.thread = None
+        if enabled:
+            self.thread = threading.Thread(target=self.save_loop, name="FrameSaver", daemon=True)
+            self.thread.start()
+
+    def save(self, frame, path):
+        """Queue a frame for writing; skipped (and counted) when the disk falls behind"""
+        if not self.enabled:
+            return False
+        try:
+            self.queue.put_nowait((frame, path))
+            return True
+        except queue.Full:
+            self.skipped_saves += 1
+            return False
+
+    def save_loop(self):
+        """Write queued frames until stopped"""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            frame, path = item
+            try:
+                frame.save(path)
+                if self.after_save:
+                    self.after_save()
+            except Exception as e:
+                print(f"Screenshot save error ({path}): {e}")
+
+    def stop(self, timeout=5.0):
+        """Finish queued writes and stop the thread"""
+        if not self.thread:
+            return
+        self.queue.put(None)
+        self.thread.join(timeout)
@@ -0,0 +1,537 @@
+"""
+Vision Store - Incremental Vision Memory
+========================================
+
+Append-only store for screenshot interpretations:
+- Each result is appended as one JSONL line (constant time per screenshot)
+- The newest entry is kept in memory - no file read to get it
+- VisionContextCache holds the latest interpretation per screenshot file
+  and is invalidated by mtime/size when another process writes the journal
+- Full active journals roll into dated files under vision_segments/; a
+  background compactor merges them and prunes by entry count, age and size
+- Segments older than VISION_ARCHIVE_AFTER_DAYS are compressed (gzip/lzma/
+  zstd) into the archive tier and decompressed only when a read reaches them
+- Existing vision_memory.json files are migrated on first open
+- Lock order is segments_lock -> store lock -> cache lock; the cache
+  reloads (e.g. after a segment roll) without holding its own lock
+- A classic {"entries": [...]} snapshot is written on shutdown for
+  external tools; VisualLogWindow reads the journal directly
+
+This replaces loading and rewriting the whole vision log per screenshot.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from memory_journal import (
+    MemoryJournal, ARCHIVE_EXTENSIONS, ARCHIVE_READ_ERRORS, archive_codec, resolve_archive_codec,
+    count_jsonl_lines, open_jsonl, read_jsonl_file, read_jsonl_tail, write_jsonl_file
+)
+from memory_serializer import serializer
+from config import (
+    VISION_SEGMENTS_DIR, VISION_SEGMENT_MAX_ENTRIES, VISION_SEGMENT_MAX_BYTES,
+    VISION_MERGED_SEGMENT_MAX_BYTES, VISION_RETENTION_MAX_ENTRIES,
+    VISION_RETENTION_MAX_AGE_DAYS, VISION_RETENTION_MAX_BYTES, VISION_COMPACT_INTERVAL,
+    VISION_ARCHIVE_AFTER_DAYS, VISION_ARCHIVE_COMPRESSION
+)
+
+
+def segment_files(segments_dir, prefix):
+    """Rolled segment files (plain and archived) whose names start with prefix, oldest first"""
+    extensions = (".jsonl",) + tuple(".jsonl" + ext for ext in ARCHIVE_EXTENSIONS.values())
+    try:
+        names = [name for name in os.listdir(segments_dir)
+                 if name.startswith(prefix) and name.endswith(extensions)]
+    except OSError:
+        return []
+    return [os.path.join(segments_dir, name) for name in sorted(names)]
+
+
+class VisionContextCache:
+    """Latest interpretations by screenshot filename, shared by all readers
+
+    Lock order: writers hold the store's lock and then take the cache lock
+    (update/rotated/clear), so the cache never reads the store - which takes
+    the store and segment locks - while holding its own lock.
+    """
+
+    def __init__(self, store, max_files=256):
+        """Build the cache from the store's journal"""
+        self.store = store
+        self.max_files = max_files
+        self.lock = threading.RLock()
+        self.latest = None
+        self.by_filename = OrderedDict()
+        self.file_signature = None
+        self.file_offset = 0
+        self.generation = 0  # bumped by every writer-side change
+        self.reload()
+
+    def current_signature(self):
+        """(mtime, size) of the journal file, None if missing"""
+        try:
+            stat = os.stat(self.store.journal_path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def remember(self, entry):
+        """Record one entry as the newest interpretation"""
+        filename = entry.get('screenshot_filename')
+        if filename:
+            self.by_filename.pop(filename, None)
+            self.by_filename[filename] = entry
+            while len(self.by_filename) > self.max_files:
+                self.by_filename.popitem(last=False)
+        self.latest = entry
+
+    def update(self, entries):
+        """Called by the vision logger right after its own append"""
+        with self.lock:
+            self.generation += 1
+            for entry in entries:
+                self.remember(entry)
+            # Our own write - adopt the new signature without re-reading
+            self.file_signature = self.current_signature()
+            self.file_offset = self.file_signature[1] if self.file_signature else 0
+
+    def reload(self):
+        """Rebuild the cache from the active journal (topped up from the newest segment)"""
+        with self.lock:
+            generation = self.generation
+        # Read outside the cache lock - read_recent takes the store and segment locks
+        signature = self.current_signature()
+        entries = self.store.read_recent(VISION_SEGMENT_MAX_ENTRIES)
+        with self.lock:
+            if self.generation != generation:
+                # A writer changed the journal meanwhile - the next refresh re-checks
+                return
+            self.latest = None
+            self.by_filename.clear()
+            for entry in entries:
+                self.remember(entry)
+            self.file_signature = signature
+            self.file_offset = signature[1] if signature else 0
+
+    def rotated(self):
+        """Active journal was rolled into a segment - keep entries, reset offsets"""
+        with self.lock:
+            self.generation += 1
+            self.file_signature = self.current_signature()
+            self.file_offset = 0
+
+    def refresh_if_changed(self):
+        """Pick up writes made by another process (mtime/size changed)"""
+        with self.lock:
+            signature = self.current_signature()
+            if signature == self.file_signature:
+                return
+
+            if signature and signature[1] > self.file_offset:
+                # File grew - parse only the appended lines
+                with open(self.store.journal_path, 'rb') as f:
+                    f.seek(self.file_offset)
+                    appended = f.read()
+                complete = appended[:appended.rfind(b'\n') + 1]
+                for line in complete.splitlines():
+                    if line.strip():
+                        try:
+                            self.remember(serializer.loads(line))
+                        except ValueError:
+                            continue
+                self.file_offset += len(complete)
+                self.file_signature = signature
+                return
+        # Truncated, rewritten or removed - start over (outside the cache lock)
+        self.reload()
+
+    def get_latest(self):
+        """Newest vision entry (None if the log is empty)"""
+        self.refresh_if_changed()
+        return self.latest
+
+    def get_for_screenshot(self, filename):
+        """Newest entry for a screenshot file (None if never analyzed)"""
+        self.refresh_if_changed()
+        return self.by_filename.get(filename)
+
+    def clear(self):
+        """Forget everything (journal was cleared)"""
+        with self.lock:
+            self.generation += 1
+            self.latest = None
+            self.by_filename.clear()
+            self.file_signature = self.current_signature()
+            self.file_offset = self.file_signature[1] if self.file_signature else 0
+
+
+class VisionMemoryStore(MemoryJournal):
+    """Vision memory journal with dated segments and the latest entry cached in RAM"""
+
+    def __init__(self, snapshot_path):
+        """Open the vision journal next to vision_memory.json"""
+        self.latest_entry = None
+        self.segments_dir = os.path.join(os.path.dirname(snapshot_path), VISION_SEGMENTS_DIR)
+        self.segment_prefix = os.path.splitext(os.path.basename(snapshot_path))[0] + "."
+        self.segments_lock = threading.RLock()
+        self.archive_compression = resolve_archive_codec(VISION_ARCHIVE_COMPRESSION)
+        # Decompressed archive segments, newest reads last (path -> (mtime, entries))
+        self.archive_cache = OrderedDict()
+        self.archive_cache_size = 4
+        # Line counts of rolled segments (path -> (size, mtime, count)) - paging skips whole segments
+        self.segment_counts = {}
+        super().__init__(snapshot_path, max_entries=None)
+
+        self.journal_bytes = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+        segments = self.list_segments()
+        if segments and self.snapshot_older_than(segments[-1]):
+            # No clean shutdown since the last roll - the header undercounts rolled entries
+            rolled = sum(self.segment_entry_count(path) for path in segments)
+            self.dropped_entries = max(self.dropped_entries, rolled)
+
+        self.latest_entry = self.read_last_entry(self.journal_path)
+        if self.latest_entry is None:
+            if segments and archive_codec(segments[-1]):
+                # Compressed segment - no seeking, decompress it once
+                entries = self.read_segment(segments[-1])
+                self.latest_entry = entries[-1] if entries else None
+            elif segments:
+                self.latest_entry = self.read_last_entry(segments[-1])
+        self.context_cache = VisionContextCache(self)
+
+    def snapshot_older_than(self, path):
+        """Was the snapshot (and its total_entries header) written before path?"""
+        try:
+            return os.path.getmtime(self.snapshot_path) < os.path.getmtime(path)
+        except OSError:
+            return True
+
+    def read_last_entry(self, path):
+        """Read only the final line of a journal file by seeking back from the end"""
+        try:
+            if not os.path.exists(path):
+                return None
+
+            with open(path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                position = f.tell()
+                buffer = b''
+
+                # Walk backwards in small blocks until a full line is found
+                while position > 0:
+                    block = min(4096, position)
+                    position -= block
+                    f.seek(position)
+                    buffer = f.read(block) + buffer
+                    lines = buffer.rstrip(b'\n').split(b'\n')
+                    if len(lines) > 1 or position == 0:
+                        last_line = lines[-1].strip()
+                        return serializer.loads(last_line) if last_line else None
+
+        except Exception as e:
+            print(f"Vision store tail read error: {e}")
+        return None
+
+    def append_many(self, entries):
+        """Append entries, remember the newest one and roll full segments"""
+        with self.lock:
+            super().append_many(entries)
+            if not entries:
+                return
+            self.latest_entry = entries[-1]
+            self.context_cache.update(entries)
+
+            self.journal_bytes = os.path.getsize(self.journal_path)
+            if (self.journal_entries >= VISION_SEGMENT_MAX_ENTRIES
+                    or self.journal_bytes >= VISION_SEGMENT_MAX_BYTES):
+                self.rotate_segment()
+
+    def rotate_segment(self):
+        """Move the active journal into a dated segment file (a single rename)"""
+        with self.lock:
+            if not self.journal_entries:
+                return
+            os.makedirs(self.segments_dir, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            segment_path = os.path.join(self.segments_dir, f"{self.segment_prefix}{stamp}.jsonl")
+
+            # Readers may see the empty journal before rotated() below; their cache
+            # reload then waits on this lock instead of holding the cache lock
+            os.replace(self.journal_path, segment_path)
+            open(self.journal_path, 'w', encoding='utf-8').close()
+
+            # Rolled entries count as "not in the active journal" for total_entries
+            self.dropped_entries += self.journal_entries
+            self.journal_entries = 0
+            self.journal_bytes = 0
+            self.context_cache.rotated()
+
+    def list_segments(self):
+        """Segment files (plain and archived), oldest first"""
+        return segment_files(self.segments_dir, self.segment_prefix)
+
+    def segment_time(self, path):
+        """Rotation time encoded in a segment filename"""
+        stamp = os.path.basename(path)[len(self.segment_prefix):].split(".jsonl")[0]
+        try:
+            return datetime.strptime(stamp, "%Y%m%d-%H%M%S-%f")
+        except ValueError:
+            return datetime.fromtimestamp(os.path.getmtime(path))
+
+    def read_segment(self, path):
+        """Read one segment (empty if the compactor removed it meanwhile)"""
+        try:
+            if not archive_codec(path):
+                return read_jsonl_file(path)
+
+            # Archived segments never change in place - reuse the decompressed copy
+            mtime = os.stat(path).st_mtime_ns
+            cached = self.archive_cache.get(path)
+            if cached and cached[0] == mtime:
+                self.archive_cache.move_to_end(path)
+                return list(cached[1])
+
+            entries = read_jsonl_file(path)
+            self.archive_cache[path] = (mtime, entries)
+            while len(self.archive_cache) > self.archive_cache_size:
+                self.archive_cache.popitem(last=False)
+            return list(entries)
+        except ARCHIVE_READ_ERRORS as e:
+            if os.path.exists(path):
+                print(f"Vision segment read error ({os.path.basename(path)}): {e}")
+            return []
+
+    def segment_entry_count(self, path):
+        """Entries in one segment, counted once per file version"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.segment_counts.pop(path, None)
+            return 0
+        cached = self.segment_counts.get(path)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        count = len(self.read_segment(path)) if archive_codec(path) else count_jsonl_lines(path)
+        self.segment_counts[path] = (stat.st_size, stat.st_mtime_ns, count)
+        return count
+
+    def read_recent(self, count, skip=0):
+        """Newest count entries before the newest skip ones (oldest first)
+
+        Walks the active journal, then segments newest first, reading plain
+        files backwards from the end - cost depends on count + skip only.
+        """
+        entries = self.read_tail(count, skip)
+        if len(entries) >= count:
+            return entries
+        skip = 0 if entries else max(0, skip - self.journal_entries)
+
+        with self.segments_lock:
+            for path in reversed(self.list_segments()):
+                needed = count - len(entries)
+                if archive_codec(path):
+                    segment = self.read_segment(path)  # decompressed once, then cached
+                    end = len(segment) - skip
+                    chunk = segment[max(0, end - needed):max(0, end)]
+                    size = len(segment)
+                else:
+                    chunk = read_jsonl_tail(path, needed, skip)
+                    size = None if chunk else self.segment_entry_count(path)
+
+                entries = chunk + entries
+                if len(entries) >= count:
+                    break
+                skip = 0 if chunk else max(0, skip - size)
+        return entries
+
+    def read_all_entries(self):
+        """Every retained entry across segments and the active journal"""
+        entries = []
+        with self.segments_lock:
+            for path in self.list_segments():
+                entries.extend(self.read_segment(path))
+        return entries + self.read_entries()
+
+    def oldest_timestamp(self):
+        """Timestamp of the oldest retained entry (None if the store is empty)"""
+        with self.segments_lock:
+            for path in self.list_segments() + [self.journal_path]:
+                try:
+                    # First line only - archives are decompressed just that far
+                    with open_jsonl(path, 'rb') as f:
+                        for line in f:
+                            if line.strip():
+                                return serializer.loads(line).get('timestamp', '')
+                except ARCHIVE_READ_ERRORS + (ValueError,):
+                    continue
+        return None
+
+    def clear(self):
+        """Remove all vision entries, including rolled segments"""
+        # Lock order is segments_lock, then lock - the same as the compactor's
+        with self.segments_lock:
+            with self.lock:
+                for path in self.list_segments():
+                    os.remove(path)
+                self.archive_cache.clear()
+                self.segment_counts.clear()
+                super().clear()
+                self.journal_bytes = 0
+                self.latest_entry = None
+                self.context_cache.clear()
+
+    # ===== RETENTION & COMPACTION (background thread only) =====
+
+    def compact_segments(self):
+        """Apply age/count/size retention, merge small segments, archive old ones
+
+        Returns True if retention removed any entries.
+        """
+        with self.segments_lock:
+            pruned = self.prune_by_age()
+            pruned = self.prune_by_size() or pruned
+            self.merge_segments()
+            self.archive_segments()
+            return pruned
+
+    def prune_by_age(self):
+        """Drop entries older than VISION_RETENTION_MAX_AGE_DAYS (True if any were dropped)"""
+        if not VISION_RETENTION_MAX_AGE_DAYS:
+            return False
+        pruned = False
+        cutoff = datetime.now() - timedelta(days=VISION_RETENTION_MAX_AGE_DAYS)
+        cutoff_iso = cutoff.isoformat()
+
+        for path in self.list_segments():
+            if self.segment_time(path) < cutoff:
+                # Rolled before the cutoff - every entry inside is older
+                os.remove(path)
+                pruned = True
+                continue
+
+            entries = self.read_segment(path)
+            keep = [entry for entry in entries if entry.get('timestamp', '') >= cutoff_iso]
+            if len(keep) < len(entries):
+                write_jsonl_file(path, keep)
+                pruned = True
+            # Segments are ordered - once one is fully inside the window, the rest are too
+            break
+        return pruned
+
+    def prune_by_size(self):
+        """Keep the newest entries within the count and byte limits (True if any were dropped)"""
+        with self.lock:
+            # Counters and segment list in one consistent view - the writer thread
+            # updates the counters and rolls the journal into a segment under this lock
+            kept_entries = self.journal_entries
+            kept_bytes = self.journal_bytes
+            segments = self.list_segments()
+        for index in range(len(segments) - 1, -1, -1):
+            path = segments[index]
+            entry_count = self.segment_entry_count(path)  # a corrupt archive counts as empty
+            size = os.path.getsize(path)
+
+            if (kept_entries + entry_count <= VISION_RETENTION_MAX_ENTRIES
+                    and kept_bytes + size <= VISION_RETENTION_MAX_BYTES):
+                kept_entries += entry_count
+                kept_bytes += size
+                continue
+
+            # Boundary segment: keep only the newest entries that still fit
+            entries = self.read_segment(path)
+            keep = []
+            for entry in reversed(entries):
+                entry_bytes = len(serializer.dumps(entry)) + 1
+                if (kept_entries + 1 > VISION_RETENTION_MAX_ENTRIES
+                        or kept_bytes + entry_bytes > VISION_RETENTION_MAX_BYTES):
+                    break
+                keep.append(entry)
+                kept_entries += 1
+                kept_bytes += entry_bytes
+            if keep:
+                write_jsonl_file(path, list(reversed(keep)))
+            else:
+                os.remove(path)
+
+            # Everything older is outside the retention window
+            for older in segments[:index]:
+                os.remove(older)
+            return True
+        return False
+
+    def merge_segments(self):
+        """Merge consecutive same-day segments up to VISION_MERGED_SEGMENT_MAX_BYTES"""
+        group, group_bytes = [], 0
+        for path in self.list_segments() + [None]:
+            if path is not None:
+                size = os.path.getsize(path)
+                same_day = (group
+                            and self.segment_time(group[0]).date() == self.segment_time(path).date()
+                            and archive_codec(group[0]) == archive_codec(path))
+                if (not group or same_day) and group_bytes + size <= VISION_MERGED_SEGMENT_MAX_BYTES:
+                    group.append(path)
+                    group_bytes += size
+                    continue
+
+            if len(group) > 1:
+                # Merged file takes the newest name so ordering is preserved
+                merged = []
+                for member in group:
+                    merged.extend(self.read_segment(member))
+                write_jsonl_file(group[-1], merged)
+                for member in group[:-1]:
+                    os.remove(member)
+
+            if path is not None:
+                group, group_bytes = [path], os.path.getsize(path)
+
+    def archive_segments(self):
+        """Compress plain segments older than VISION_ARCHIVE_AFTER_DAYS"""
+        if not self.archive_compression or VISION_ARCHIVE_AFTER_DAYS is None:
+            return
+        cutoff = datetime.now() - timedelta(days=VISION_ARCHIVE_AFTER_DAYS)
+        extension = ARCHIVE_EXTENSIONS[self.archive_compression]
+
+        for path in self.list_segments():
+            if self.segment_time(path) >= cutoff:
+                # Segments are ordered - the rest are newer still
+                break
+            if archive_codec(path):
+                continue
+
+            archive_path = path + extension
+            write_jsonl_file(archive_path, read_jsonl_file(path))
+            os.remove(path)
+            print(f"🗜️ Archived {os.path.basename(path)} ({self.archive_compression})")
+
+
+class VisionSegmentCompactor:
+    """Background thread that periodically applies vision retention"""
+
+    def __init__(self, store, interval=VISION_COMPACT_INTERVAL, after_prune=None):
+        """Start compacting the store's segments every interval seconds
+
+        after_prune is called once a pass has removed entries (e.g. to prune
+        the search index to what the store still holds).
+        """
+        self.store = store
+        self.interval = interval
+        self.after_prune = after_prune
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.compact_loop, name="VisionCompactor", daemon=True)
+        self.thread.start()
+
+    def compact_loop(self):
+        """Run a compaction pass every interval until stopped"""
+        while not self.stop_event.wait(self.interval):
+            try:
+                if self.store.compact_segments() and self.after_prune:
+                    self.after_prune()
+            except Exception as e:
+                print(f"Vision compaction error: {e}")
+
+    def stop(self):
+        """Stop the compactor thread"""
+        self.stop_event.set()
+        self.thread.join(timeout=5.0)
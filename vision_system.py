@@ -14,13 +14,15 @@ This replaces the scattered vision code from the monolith.
 import os
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk, ImageGrab
+from PIL import Image, ImageTk
 from datetime import datetime
 import requests
 import json
 import base64
-from io import BytesIO
 from memory_manager import MemoryManager
+from image_encoder import get_encoder
+from capture_engine import get_capture_engine
+from interpretation_cache import InterpretationCache, fingerprint
 from config import (
     OLLAMA_BASE_URL, VISION_MODEL_NAME, SCREENSHOTS_DIR,
     VISION_SYSTEM_MESSAGE, REQUEST_TIMEOUT
@@ -34,6 +36,7 @@ class VisionSystem:
         """Initialize vision system"""
         self.memory_manager = memory_manager
         self.last_screenshot_path = None
+        self.interpretation_cache = InterpretationCache()
         
         # Ensure screenshots directory exists
         self.ensure_screenshots_dir()
@@ -52,8 +55,8 @@ class VisionSystem:
     def take_screenshot(self, save_file=True):
         """Capture full screen screenshot"""
         try:
-            # Capture the screen
-            screenshot = ImageGrab.grab()
+            # Capture the primary screen through the shared capture engine
+            screenshot, _ = get_capture_engine().grab(1)
             
             if save_file:
                 # Generate filename with timestamp
@@ -84,17 +87,11 @@ class VisionSystem:
     def image_to_base64(self, image):
         """Convert PIL image to base64 for Ollama"""
         try:
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-                
-            # Save to bytes buffer
-            buffer = BytesIO()
-            image.save(buffer, format='PNG')
-            buffer.seek(0)
+            # Format/quality from the "default" encoder policy (config.VISION_ENCODER_POLICIES)
+            encoded = get_encoder("default").encode(image)
             
             # Encode to base64
-            image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+            image_base64 = base64.b64encode(encoded).decode('utf-8')
             return image_base64
             
         except Exception as e:
@@ -106,13 +103,20 @@ class VisionSystem:
     def analyze_screenshot_with_ollama(self, image, custom_prompt=None):
         """Send screenshot to Ollama for AI analysis"""
         try:
+            # Prepare the prompt
+            prompt = custom_prompt if custom_prompt else VISION_SYSTEM_MESSAGE
+            
+            # Near-identical screen analyzed before - reuse the interpretation
+            frame_print = fingerprint(image)
+            cached = self.interpretation_cache.lookup(frame_print, (VISION_MODEL_NAME, prompt))
+            if cached:
+                print(f"♻️ Reusing cached interpretation for a near-identical screen")
+                return cached
+            
             # Convert image to base64
             image_base64 = self.image_to_base64(image)
             if not image_base64:
                 return None
-                
-            # Prepare the prompt
-            prompt = custom_prompt if custom_prompt else VISION_SYSTEM_MESSAGE
             
             # Prepare request data
             request_data = {
@@ -135,6 +139,7 @@ class VisionSystem:
             if response.status_code == 200:
                 result = response.json()
                 interpretation = result.get('response', 'No response received')
+                self.interpretation_cache.store(frame_print, interpretation, (VISION_MODEL_NAME, prompt))
                 
                 print(f"✅ Vision analysis completed")
                 print(f"📝 Analysis: {interpretation[:100]}...")
@@ -274,7 +279,8 @@ class VisionSystem:
                 "screenshot_count": screenshot_count,
                 "last_screenshot": self.last_screenshot_path,
                 "vision_model": VISION_MODEL_NAME,
-                "ollama_url": OLLAMA_BASE_URL
+                "ollama_url": OLLAMA_BASE_URL,
+                "interpretation_cache": self.interpretation_cache.stats()
             }
             
         except Exception as e:
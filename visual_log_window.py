@@ -5,21 +5,40 @@ This provides a basic visual log window for the speech-to-text system.
 
 import tkinter as tk
 from tkinter import ttk
-import json
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from vision_store import VisionMemoryStore
+from memory_search import MemorySearchIndex
+from file_watcher import get_file_watcher
 
 
 class VisualLogWindow:
     """Simple visual log window to display vision log entries"""
     
-    def __init__(self, parent, log_file_path):
+    # Search time filter choices -> how far back to look (None = any time)
+    SEARCH_RANGES = {
+        "Any time": None,
+        "Last hour": timedelta(hours=1),
+        "Last 24 hours": timedelta(days=1),
+        "Last 7 days": timedelta(days=7),
+        "Last 30 days": timedelta(days=30),
+    }
+    
+    def __init__(self, parent, log_file_path, vision_store=None, search_index=None):
         """Initialize the visual log window"""
         self.parent = parent
         self.log_file_path = log_file_path
+        # Share the app's vision store when given so clears stay in sync
+        self.vision_store = vision_store or VisionMemoryStore(log_file_path)
+        # Share the app's full-text index (vision + chat); fall back to vision only
+        self.search_index = search_index or MemorySearchIndex({"vision": self.vision_store.read_all_entries})
+        self.search_active = False
+        self.shown_entries = 0  # entries on screen - older pages start after these
         self.window = None
         self.auto_refresh_enabled = tk.BooleanVar(value=False)
-        self.auto_refresh_timer = None
+        self.file_watcher = None  # subscribed while live updates are on
+        self.pending_log_event = None  # newest file event not yet shown
         self.total_entries = 0
         
     def show_window(self):
@@ -54,6 +73,29 @@ class VisualLogWindow:
                                font=("Arial", 12, "bold"))
         title_label.pack(pady=(0, 10))
         
+        # Search bar - full-text search over vision and chat memory
+        search_frame = ttk.Frame(main_frame)
+        search_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(search_frame, text="🔍 Search:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        self.search_entry.pack(side=tk.LEFT, padx=(5, 5), fill=tk.X, expand=True)
+        self.search_entry.bind("<Return>", lambda event: self.run_search())
+        self.search_entry.bind("<Escape>", lambda event: self.clear_search())
+        
+        self.search_range_var = tk.StringVar(value="Any time")
+        search_range = ttk.Combobox(search_frame, textvariable=self.search_range_var,
+                                    values=list(self.SEARCH_RANGES), state="readonly", width=13)
+        search_range.pack(side=tk.LEFT, padx=(0, 5))
+        search_range.bind("<<ComboboxSelected>>", lambda event: self.run_search())
+        
+        search_btn = ttk.Button(search_frame, text="Find", command=self.run_search)
+        search_btn.pack(side=tk.LEFT, padx=(0, 5))
+        
+        clear_search_btn = ttk.Button(search_frame, text="✖", width=3, command=self.clear_search)
+        clear_search_btn.pack(side=tk.LEFT)
+        
         # Log display area
         log_frame = ttk.Frame(main_frame)
         log_frame.pack(fill=tk.BOTH, expand=True)
@@ -92,12 +134,16 @@ class VisualLogWindow:
                                 command=self.refresh_log_display)
         refresh_btn.pack(side="left", padx=(0, 10))
         
-        # Auto-refresh checkbox
-        self.auto_refresh_check = ttk.Checkbutton(button_frame, text="⚡ Auto-Refresh (3s)", 
+        # Live updates - redraw only when the vision journal actually changes
+        self.auto_refresh_check = ttk.Checkbutton(button_frame, text="⚡ Live Updates", 
                                                  variable=self.auto_refresh_enabled,
                                                  command=self.toggle_auto_refresh)
         self.auto_refresh_check.pack(side="left", padx=(0, 10))
         
+        older_btn = ttk.Button(button_frame, text="📜 Load Older",
+                               command=self.load_older_entries)
+        older_btn.pack(side="left", padx=(0, 10))
+        
         clear_btn = ttk.Button(button_frame, text="🗑️ Clear Log", 
                               command=self.clear_log)
         clear_btn.pack(side="left", padx=(0, 10))
@@ -147,19 +193,17 @@ class VisualLogWindow:
         try:
             self.log_text.delete(1.0, tk.END)
             
-            if not os.path.exists(self.log_file_path):
+            if not os.path.exists(self.vision_store.journal_path) and not os.path.exists(self.log_file_path):
                 self.log_text.insert(tk.END, "No visual log file found.\n")
                 self.log_text.insert(tk.END, f"Expected path: {self.log_file_path}\n")
                 self.status_label.config(text="No log file", foreground="orange")
                 self.entry_count_label.config(text="0 entries")
                 return
             
-            # Load and display log entries
-            with open(self.log_file_path, 'r', encoding='utf-8') as f:
-                log_data = json.load(f)
-            
-            entries = log_data.get('entries', [])
-            self.total_entries = len(entries)
+            # Load only the newest entries - active journal plus recent segments, read
+            # backwards from the end; the total comes from the store's running counter
+            entries = self.vision_store.read_recent(50)
+            self.total_entries = self.vision_store.total_entries
             
             if not entries:
                 self.log_text.insert(tk.END, "No log entries found.\n")
@@ -171,18 +215,10 @@ class VisualLogWindow:
             self.entry_count_label.config(text=f"{self.total_entries} entries")
             
             # Display entries (most recent first)
-            entries_to_show = min(len(entries), 50)
-            for i, entry in enumerate(reversed(entries[-50:])):  # Show last 50 entries
-                timestamp = entry.get('timestamp', 'Unknown time')
-                interpretation = entry.get('interpreted_text', entry.get('interpretation', 'No interpretation'))
-                screenshot_file = entry.get('screenshot_filename', entry.get('screenshot_file', 'No file'))
-                
-                self.log_text.insert(tk.END, f"=== Entry {len(entries) - i} ===\n")
-                self.log_text.insert(tk.END, f"📅 Time: {timestamp}\n")
-                self.log_text.insert(tk.END, f"📸 File: {screenshot_file}\n")
-                self.log_text.insert(tk.END, f"🔍 Interpretation:\n{interpretation}\n\n")
+            self.shown_entries = 0
+            self.insert_entries(entries)
             
-            self.status_label.config(text=f"Showing {entries_to_show} of {self.total_entries} entries", 
+            self.status_label.config(text=f"Showing {self.shown_entries} of {self.total_entries} entries", 
                                    foreground="green")
             
             # Auto-scroll to top (most recent)
@@ -198,14 +234,116 @@ class VisualLogWindow:
             self.status_label.config(text="Error loading", foreground="red")
             self.entry_count_label.config(text="0 entries")
     
+    def format_entry(self, entry, number):
+        """Display text for one vision entry"""
+        timestamp = entry.get('timestamp', 'Unknown time')
+        interpretation = entry.get('interpreted_text', entry.get('interpretation', 'No interpretation'))
+        screenshot_file = entry.get('screenshot_filename', entry.get('screenshot_file', 'No file'))
+        crop = entry.get('crop')
+        if crop:
+            screenshot_file += f" (changed region{'s' if len(crop['regions']) > 1 else ''}: " + \
+                ", ".join(f"{r - l}x{b - t} at {l},{t}" for l, t, r, b in crop['regions']) + ")"
+        return (f"=== Entry {number} ===\n"
+                f"📅 Time: {timestamp}\n"
+                f"📸 File: {screenshot_file}\n"
+                f"🔍 Interpretation:\n{interpretation}\n\n")
+    
+    def insert_entries(self, entries):
+        """Append entries (oldest first) to the display, newest at the top"""
+        for entry in reversed(entries):
+            self.log_text.insert(tk.END, self.format_entry(entry, self.total_entries - self.shown_entries))
+            self.shown_entries += 1
+    
+    def show_new_entries(self):
+        """Prepend only the entries appended since the last update"""
+        total = self.vision_store.total_entries
+        added = total - self.total_entries
+        if added <= 0 or added > 50 or not self.shown_entries:
+            # Written through another store (or a big jump) - redraw from the journal
+            self.refresh_log_display()
+            return
+        
+        entries = self.vision_store.read_recent(added)
+        text = "".join(self.format_entry(entry, self.total_entries + offset)
+                       for offset, entry in reversed(list(enumerate(entries, 1))))
+        self.log_text.insert("1.0", text)
+        self.total_entries = total
+        self.shown_entries += len(entries)
+        self.entry_count_label.config(text=f"{self.total_entries} entries")
+        self.status_label.config(text=f"Showing {self.shown_entries} of {self.total_entries} entries "
+                                      f"(+{len(entries)} new)", foreground="green")
+    
+    def load_older_entries(self):
+        """Page in the next 50 older entries below the ones already shown"""
+        try:
+            if self.search_active:
+                self.clear_search()
+            
+            older = self.vision_store.read_recent(50, skip=self.shown_entries)
+            if not older:
+                self.status_label.config(text=f"No older entries - showing all {self.shown_entries}",
+                                         foreground="orange")
+                return
+            
+            self.insert_entries(older)
+            self.status_label.config(text=f"Showing {self.shown_entries} of {self.total_entries} entries",
+                                     foreground="green")
+            
+        except Exception as e:
+            self.status_label.config(text=f"Load older failed: {e}", foreground="red")
+    
+    def run_search(self):
+        """Show ranked search results for the search box text"""
+        try:
+            query = self.search_var.get().strip()
+            if not query:
+                self.clear_search()
+                return
+            
+            since = self.SEARCH_RANGES.get(self.search_range_var.get())
+            start = datetime.now() - since if since else None
+            
+            started = time.perf_counter()
+            results = self.search_index.search(query, start=start)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            
+            self.search_active = True
+            self.log_text.delete(1.0, tk.END)
+            
+            if not results:
+                self.log_text.insert(tk.END, f"No matches for \"{query}\".\n")
+            
+            for rank, result in enumerate(results, 1):
+                entry = result['entry']
+                self.log_text.insert(tk.END, f"=== Match {rank} ({result['kind']}, score {result['score']}) ===\n")
+                self.log_text.insert(tk.END, f"📅 Time: {result['timestamp'] or 'Unknown time'}\n")
+                if result['kind'] == "vision":
+                    self.log_text.insert(tk.END, f"📸 File: {entry.get('screenshot_filename', 'No file')}\n")
+                    self.log_text.insert(tk.END, f"🔍 Interpretation:\n{entry.get('interpreted_text', '')}\n\n")
+                else:
+                    self.log_text.insert(tk.END, f"💬 Chat ({entry.get('action', 'input')}):\n{entry.get('text', '')}\n\n")
+            
+            self.status_label.config(text=f"🔍 {len(results)} matches for \"{query}\" ({elapsed_ms:.1f} ms)",
+                                     foreground="blue")
+            self.log_text.see(1.0)
+            self.position_progress['value'] = 0
+            self.position_label.config(text="Top")
+            
+        except Exception as e:
+            self.status_label.config(text=f"Search failed: {e}", foreground="red")
+    
+    def clear_search(self):
+        """Leave search results and go back to the latest entries"""
+        self.search_var.set("")
+        self.search_active = False
+        self.refresh_log_display()
+    
     def clear_log(self):
         """Clear the visual log file"""
         try:
-            # Create empty log structure
-            empty_log = {"entries": []}
-            
-            with open(self.log_file_path, 'w', encoding='utf-8') as f:
-                json.dump(empty_log, f, indent=2, ensure_ascii=False)
+            # Empty the vision journal and its JSON snapshot
+            self.vision_store.clear()
+            self.search_index.clear("vision")
             
             self.refresh_log_display()
             self.status_label.config(text="Log cleared", foreground="green")
@@ -221,10 +359,8 @@ class VisualLogWindow:
     def close_window(self):
         """Close the visual log window"""
         try:
-            # Stop auto-refresh timer
-            if self.auto_refresh_timer:
-                self.window.after_cancel(self.auto_refresh_timer)
-                self.auto_refresh_timer = None
+            # Stop live updates
+            self.stop_auto_refresh()
                 
             if self.window:
                 self.window.destroy()
@@ -233,32 +369,61 @@ class VisualLogWindow:
             pass
     
     def toggle_auto_refresh(self):
-        """Toggle auto-refresh functionality"""
+        """Toggle live updates"""
         try:
             if self.auto_refresh_enabled.get():
                 self.start_auto_refresh()
-                self.status_label.config(text="Auto-refresh enabled (3s)", foreground="blue")
+                self.status_label.config(text=f"Live updates on ({self.file_watcher.backend})", foreground="blue")
             else:
                 self.stop_auto_refresh()
-                self.status_label.config(text="Auto-refresh disabled", foreground="green")
+                self.status_label.config(text="Live updates off", foreground="green")
         except Exception as e:
             print(f"Auto-refresh toggle error: {e}")
     
     def start_auto_refresh(self):
-        """Start auto-refresh timer"""
+        """Subscribe to vision journal changes and show the current state"""
         try:
             if self.auto_refresh_enabled.get() and self.window and self.window.winfo_exists():
-                self.refresh_log_display()
-                # Schedule next refresh in 3 seconds
-                self.auto_refresh_timer = self.window.after(3000, self.start_auto_refresh)
+                if self.file_watcher is None:
+                    self.file_watcher = get_file_watcher()
+                    self.file_watcher.subscribe(self.vision_store.journal_path, self.on_log_file_event)
+                if not self.search_active:
+                    self.refresh_log_display()
         except Exception as e:
             print(f"Auto-refresh error: {e}")
     
     def stop_auto_refresh(self):
-        """Stop auto-refresh timer"""
+        """Unsubscribe from vision journal changes"""
         try:
-            if self.auto_refresh_timer:
-                self.window.after_cancel(self.auto_refresh_timer)
-                self.auto_refresh_timer = None
+            if self.file_watcher:
+                self.file_watcher.unsubscribe(self.vision_store.journal_path, self.on_log_file_event)
+                self.file_watcher = None
+            self.pending_log_event = None
         except:
             pass
+    
+    def on_log_file_event(self, path, event, size):
+        """File watcher callback (watcher thread) - coalesce and hand over to Tk"""
+        first = self.pending_log_event is None
+        if self.pending_log_event in (None, "appended"):
+            # A rotation/clear needs a full redraw, so it wins over appends
+            self.pending_log_event = event
+        if first and self.window:
+            self.window.after(0, self.apply_log_event)
+    
+    def apply_log_event(self):
+        """Update the display for the coalesced file event (Tk thread)"""
+        try:
+            event, self.pending_log_event = self.pending_log_event, None
+            if event is None or not self.window or not self.window.winfo_exists():
+                return
+            if self.search_active:
+                # Don't replace search results the user is reading
+                self.status_label.config(text="New entries - clear the search to see them", foreground="blue")
+                return
+            if event == "appended":
+                self.show_new_entries()
+            else:
+                self.refresh_log_display()
+        except Exception as e:
+            print(f"Live update error: {e}")